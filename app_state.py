@@ -0,0 +1,86 @@
+import os
+import re
+import json
+
+from network_capture import PREVIEW_PLACE_INDEX, XSSI_PREFIX, decode_place
+
+# --- Embedded State Layout ---
+# Place pages assign `window.APP_INITIALIZATION_STATE=[...]` in an inline
+# script. One of the strings in state[3] is the same XSSI-prefixed payload
+# /maps/preview/place returns, so its place array decodes with decode_place.
+# Like PLACE_FIELD_PATHS, this layout has not been checked on a real page yet.
+STATE_MARKER = "APP_INITIALIZATION_STATE="
+STATE_PAYLOAD_SLOT = 3
+
+# --- Configurable Settings ---
+APP_STATE_DECODE = os.environ.get("APP_STATE_DECODE", "0") == "1"  # Off until the layout above is checked on real pages
+VALID_ADDRESS_PATTERN = re.compile(r'\d+|St\.? |Ave\.? |Blvd\.? |Rd\.? |Lane\.?')  # Same rule as the scrapers' is_valid_address
+
+_decoder = json.JSONDecoder()
+
+
+def _valid_rating(value):
+    try:
+        return 1 <= float(value) <= 5
+    except (TypeError, ValueError):
+        return False
+
+
+# Decoded values that fail these are dropped, so a wrong index path falls back to CSS instead of overriding it
+STATE_VALIDATORS = {
+    "address": lambda value: isinstance(value, str) and bool(VALID_ADDRESS_PATTERN.search(value)),
+    "rating": _valid_rating,
+    "review_count": lambda value: isinstance(value, str) and value.isdigit(),
+    "phone": lambda value: isinstance(value, str) and any(c.isdigit() for c in value),
+    "website": lambda value: isinstance(value, str) and value.startswith(("http://", "https://")),
+}
+
+
+def find_state(html):
+    """The decoded state array, or None when the page has no (valid) blob."""
+    start = html.find(STATE_MARKER)
+    if start < 0:
+        return None
+    try:
+        state, _ = _decoder.raw_decode(html, start + len(STATE_MARKER))
+    except ValueError:
+        return None
+    return state if isinstance(state, list) else None
+
+
+def _place_payloads(state):
+    slot = state[STATE_PAYLOAD_SLOT] if len(state) > STATE_PAYLOAD_SLOT else None
+    for value in slot if isinstance(slot, list) else []:
+        if isinstance(value, str) and value.startswith(XSSI_PREFIX):
+            try:
+                yield json.loads(value[len(XSSI_PREFIX):])
+            except ValueError:
+                continue
+
+
+def _validated(record):
+    for field, valid in STATE_VALIDATORS.items():
+        if record.get(field) is not None and not valid(record[field]):
+            record[field] = None
+    return record
+
+
+def extract_place_state(html):
+    """Business record from the embedded state, or None to fall back to CSS selectors.
+
+    Always None unless APP_STATE_DECODE is set; values failing
+    STATE_VALIDATORS come back as None.
+    """
+    if not APP_STATE_DECODE:
+        return None
+    if isinstance(html, bytes):
+        html = html.decode("utf-8", "replace")
+    state = find_state(html)
+    if state is None:
+        return None
+    for payload in _place_payloads(state):
+        place = payload[PREVIEW_PLACE_INDEX] if isinstance(payload, list) and len(payload) > PREVIEW_PLACE_INDEX else None
+        record = decode_place(place)
+        if record:
+            return _validated(record)
+    return None
@@ -0,0 +1,236 @@
+import os
+import re
+import json
+import time
+import hashlib
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Not on Windows: concurrent evictions there may each remove a few extra bodies
+    fcntl = None
+
+# --- Configurable Settings ---
+ASSET_CACHE_DIR = os.environ.get("ASSET_CACHE_DIR", os.path.join(tempfile.gettempdir(), "gmaps_asset_cache"))  # Shared by every worker on the host
+ASSET_CACHE_MAX_MB = int(os.environ.get("ASSET_CACHE_MAX_MB", 512))
+ASSET_CACHE_TYPES = {"script", "stylesheet", "font"}
+
+# Versioned static bundles; the URL changes whenever the content does
+ASSET_URL_PATTERNS = [
+    r"^https://maps\.gstatic\.com/",
+    r"^https://www\.gstatic\.com/",
+    r"^https://fonts\.gstatic\.com/",
+    r"^https://www\.google\.com/maps/_/js/",
+    r"^https://www\.google\.com/maps/_/ss/",
+    r"^https://www\.google\.com/maps/_/scs/",
+]
+# Response headers replayed on a hit; encoding/length no longer match the decoded body
+KEPT_HEADERS = {"content-type", "cache-control", "access-control-allow-origin", "timing-allow-origin",
+                "x-content-type-options"}
+
+_ASSET_RE = re.compile("|".join(f"(?:{p})" for p in ASSET_URL_PATTERNS))
+_OBJECT_NAME_RE = re.compile(r"^[0-9a-f]{64}$")  # Anything else in objects/ is another worker's write in progress
+
+
+class AssetCache:
+    """Disk cache of static Maps bundles, served with `route.fulfill`.
+
+    Bodies live under `objects/<sha256>` so the same bundle behind several
+    URLs is stored once; `index/<sha1(url)>.json` maps a URL to its body and
+    headers. Writes are atomic renames, so workers on one host can share
+    the directory. Hits refresh an entry's mtime. After each store the
+    directory is re-measured, so every worker's writes count, and once
+    bodies plus index entries pass `max_mb` the least recently used bodies
+    are evicted with their index entries, one worker at a time.
+
+    Install it before the RequestPolicy: Playwright runs the most recently
+    registered route first, so the policy blocks what it blocks and falls
+    back to the cache for the rest.
+    """
+
+    def __init__(self, cache_dir=ASSET_CACHE_DIR, max_mb=ASSET_CACHE_MAX_MB, resource_types=ASSET_CACHE_TYPES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_mb * 1024 ** 2
+        self.resource_types = set(resource_types)
+        self._objects = os.path.join(cache_dir, "objects")
+        self._index = os.path.join(cache_dir, "index")
+        self.stats = {"hits": 0, "misses": 0, "stored": 0, "bytes_served": 0, "bytes_fetched": 0, "evicted": 0}
+
+    def cacheable(self, url, resource_type):
+        return resource_type in self.resource_types and bool(_ASSET_RE.search(url))
+
+    def _index_path(self, url):
+        return os.path.join(self._index, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json")
+
+    @staticmethod
+    def _write(path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def get(self, url):
+        """(status, headers, body) for a cached URL, or None."""
+        index_path = self._index_path(url)
+        try:
+            with open(index_path, encoding="utf-8") as f:
+                entry = json.load(f)
+            object_path = os.path.join(self._objects, entry["sha256"])
+        except (OSError, ValueError, KeyError):
+            return None
+        try:
+            with open(object_path, "rb") as f:
+                body = f.read()
+        except OSError:
+            self._remove([index_path])  # Body evicted; the next fetch rewrites the entry
+            return None
+        now = time.time()
+        for path in (index_path, object_path):
+            try:
+                os.utime(path, (now, now))
+            except OSError:
+                pass
+        return entry["status"], entry["headers"], body
+
+    def put(self, url, status, headers, body):
+        digest = hashlib.sha256(body).hexdigest()
+        object_path = os.path.join(self._objects, digest)
+        if not os.path.exists(object_path):
+            self._write(object_path, body)
+        entry = {
+            "url": url,
+            "sha256": digest,
+            "status": status,
+            "headers": {k: v for k, v in headers.items() if k.lower() in KEPT_HEADERS},
+        }
+        self._write(self._index_path(url), json.dumps(entry).encode("utf-8"))
+        self.stats["stored"] += 1
+        self._evict()
+
+    @staticmethod
+    def _scan(directory):
+        """(entry, size) of every file in `directory`, as it is on disk now."""
+        try:
+            entries = list(os.scandir(directory))
+        except FileNotFoundError:
+            return []
+        scanned = []
+        for entry in entries:
+            try:
+                scanned.append((entry, entry.stat().st_size))
+            except OSError:
+                continue  # Removed by another worker meanwhile
+        return scanned
+
+    @staticmethod
+    def _remove(paths):
+        """Delete `paths`, returning the bytes freed."""
+        freed = 0
+        for path in paths:
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+            except OSError:
+                continue
+            freed += size
+        return freed
+
+    @contextmanager
+    def _eviction_lock(self):
+        """Yields True when this process holds the host-wide eviction lock, False while another worker does."""
+        if fcntl is None:
+            yield True
+            return
+        fd = os.open(os.path.join(self.cache_dir, "evict.lock"), os.O_CREAT | os.O_RDWR)
+        try:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                yield False
+                return
+            yield True
+        finally:
+            os.close(fd)  # Releases the lock
+
+    def disk_usage(self):
+        return sum(size for _, size in self._scan(self._objects) + self._scan(self._index))
+
+    def _evict(self):
+        # Measured from disk each time: other workers write to the same directory
+        if self.disk_usage() <= self.max_bytes:
+            return
+        with self._eviction_lock() as locked:
+            if locked:  # Otherwise the worker holding the lock is already evicting
+                self._evict_locked()
+
+    def _evict_locked(self):
+        total = 0
+        index_paths = {}  # sha256 -> index entries pointing at that body
+        for entry, size in self._scan(self._index):
+            total += size
+            try:
+                with open(entry.path, encoding="utf-8") as f:
+                    digest = json.load(f)["sha256"]
+            except (OSError, ValueError, KeyError):
+                continue  # Half-written temp file, or removed meanwhile
+            index_paths.setdefault(digest, []).append(entry.path)
+
+        objects = []
+        for entry, size in self._scan(self._objects):
+            total += size
+            if _OBJECT_NAME_RE.match(entry.name):
+                try:
+                    objects.append((entry.stat().st_mtime, entry.name, entry.path, size))
+                except OSError:
+                    continue
+        present = {name for _, name, _, _ in objects}
+        for digest in [digest for digest in index_paths if digest not in present]:
+            total -= self._remove(index_paths.pop(digest))  # Entries whose body is already gone
+
+        for _, name, path, size in sorted(objects):
+            if total <= self.max_bytes * 0.9:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size + self._remove(index_paths.pop(name, []))
+            self.stats["evicted"] += 1
+
+    async def install(self, target):
+        await target.route("**/*", self._handle)
+
+    async def _handle(self, route, request):
+        if not self.cacheable(request.url, request.resource_type):
+            await route.fallback()
+            return
+        cached = self.get(request.url)
+        if cached:
+            status, headers, body = cached
+            self.stats["hits"] += 1
+            self.stats["bytes_served"] += len(body)
+            await route.fulfill(status=status, headers=headers, body=body)
+            return
+
+        self.stats["misses"] += 1
+        try:
+            response = await route.fetch()
+        except Exception:
+            await route.fallback()  # Let the browser load it itself
+            return
+        body = await response.body()
+        self.stats["bytes_fetched"] += len(body)
+        if response.status == 200 and "no-store" not in response.headers.get("cache-control", ""):
+            try:
+                self.put(request.url, response.status, response.headers, body)
+            except OSError as e:
+                print(f"⚠️ Could not cache asset: {str(e)}")
+        await route.fulfill(response=response, body=body)
+
+    def summary(self):
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return (f"📦 Asset cache: {self.stats['hits']}/{lookups} hits ({self.stats['hits'] / (lookups or 1):.0%}) | "
+                f"served {self.stats['bytes_served'] / 1024 ** 2:.2f} MB from disk, "
+                f"fetched {self.stats['bytes_fetched'] / 1024 ** 2:.2f} MB | {self.stats['evicted']} evicted")
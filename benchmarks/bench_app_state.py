@@ -0,0 +1,99 @@
+# Embedded APP_INITIALIZATION_STATE decoding vs. the CSS/regex parse in v8.
+#
+#   python -m benchmarks.bench_app_state
+#
+# Saved place pages are built from minimal_html: each page gets an inline
+# state script (the first card's place array, laid out as Maps ships it)
+# appended to the body, so both engines read the same document. A contact row
+# with an email and social profile links goes into the place pane, and the
+# email and social links parsed from the state page must match the CSS
+# baseline (the same page without the state). The state is
+# written from PLACE_FIELD_PATHS, so the field check is a round trip of the
+# decoder's own layout, not a check against a real place page. Decoding is
+# switched on here (APP_STATE_DECODE) since it is off by default.
+import glob
+import json
+import re
+import time
+
+import v8
+import app_state
+from app_state import extract_place_state
+from benchmarks.make_capture_fixtures import place_array
+from network_capture import PLACE_FIELD_PATHS, PREVIEW_PLACE_INDEX, XSSI_PREFIX
+from result_cards import card_details, parse_cards
+
+ROUNDS = 5
+COMPARED_FIELDS = ["name", "rating", "review_count", "address", "phone", "website"]
+CONTACT_ROW = ('<div class="Io6YTe">Contact info@example-clinic.com '
+               '<a href="https://www.facebook.com/ExampleClinic/">Facebook</a> '
+               '<a href="https://instagram.com/example.clinic">Instagram</a></div>')
+PANE_OPEN_RES = [re.compile(r'<div[^>]*role="main"[^>]*>'), re.compile(r"<body[^>]*>")]
+
+
+def with_contacts(html):
+    match = next((m for m in (pattern.search(html) for pattern in PANE_OPEN_RES) if m), None)
+    return html[:match.end()] + CONTACT_ROW + html[match.end():] if match else CONTACT_ROW + html
+
+
+def with_state(html, card, place=None):
+    place = place or place_array(card)
+    payload = XSSI_PREFIX + "\n" + json.dumps([None] * PREVIEW_PLACE_INDEX + [place])
+    state = [[[5000, -84.9, 32.5], [0, 0, 0], [1024, 768], 13.1], None, None, [None] * 6 + [payload]]
+    script = f"<script>window.APP_INITIALIZATION_STATE={json.dumps(state)};window.APP_FLAGS=[];</script>"
+    return html.replace("</body>", script + "</body>") if "</body>" in html else html + script
+
+
+def timed(fn, pages):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for html in pages:
+            fn(html)
+    return (time.perf_counter() - start) / (ROUNDS * len(pages)) * 1000
+
+
+def main():
+    app_state.APP_STATE_DECODE = True
+    pages, expected, raw_pages = [], [], []
+    for path in sorted(glob.glob("minimal_html/*.html")):
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        raw_pages.append(html)
+        card = parse_cards(html)[0]
+        pages.append(with_state(with_contacts(html), card))
+        expected.append(card_details(card))
+
+    for html, card in zip(pages, expected):
+        record = extract_place_state(html)
+        assert record and all(record[k] == card[k] for k in COMPARED_FIELDS), f"Mismatch for {card['name']}"
+        assert record["latitude"] is not None and record["longitude"] is not None
+        details = v8.parse_place_details(html)
+        assert all(details[k] == v for k, v in record.items() if v is not None and k not in ("email", "social_links"))
+        baseline = v8.parse_place_details(html.replace("APP_INITIALIZATION_STATE", ""))
+        assert details["email"] and details["email"] == baseline["email"], f"Email differs for {card['name']}"
+        assert details["social_links"] and details["social_links"] == baseline["social_links"], \
+            f"Social links differ for {card['name']}"
+    print(f"✅ Synthetic embedded state round-tripped on {len(pages)} pages, incl. coordinates "
+          f"(layout not checked against real place pages)")
+    print(f"✅ Email and social links match the CSS baseline: {details['email']}, {', '.join(details['social_links'])}")
+
+    # A layout that lands on the wrong slots must not override what the page shows
+    place = place_array(parse_cards(raw_pages[0])[0])
+    place[PLACE_FIELD_PATHS["address"][0]] = "Open now"
+    place[PLACE_FIELD_PATHS["rating"][0]][PLACE_FIELD_PATHS["rating"][1]] = 47.0
+    drifted = v8.parse_place_details(with_state(raw_pages[0], None, place))
+    baseline = v8.parse_place_details(raw_pages[0])
+    assert drifted["address"] == baseline["address"] and drifted["rating"] == baseline["rating"]
+    print(f"✅ Implausible decoded values (address, rating) fall back to the page: "
+          f"{drifted['address']!r}, {drifted['rating']}")
+
+    css = timed(lambda html: v8.parse_place_details(html.replace("APP_INITIALIZATION_STATE", "")), pages)
+    merged = timed(v8.parse_place_details, pages)
+    state = timed(extract_place_state, pages)
+    print(f"⏱️ CSS selectors + text regexes ({v8.PARSER.name}): {css:.2f} ms/page")
+    print(f"⏱️ State + page text for email/social: {merged:.2f} ms/page ({css / merged:.1f}x)")
+    print(f"⏱️ Embedded state scan + decode alone: {state:.3f} ms/page")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# Static bundle traffic for a run of fresh contexts, with and without the AssetCache.
+#
+#   python -m benchmarks.bench_asset_cache
+#
+# SimulatedRoute answers like a Playwright route: fetch() downloads from the
+# "network" at NETWORK_MBPS after NETWORK_RTT, fulfill()/fallback() finish
+# the request. Every context loads the same BUNDLES (sizes typical of the
+# Maps JS/CSS bundles) plus one XHR the cache must leave alone.
+#
+# Then WORKERS processes share one small cache directory, each storing
+# distinct bundles; the directory must end within SHARED_MAX_MB, with no
+# index entry left pointing at an evicted body.
+import asyncio
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+
+from asset_cache import AssetCache
+
+CONTEXTS = 20
+NETWORK_MBPS = 40
+NETWORK_RTT = 0.08
+BUNDLES = [
+    ("https://www.google.com/maps/_/js/k=maps.m.en.abc/m=sc2,per,mo,lp,ti,ds,stx,bwm,b", "script", 2_400_000),
+    ("https://www.google.com/maps/_/js/k=maps.m.en.abc/m=vwr,vd,a,owc,en,sp,ipb", "script", 1_100_000),
+    ("https://www.google.com/maps/_/ss/k=maps.m.abc.L.W.O/m=sc2,per", "stylesheet", 380_000),
+    ("https://maps.gstatic.com/maps-api-v3/api/js/55/2/intl/en_us/common.js", "script", 240_000),
+    ("https://fonts.gstatic.com/s/googlesans/v58/4UaGrENHsxJlGDuGo1OIlL3Owp4.woff2", "font", 45_000),
+    ("https://www.google.com/search?tbm=map&q=dentists", "xhr", 90_000),
+]
+WORKERS = 4
+SHARED_MAX_MB = 8
+BUNDLES_PER_WORKER = 40
+SHARED_BUNDLE_SIZE = 200_000
+
+
+class SimulatedResponse:
+    def __init__(self, size):
+        self.status = 200
+        self.headers = {"content-type": "text/javascript", "content-encoding": "br", "cache-control": "public"}
+        self.size = size
+
+    async def body(self):
+        return b"x" * self.size
+
+
+class SimulatedRoute:
+    def __init__(self, size, traffic):
+        self.size = size
+        self.traffic = traffic
+
+    async def _download(self):
+        await asyncio.sleep(NETWORK_RTT + self.size / (NETWORK_MBPS * 125_000))
+        self.traffic["bytes"] += self.size
+
+    async def fetch(self):
+        await self._download()
+        return SimulatedResponse(self.size)
+
+    async def fallback(self):
+        await self._download()
+
+    async def fulfill(self, **kwargs):
+        pass
+
+
+class SimulatedRequest:
+    def __init__(self, url, resource_type):
+        self.url = url
+        self.resource_type = resource_type
+
+
+async def load_context(cache, traffic):
+    async def load(url, resource_type, size):
+        route, request = SimulatedRoute(size, traffic), SimulatedRequest(url, resource_type)
+        if cache is None:
+            await route.fallback()
+        else:
+            await cache._handle(route, request)
+
+    await asyncio.gather(*(load(*bundle) for bundle in BUNDLES))
+
+
+async def run(cache):
+    traffic = {"bytes": 0}
+    start = time.perf_counter()
+    for _ in range(CONTEXTS):
+        await load_context(cache, traffic)
+    return traffic["bytes"], time.perf_counter() - start
+
+
+def store_bundles(args):
+    cache_dir, worker = args
+    cache = AssetCache(cache_dir=cache_dir, max_mb=SHARED_MAX_MB)
+    for i in range(BUNDLES_PER_WORKER):
+        body = f"{worker}:{i}:".encode() + b"x" * SHARED_BUNDLE_SIZE
+        cache.put(f"https://www.google.com/maps/_/js/k=worker{worker}/m={i}", 200, {"content-type": "text/javascript"}, body)
+    return cache.stats["evicted"]
+
+
+def shared_bound():
+    cache_dir = tempfile.mkdtemp(prefix="asset_cache_shared_")
+    try:
+        with multiprocessing.Pool(WORKERS) as pool:
+            evicted = sum(pool.map(store_bundles, [(cache_dir, worker) for worker in range(WORKERS)]))
+        cache = AssetCache(cache_dir=cache_dir, max_mb=SHARED_MAX_MB)
+        index_dir = os.path.join(cache_dir, "index")
+        orphans = 0
+        for name in os.listdir(index_dir):
+            with open(os.path.join(index_dir, name), encoding="utf-8") as f:
+                orphans += not os.path.exists(os.path.join(cache_dir, "objects", json.load(f)["sha256"]))
+        stored = WORKERS * BUNDLES_PER_WORKER * SHARED_BUNDLE_SIZE
+        print(f"🗄️ {WORKERS} workers stored {stored / 1024 ** 2:.1f} MB into one {SHARED_MAX_MB} MB cache: "
+              f"{cache.disk_usage() / 1024 ** 2:.2f} MB on disk, {evicted} evicted, {orphans} orphaned index entries")
+    finally:
+        shutil.rmtree(cache_dir)
+
+
+async def main():
+    cache_dir = tempfile.mkdtemp(prefix="asset_cache_bench_")
+    try:
+        cache = AssetCache(cache_dir=cache_dir, max_mb=64)
+        cold_bytes, cold = await run(None)
+        cached_bytes, cached = await run(cache)
+        print(cache.summary())
+        print(f"⏱️ {CONTEXTS} contexts | no cache: {cold_bytes / 1024 ** 2:.1f} MB, {cold:.2f}s | "
+              f"asset cache: {cached_bytes / 1024 ** 2:.1f} MB, {cached:.2f}s")
+    finally:
+        shutil.rmtree(cache_dir)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
+    shared_bound()
@@ -0,0 +1,71 @@
+# Queries/minute with a Chromium launch per query vs. the shared BrowserPool.
+#
+#   python -m benchmarks.bench_browser_pool --queries 20 --details 5
+#
+# Each simulated query opens one "search" page plus N "detail" pages, served
+# from the minimal_html fixtures so the numbers isolate browser overhead.
+import argparse
+import asyncio
+import time
+
+from playwright.async_api import async_playwright
+
+from browser_pool import BrowserPool
+from benchmarks.fixture_server import start_fixture_server, fixture_urls
+
+
+async def run_query(context, urls, details):
+    page = await context.new_page()
+    await page.goto(urls[0], timeout=60000)
+    await page.content()
+    for link in urls[1:details + 1]:
+        detail = await context.new_page()
+        await detail.goto(link, timeout=60000)
+        await detail.content()
+        await detail.close()
+
+
+async def bench_launch_per_query(urls, queries, details):
+    start = time.perf_counter()
+    for _ in range(queries):
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            context = await browser.new_context()
+            await run_query(context, urls, details)
+            await context.close()
+            await browser.close()
+    return time.perf_counter() - start
+
+
+async def bench_pool(urls, queries, details):
+    start = time.perf_counter()
+    async with BrowserPool() as pool:
+        for _ in range(queries):
+            async with pool.context() as context:
+                await run_query(context, urls, details)
+        stats = pool.stats
+    return time.perf_counter() - start, stats
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--details", type=int, default=4)
+    args = parser.parse_args()
+
+    server, base_url = start_fixture_server()
+    urls = fixture_urls(base_url)
+    urls = (urls * (args.details // len(urls) + 2))[:args.details + 1]
+
+    before = await bench_launch_per_query(urls, args.queries, args.details)
+    after, stats = await bench_pool(urls, args.queries, args.details)
+    server.shutdown()
+
+    print(f"📊 {args.queries} queries x {args.details} detail pages")
+    print(f"⏱️ Launch per query: {before:.2f}s -> {args.queries / before * 60:.1f} queries/min")
+    print(f"⏱️ Browser pool:     {after:.2f}s -> {args.queries / after * 60:.1f} queries/min")
+    print(f"🚀 Speedup: {before / after:.2f}x | pool stats: {stats}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
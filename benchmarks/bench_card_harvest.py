@@ -0,0 +1,50 @@
+# Playwright round trips and payload size: per-card handles vs. one harvest call.
+#
+#   python -m benchmarks.bench_card_harvest
+#
+# Uses the offline mirror of HARVEST_CARDS_JS on minimal_html pages. The old
+# loop costs query_selector_all + query_selector + get_attribute per card;
+# the harvest is a single evaluate whatever the card count.
+import glob
+import json
+
+from bs4 import BeautifulSoup
+
+from result_cards import parse_cards, unique_hrefs
+
+
+def legacy_hrefs(html):
+    soup = BeautifulSoup(html, "html.parser")
+    hrefs = []
+    for card in soup.select(".Nv2PK"):
+        link_el = card.select_one("a.hfpxzc")
+        href = link_el.get("href") if link_el else None
+        if href and "/maps/place/" in href:
+            hrefs.append(href)
+    return list(dict.fromkeys(hrefs))
+
+
+def main():
+    pages = cards_total = legacy_trips = payload_bytes = 0
+    filled = {}
+    for path in sorted(glob.glob("minimal_html/*.html")):
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        cards = parse_cards(html)
+        assert unique_hrefs(cards) == legacy_hrefs(html), f"Link mismatch on {path}"
+        pages += 1
+        cards_total += len(cards)
+        legacy_trips += 1 + 2 * len(cards)
+        payload_bytes += len(json.dumps(cards).encode("utf-8"))
+        for card in cards:
+            for field, value in card.items():
+                filled[field] = filled.get(field, 0) + (value is not None)
+
+    print(f"✅ Same place links as the per-card loop on {pages} pages ({cards_total} cards)")
+    print(f"🔁 Round trips per page: {legacy_trips / pages:.1f} -> 1")
+    print(f"📦 Harvest payload: {payload_bytes / pages / 1024:.1f} KB/page")
+    print("🧾 Fields filled: " + ", ".join(f"{k} {v}/{cards_total}" for k, v in filled.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+# Page loads per query: detail mode vs. card mode under each visit policy.
+#
+#   python -m benchmarks.bench_card_mode
+#
+# Each minimal_html page is treated as one query's results feed. Detail mode
+# loads one page per place; card mode builds records from the cards and loads
+# a detail page only for places missing a CARD_REQUIRED_FIELDS entry.
+import glob
+
+from result_cards import card_details, missing_fields, parse_cards
+
+POLICIES = [[], ["phone"], ["phone", "website"]]
+RECORD_FIELDS = ["name", "rating", "review_count", "category", "address", "phone", "website"]
+
+
+def main():
+    queries = []
+    for path in sorted(glob.glob("minimal_html/*.html")):
+        with open(path, encoding="utf-8") as f:
+            queries.append([card_details(card) for card in parse_cards(f.read())])
+    places = sum(len(records) for records in queries)
+
+    print(f"📄 {len(queries)} queries, {places} places")
+    print(f"⏱️ Detail mode: {places / len(queries):.1f} page loads/query")
+    for required in POLICIES:
+        visits = sum(1 for records in queries for record in records if missing_fields(record, required))
+        label = ",".join(required) or "none"
+        saving = f"{places / visits:.0f}x fewer" if visits else "no detail pages"
+        print(f"🃏 Card mode (required: {label}): {visits / len(queries):.1f} page loads/query ({saving})")
+
+    filled = {field: sum(1 for records in queries for r in records if r[field]) for field in RECORD_FIELDS}
+    print("🧾 Card fields filled: " + ", ".join(f"{k} {v}/{places}" for k, v in filled.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# HTML size and downstream parse time before and after DOM compaction.
+#
+#   python -m benchmarks.bench_dom_compact
+#
+# Uses compact_html, the Python mirror of the in-page COMPACT_JS, on the
+# minimal_html pages, then times v8's parse_place_details and
+# result_cards.parse_cards on both versions and checks they agree. The saved
+# pages already lack <script>/<style> (generate_html kept only <body>), so
+# live pages shrink further than this.
+import glob
+import importlib.util
+import time
+
+from dom_compact import compact_html
+from result_cards import parse_cards
+
+ROUNDS = 5
+
+
+def load_v8():
+    spec = importlib.util.spec_from_file_location("v8", "v8.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def best_of(fn, html):
+    times = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        fn(html)
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main():
+    v8 = load_v8()
+    totals = {"raw": 0, "compact": 0, "raw_ms": 0.0, "compact_ms": 0.0}
+    for path in sorted(glob.glob("minimal_html/*.html")):
+        with open(path, encoding="utf-8") as f:
+            raw = f.read()
+        start = time.perf_counter()
+        compact = compact_html(raw)
+        compact_ms = (time.perf_counter() - start) * 1000
+        assert v8.parse_place_details(compact) == v8.parse_place_details(raw)
+        assert parse_cards(compact) == parse_cards(raw)
+
+        parse = lambda html: (v8.parse_place_details(html), parse_cards(html))
+        raw_ms, small_ms = best_of(parse, raw), best_of(parse, compact)
+        totals["raw"] += len(raw)
+        totals["compact"] += len(compact)
+        totals["raw_ms"] += raw_ms
+        totals["compact_ms"] += small_ms
+        print(f"🗜️ {path}: {len(raw) / 1024:.0f} KB -> {len(compact) / 1024:.0f} KB | "
+              f"parse {raw_ms:.1f} -> {small_ms:.1f} ms (pruning took {compact_ms:.1f} ms here, runs in-page live)")
+
+    print(f"⏱️ Total: {totals['raw'] / 1024:.0f} KB -> {totals['compact'] / 1024:.0f} KB "
+          f"({1 - totals['compact'] / totals['raw']:.0%} smaller) | parse {totals['raw_ms']:.0f} -> "
+          f"{totals['compact_ms']:.0f} ms ({totals['raw_ms'] / totals['compact_ms']:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# Python (page.content + parser) vs. in-browser (page.evaluate) extraction.
+#
+#   python -m benchmarks.bench_extraction_modes --rounds 5
+#
+# Loads the minimal_html fixtures in Chromium, checks both modes return the
+# same record, and prints per-mode latency, Python CPU and IPC bytes. The
+# extra SCOPED_FIXTURE puts another place's phone, email and Facebook link in
+# the results list and a footer outside the place pane; both modes must read
+# only the pane (EXPECTED_SCOPED), which a document-wide scan would not.
+import argparse
+import asyncio
+import os
+import shutil
+import tempfile
+
+import v8
+from browser_pool import BrowserPool
+from browser_extract import ExtractionStats
+from benchmarks.fixture_server import FIXTURE_DIR, start_fixture_server, fixture_urls
+
+MODES = ["python", "browser"]
+SCOPED_FIXTURE = "scoped_place.html"
+SCOPED_HTML = """<!DOCTYPE html>
+<html><head><title>Example Clinic - Google Maps</title></head><body>
+<div role="main" aria-label="Results for clinics">
+  <div role="feed">
+    <div class="Nv2PK">Riverside Clinic · (706) 324-1234 · front-desk@riverside-clinic.org
+      <a href="https://www.facebook.com/RiversideClinic/">Facebook</a></div>
+  </div>
+</div>
+<div role="main" aria-label="Example Clinic">
+  <h1 class="DUwDvf">Example Clinic</h1>
+  <span role="img" aria-label="4.5 stars 120 Reviews"></span>
+  <button data-item-id="address"><div class="Io6YTe fontBodyMedium">1400 Wynnton Rd, Columbus, GA 31906</div></button>
+  <div class="etWJQ"><a href="https://example-clinic.com/">example-clinic.com</a></div>
+  <button data-item-id="phone:tel:+17063233816"><div class="Io6YTe fontBodyMedium">(706) 323-3816</div></button>
+  <div class="PbZDve">Open since 1998. Contact info@example-clinic.com
+    <a href="https://instagram.com/example.clinic">Instagram</a></div>
+</div>
+<footer>Support (404) 555-0199 · maps-help@example.net · <a href="https://twitter.com/ExampleMaps">Twitter</a></footer>
+</body></html>
+"""
+EXPECTED_SCOPED = {
+    "phone": "+17063233816",
+    "email": "info@example-clinic.com",
+    "social_links": ["https://instagram.com/example.clinic"],
+}
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    fixture_dir = tempfile.mkdtemp(prefix="extraction_modes_")
+    shutil.copytree(FIXTURE_DIR, fixture_dir, dirs_exist_ok=True)
+    with open(os.path.join(fixture_dir, SCOPED_FIXTURE), "w", encoding="utf-8") as f:
+        f.write(SCOPED_HTML)
+    server, base_url = start_fixture_server(fixture_dir)
+    urls = fixture_urls(base_url, fixture_dir)
+    v8.EXTRACTION_STATS = ExtractionStats()
+
+    async with BrowserPool() as pool:
+        async with pool.page() as page:
+            for url in urls:
+                await page.goto(url)
+                records = {}
+                for mode in MODES:
+                    v8.EXTRACTION_MODE = mode
+                    records[mode] = await v8.extract_place_from_page(page)
+                for record in records.values():
+                    record["social_links"] = sorted(record["social_links"])
+                same = records["python"] == records["browser"]
+                if url.endswith(SCOPED_FIXTURE):
+                    same = same and all(records["python"][k] == v for k, v in EXPECTED_SCOPED.items())
+                status = "✅" if same else "❌"
+                print(f"{status} {url.rsplit('/', 1)[-1]}")
+                if status == "❌":
+                    print(f"   python:  {records['python']}\n   browser: {records['browser']}")
+
+            for _ in range(args.rounds - 1):
+                for url in urls:
+                    await page.goto(url)
+                    for mode in MODES:
+                        v8.EXTRACTION_MODE = mode
+                        await v8.extract_place_from_page(page)
+
+    server.shutdown()
+    shutil.rmtree(fixture_dir, ignore_errors=True)
+    print(v8.EXTRACTION_STATS.summary())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,85 @@
+# Per-query wall time: scroll-then-scrape vs. streaming URLs into detail workers.
+#
+#   python -m benchmarks.bench_feed_pipeline
+#
+# SimulatedFeedPage answers results_feed's evaluate calls the way the Maps
+# feed does: every scroll takes SCROLL_ROUND seconds to render CARDS_PER_ROUND
+# more cards (with some duplicates) until TOTAL_CARDS, then shows the
+# end-of-list marker. Detail pages take DETAIL_DELAY seconds each.
+import asyncio
+import time
+
+from results_feed import pipe_place_urls, scroll_results_feed, stream_place_urls, format_scroll_stats
+
+TOTAL_CARDS = 60
+CARDS_PER_ROUND = 7
+SCROLL_ROUND = 0.15
+DETAIL_DELAY = 0.1
+DETAIL_WORKERS = 5
+
+
+class SimulatedFeedPage:
+    def __init__(self):
+        self.cards = [self._href(i) for i in range(CARDS_PER_ROUND)]
+
+    @staticmethod
+    def _href(i):
+        return f"https://www.google.com/maps/place/Business+{i % (TOTAL_CARDS - 3)}/data=!{i}"
+
+    async def wait_for_selector(self, selector, timeout=None):
+        return True
+
+    async def evaluate(self, script, args):
+        if args["waitMs"] and len(self.cards) < TOTAL_CARDS:
+            await asyncio.sleep(SCROLL_ROUND)
+            start = len(self.cards)
+            self.cards += [self._href(i) for i in range(start, min(start + CARDS_PER_ROUND, TOTAL_CARDS))]
+        return {
+            "found": True,
+            "count": len(self.cards),
+            "end": len(self.cards) >= TOTAL_CARDS,
+            "cards": [{"href": href.split("/data=")[0]} for href in self.cards[args["from"]:]],
+        }
+
+
+async def scrape_detail(url):
+    await asyncio.sleep(DETAIL_DELAY)
+    return {"source_url": url}
+
+
+async def scroll_then_scrape():
+    page = SimulatedFeedPage()
+    await scroll_results_feed(page)
+    hrefs = list(dict.fromkeys(href.split("/data=")[0] for href in page.cards))
+    semaphore = asyncio.Semaphore(DETAIL_WORKERS)
+
+    async def bounded(url):
+        async with semaphore:
+            return await scrape_detail(url)
+    return await asyncio.gather(*(bounded(url) for url in hrefs))
+
+
+async def streamed():
+    stats = {}
+    results = await pipe_place_urls(stream_place_urls(SimulatedFeedPage(), stats), scrape_detail, DETAIL_WORKERS)
+    print(format_scroll_stats(stats))
+    return results
+
+
+async def main():
+    start = time.perf_counter()
+    before = await scroll_then_scrape()
+    sequential = time.perf_counter() - start
+
+    start = time.perf_counter()
+    after = await streamed()
+    pipelined = time.perf_counter() - start
+
+    assert sorted(r["source_url"] for r in before) == sorted(r["source_url"] for r in after)
+    print(f"✅ Same {len(after)} unique places from both paths")
+    print(f"⏱️ Scroll, then scrape: {sequential:.2f}s")
+    print(f"⏱️ Streamed pipeline:   {pipelined:.2f}s ({sequential - pipelined:.2f}s saved)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
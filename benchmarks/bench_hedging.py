@@ -0,0 +1,83 @@
+# Tail latency of detail loads with and without hedging.
+#
+#   python -m benchmarks.bench_hedging
+#
+# Each simulated load takes a log-normal time around LOAD_MEDIAN seconds;
+# SLOW_SHARE of them are SLOW_FACTOR times slower (a stalled tab, not a slow
+# place - the duplicate load is usually quick). WORKERS run the primary
+# loads, as v7.2's pipe_place_urls does; loads borrow a tab like
+# PagePool.page(), from WORKERS tabs unhedged and WORKERS + HEDGE_SLOTS
+# hedged, so a spare exists while every worker is busy. A query completes
+# when all its places do.
+import asyncio
+import random
+import time
+
+from hedging import HEDGE_SLOTS, Hedger
+from latency import LatencyTracker, percentile
+
+QUERIES = 12
+PLACES_PER_QUERY = 20
+WORKERS = 8
+LOAD_MEDIAN = 0.2
+SLOW_SHARE = 0.04
+SLOW_FACTOR = 10
+
+
+def load_time(rng):
+    seconds = rng.lognormvariate(0, 0.3) * LOAD_MEDIAN
+    return seconds * SLOW_FACTOR if rng.random() < SLOW_SHARE else seconds
+
+
+async def run(hedge):
+    rng = random.Random(5)
+    latency = LatencyTracker()
+    hedger = Hedger(latency, min_delay=0.1) if hedge else None
+    tab_count = WORKERS + (HEDGE_SLOTS if hedge else 0)
+    tabs = asyncio.Semaphore(tab_count)
+    workers = asyncio.Semaphore(WORKERS)
+    busy = 0
+
+    async def load(started=None):
+        nonlocal busy
+        async with tabs:
+            busy += 1
+            if started is not None:
+                started.set()
+            try:
+                seconds = load_time(rng)
+                await asyncio.sleep(seconds)
+                latency.record("place", seconds)
+                return seconds
+            finally:
+                busy -= 1
+
+    async def place():
+        async with workers:
+            started = time.perf_counter()
+            if hedger is not None:
+                await hedger.run(load, spare=lambda: busy < tab_count)
+            else:
+                await load()
+            return time.perf_counter() - started
+
+    query_times, place_times = [], []
+    for _ in range(QUERIES):
+        started = time.perf_counter()
+        place_times += await asyncio.gather(*(place() for _ in range(PLACES_PER_QUERY)))
+        query_times.append(time.perf_counter() - started)
+    return query_times, place_times, hedger
+
+
+async def main():
+    for hedge in (False, True):
+        query_times, place_times, hedger = await run(hedge)
+        label = "hedged  " if hedge else "unhedged"
+        print(f"⏱️ {label} | place p50 {percentile(place_times, 50):.2f}s p99 {percentile(place_times, 99):.2f}s | "
+              f"query mean {sum(query_times) / len(query_times):.2f}s | total {sum(query_times):.1f}s")
+        if hedger is not None:
+            print(hedger.summary())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
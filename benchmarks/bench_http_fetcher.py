@@ -0,0 +1,88 @@
+# Browserless detail fetches against a local aiohttp stand-in for Maps.
+#
+#   python -m benchmarks.bench_http_fetcher
+#
+# The stand-in serves every minimal_html page as a place page in four
+# variants: with embedded state (served over HTTP), without it (incomplete),
+# redirected to /sorry/ (blocked) and rate limited (429). Escalations go to a
+# simulated browser render costing RENDER_DELAY seconds. The default parse is
+# the embedded state decoder, so APP_STATE_DECODE is switched on.
+import asyncio
+import glob
+import time
+
+from aiohttp import web
+
+import app_state
+from benchmarks.bench_app_state import with_state
+from http_fetcher import HttpDetailFetcher
+from result_cards import parse_cards
+
+RENDER_DELAY = 1.5  # Typical goto + content() of a place page in Chromium
+BROWSER_TABS = 5
+VARIANTS = ["state", "state", "state", "plain", "sorry", "limited"]
+
+
+def build_app(pages):
+    async def place(request):
+        index, variant = int(request.match_info["index"]), request.match_info["variant"]
+        if variant == "sorry":
+            raise web.HTTPFound("/sorry/index")
+        if variant == "limited":
+            return web.Response(status=429, text="Too Many Requests")
+        html = pages[index][0] if variant == "state" else pages[index][1]
+        return web.Response(text=html, content_type="text/html")
+
+    async def sorry(request):
+        return web.Response(text="Our systems have detected unusual traffic", content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/maps/place/{index}/{variant}", place)
+    app.router.add_get("/sorry/index", sorry)
+    return app
+
+
+async def main():
+    app_state.APP_STATE_DECODE = True
+    pages = []
+    for path in sorted(glob.glob("minimal_html/*.html")):
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        pages.append((with_state(html, parse_cards(html)[0]), html))
+
+    runner = web.AppRunner(build_app(pages))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    urls = [f"http://127.0.0.1:{port}/maps/place/{i}/{variant}"
+            for i in range(len(pages)) for variant in VARIANTS] * 4
+
+    tabs = asyncio.Semaphore(BROWSER_TABS)
+
+    async def render_in_browser(url):
+        async with tabs:
+            await asyncio.sleep(RENDER_DELAY)
+            return {"source_url": url}
+
+    async with HttpDetailFetcher() as fetcher:
+        async def detail(url):
+            return await fetcher.fetch(url) or await render_in_browser(url)
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(detail(url) for url in urls))
+        fast = time.perf_counter() - start
+        print(fetcher.summary())
+
+    start = time.perf_counter()
+    await asyncio.gather(*(render_in_browser(url) for url in urls))
+    browser_only = time.perf_counter() - start
+    await runner.cleanup()
+
+    assert len(results) == len(urls) and all(results)
+    print(f"⏱️ {len(urls)} places | browser only: {browser_only:.1f}s | "
+          f"HTTP first, browser on escalation: {fast:.1f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
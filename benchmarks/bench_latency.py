@@ -0,0 +1,66 @@
+# Wall time with dead pages: fixed navigation timeouts vs. timeouts from latency percentiles.
+#
+#   python -m benchmarks.bench_latency
+#
+# SimulatedPage.goto takes a log-normal time around NAV_MEDIAN seconds, and
+# DEAD_SHARE of pages never load, holding their tab until the timeout fires
+# exactly as a stuck Playwright navigation does. Times are scaled down 10x:
+# FIXED_TIMEOUT stands for the 120000 ms hard-coded in the scrapers.
+import asyncio
+import random
+import time
+
+from latency import LatencyTracker, timed_goto
+
+NAVIGATIONS = 300
+TABS = 5
+NAV_MEDIAN = 0.25
+DEAD_SHARE = 0.04
+FIXED_TIMEOUT = 12.0
+
+
+class SimulatedPage:
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    async def goto(self, url, timeout=None):
+        if self.seconds is None or self.seconds * 1000 > timeout:
+            await asyncio.sleep(timeout / 1000)
+            raise TimeoutError(f"Timeout {timeout:.0f}ms exceeded.")
+        await asyncio.sleep(self.seconds)
+
+
+async def run(pages, tracker):
+    tabs = asyncio.Semaphore(TABS)
+    failed = 0
+
+    async def visit(page):
+        nonlocal failed
+        async with tabs:
+            try:
+                await timed_goto(page, "https://www.google.com/maps/place/x", tracker, "place", FIXED_TIMEOUT * 1000)
+            except TimeoutError:
+                failed += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(visit(page) for page in pages))
+    return time.perf_counter() - start, failed
+
+
+async def main():
+    random.seed(11)
+    pages = [SimulatedPage(None if random.random() < DEAD_SHARE else random.lognormvariate(0, 0.5) * NAV_MEDIAN)
+             for _ in range(NAVIGATIONS)]
+
+    # min_samples above the run size keeps the call site's fixed timeout throughout
+    fixed, fixed_failed = await run(pages, LatencyTracker(min_samples=NAVIGATIONS + 1))
+    adaptive_tracker = LatencyTracker(floor=1.0, ceiling=FIXED_TIMEOUT)
+    adaptive, adaptive_failed = await run(pages, adaptive_tracker)
+
+    print(adaptive_tracker.summary())
+    print(f"⏱️ {NAVIGATIONS} navigations over {TABS} tabs | fixed {FIXED_TIMEOUT:g}s timeout: {fixed:.1f}s "
+          f"({fixed_failed} timed out) | p99-derived timeout: {adaptive:.1f}s ({adaptive_failed} timed out)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,74 @@
+# Decoding captured search/place payloads vs. parsing rendered HTML.
+#
+#   python -m benchmarks.bench_network_capture
+#
+# Replays captured_payloads/ through NetworkCapture, checks every place
+# resolves by its card URL to the same fields the result card shows, and
+# times JSON decoding against DOM parsing of the same result pages. The
+# fixtures are synthetic, written from PLACE_FIELD_PATHS, so the field check
+# is a round trip of the decoder's own layout, not a check of the index
+# paths against real Maps responses (see captured_payloads/README.md).
+import glob
+import os
+import time
+
+from network_capture import NetworkCapture
+from result_cards import card_details, parse_cards
+
+ROUNDS = 20
+URL_BY_KIND = {
+    "search": "https://www.google.com/search?tbm=map&q=fixture",
+    "place": "https://www.google.com/maps/preview/place?q=fixture",
+}
+COMPARED_FIELDS = ["name", "rating", "review_count", "category", "address", "phone", "website"]
+
+
+def load_bodies():
+    bodies = []
+    for path in sorted(glob.glob("captured_payloads/*.txt")):
+        kind = os.path.basename(path).split("_", 1)[0]
+        with open(path, encoding="utf-8") as f:
+            bodies.append((URL_BY_KIND[kind], f.read()))
+    return bodies
+
+
+def main():
+    bodies = load_bodies()
+    capture = NetworkCapture(record_dir=None)
+    for url, text in bodies:
+        capture.feed(url, text)
+
+    htmls = []
+    checked = 0
+    for path in sorted(glob.glob("minimal_html/*.html")):
+        with open(path, encoding="utf-8") as f:
+            htmls.append(f.read())
+        for card in parse_cards(htmls[-1]):
+            record = capture.lookup(card["href"])
+            assert record, f"No captured record for {card['href']}"
+            expected = card_details(card)
+            assert all(record[k] == expected[k] for k in COMPARED_FIELDS), f"Mismatch for {card['name']}"
+            checked += 1
+    print(f"✅ {checked} places round-tripped through {len(bodies)} synthetic payloads "
+          f"(index paths not checked against real Maps responses)")
+    print(capture.summary())
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        replay = NetworkCapture(record_dir=None)
+        for url, text in bodies:
+            replay.feed(url, text)
+    network_ms = (time.perf_counter() - start) / ROUNDS * 1000
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for html in htmls:
+            parse_cards(html)
+    dom_ms = (time.perf_counter() - start) / ROUNDS * 1000
+
+    print(f"⏱️ Decode all payloads: {network_ms:.2f} ms | DOM parse of the same pages: {dom_ms:.2f} ms "
+          f"({dom_ms / network_ms:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+# Outgoing record formatting: per-record dicts vs. the pandas batch stage.
+#
+#   python -m benchmarks.bench_normalize
+#
+# Builds RECORDS raw business dicts from the minimal_html result cards, with
+# the noise scraped records carry: padded/multi-space text, "1,234" review
+# counts, phones in several display formats, upper-case website hosts,
+# missing addresses and duplicates of the same place. The records are split
+# into queries of QUERY_SIZES results each. Times the old
+# format_result_for_api (no cleanup), a per-record loop doing the same
+# cleanup as normalize.format_results_for_api (checked to give identical
+# records), and the batch stage called once per query (v8, which sends as
+# queries finish) and once per cycle (v7.2).
+import glob
+import random
+import re
+import time
+from datetime import datetime
+
+from normalize import format_results_for_api
+from phones import PHONES
+from result_cards import card_details, parse_cards
+
+RECORDS = 20_000
+QUERY_SIZES = [20, 120, 1000, RECORDS]
+REGION = "US"
+
+
+def format_result_for_api(business, query_id, industry, source_url=""):
+    # v7.2 before normalize.py
+    return {
+        "id": query_id,
+        "title": business.get("name"),
+        "category": industry,
+        "address": business.get("address"),
+        "phone": business.get("phone"),
+        "website": business.get("website"),
+        "email": business.get("email"),
+        "star_rating": float(business.get("rating")) if business.get("rating") else None,
+        "review_count": int(business.get("review_count")) if business.get("review_count") else None,
+        "source_url": source_url or business.get("source_url", ""),
+        "scraped_at": datetime.utcnow().isoformat() + "Z"
+    }
+
+
+def _text(value):
+    value = re.sub(r"\s+", " ", value).strip() if value is not None else None
+    return value or None
+
+
+def _url(value):
+    match = re.match(r"^(https?)://([^/?#\s]+)([^#\s]*)", value.strip(), re.IGNORECASE) if value else None
+    if not match:
+        return None
+    rest = "" if match.group(3) == "/" else match.group(3)
+    return f"{match.group(1).lower()}://{match.group(2).lower()}{rest}"
+
+
+def _number(value, pattern):
+    match = re.search(pattern, str(value).replace(",", "")) if value is not None else None
+    return match.group(1) if match else None
+
+
+def format_record_cleaned(business, query_id, industry, scraped_at):
+    phone = _text(business.get("phone"))
+    rating = _number(str(business.get("rating")).replace(",", ".") if business.get("rating") is not None else None,
+                     r"(\d+(?:\.\d+)?)")
+    reviews = _number(business.get("review_count"), r"(\d+)")
+    email = _text(business.get("email"))
+    return {
+        "id": query_id,
+        "title": _text(business.get("name")),
+        "category": _text(industry),
+        "address": _text(business.get("address")),
+        "phone": (PHONES.extract(phone, REGION) or phone) if phone else None,
+        "website": _url(business.get("website")),
+        "email": email.lower() if email else None,
+        "star_rating": float(rating) if rating else None,
+        "review_count": int(reviews) if reviews else None,
+        "source_url": re.sub(r"\s+", "", business.get("source_url") or ""),
+        "scraped_at": scraped_at,
+    }
+
+
+def format_batch_cleaned(businesses, query_id, industry):
+    # Same merge rule as the batch stage: first non-null value per column
+    scraped_at = datetime.utcnow().isoformat() + "Z"
+    merged, order = {}, []
+    for index, business in enumerate(businesses):
+        record = format_record_cleaned(business, query_id, industry, scraped_at)
+        key = tuple((record[c] or "").casefold() if isinstance(record[c], str) or record[c] is None else record[c]
+                    for c in ("id", "title", "address"))
+        key += ((index if record["title"] is None or record["address"] is None else -1),)
+        if key not in merged:
+            merged[key] = record
+            order.append(key)
+        else:
+            for column, value in record.items():
+                if merged[key][column] is None:
+                    merged[key][column] = value
+    return [merged[key] for key in order]
+
+
+def noisy(business, rng):
+    business = dict(business)
+    if business["name"] and rng.random() < 0.3:
+        business["name"] = "  " + business["name"].replace(" ", "   ") + " "
+    if business["review_count"] and rng.random() < 0.3:
+        business["review_count"] = f"{int(business['review_count']) * 37:,}"
+    phone = business["phone"]
+    if phone and phone.startswith("+1 ") and rng.random() < 0.5:
+        digits = "".join(ch for ch in phone if ch.isdigit())[-10:]
+        business["phone"] = rng.choice([f"({digits[:3]}) {digits[3:6]}-{digits[6:]}", f"{digits[:3]}.{digits[3:6]}.{digits[6:]}"])
+    if business["website"] and rng.random() < 0.3:
+        business["website"] = business["website"].upper()
+    if rng.random() < 0.05:
+        business["address"] = None  # Address failed to extract; must not merge with a same-named place
+    return business
+
+
+def build_records():
+    places = []
+    for path in sorted(glob.glob("minimal_html/*.html")):
+        with open(path, encoding="utf-8") as f:
+            places.extend(card_details(card) for card in parse_cards(f.read()))
+    rng = random.Random(7)
+    records = []
+    while len(records) < RECORDS:
+        place = dict(rng.choice(places))
+        suffix = rng.randrange(RECORDS // 2)  # Repeats of a suffix are duplicates of the same place
+        place["name"] = f"{place['name']} #{suffix}"
+        records.append(noisy(place, rng))
+    return records
+
+
+def queries(records, size):
+    return [(index, "Dentist", records[i:i + size]) for index, i in enumerate(range(0, len(records), size))]
+
+
+def time_queries(fn, batches):
+    start = time.perf_counter()
+    out = []
+    for query_id, industry, businesses in batches:
+        out.extend(fn(businesses, query_id, industry))
+    return time.perf_counter() - start, out
+
+
+def without_timestamps(records):
+    return [{k: v for k, v in record.items() if k != "scraped_at"} for record in records]
+
+
+def main():
+    records = build_records()
+    failures = []
+
+    def old(batch, query_id, industry):
+        out = []
+        for business in batch:
+            try:
+                out.append(format_result_for_api(business, query_id, industry))
+            except ValueError:  # int("1,234") aborted the whole send loop in v7.2
+                failures.append(business)
+        return out
+
+    per_query = lambda batch, query_id, industry: format_results_for_api([(query_id, industry, batch)], REGION)
+    rate = lambda seconds: f"{len(records) / seconds:,.0f} rec/s"
+
+    print(f"📦 {len(records):,} raw records")
+    for size in QUERY_SIZES:
+        batches = queries(records, size)
+        failures.clear()
+        old_s, _ = time_queries(old, batches)
+        PHONES.normalize.cache_clear()
+        cleaned_s, cleaned = time_queries(format_batch_cleaned, batches)
+        PHONES.normalize.cache_clear()
+        query_s, per_query_out = time_queries(per_query, batches)
+        PHONES.normalize.cache_clear()
+        start = time.perf_counter()
+        cycle = format_results_for_api(batches, REGION)
+        cycle_s = time.perf_counter() - start
+        assert without_timestamps(per_query_out) == without_timestamps(cleaned), f"per-query calls differ at {size}"
+        assert without_timestamps(cycle) == without_timestamps(cleaned), f"cycle call differs at {size}"
+        print(f"⏱️ {len(batches):>4,} queries of {size:>6,}: format_result_for_api {rate(old_s)} "
+              f"(no cleanup, {len(failures):,} raised) | per-record cleanup {rate(cleaned_s)} | "
+              f"pandas per query {rate(query_s)} ({cleaned_s / query_s:.1f}x) | "
+              f"pandas per cycle {rate(cycle_s)} ({cleaned_s / cycle_s:.1f}x) | {len(cycle):,} records out")
+
+
+if __name__ == "__main__":
+    main()
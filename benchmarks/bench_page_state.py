@@ -0,0 +1,56 @@
+# Page-state classification of saved search pages and synthetic interstitials.
+#
+#   python -m benchmarks.bench_page_state
+#
+# Runs classify_html (the Python mirror of CLASSIFY_JS) over minimal_html/
+# and over interstitials built from one fixture: a populated consent dialog,
+# a /sorry/ captcha page, an "unusual traffic" block and an empty search.
+# Every one of these used to cost the full 60 s wait_for_selector timeout.
+import glob
+import time
+
+from page_state import READY, classify_html
+
+OLD_TIMEOUT = 60
+
+CONSENT_DIALOG = ('<div class="Hk4XGb id-consent-bump" id="consent-bump"><form action="https://consent.google.com/save">'
+                  '<button aria-label="Accept all">Accept all</button></form></div>')
+SORRY_PAGE = ('<html><body><div id="captcha-form"><form action="/sorry/index"><div class="g-recaptcha"></div></form>'
+              '</div></body></html>')
+BLOCKED_PAGE = ("<html><body><h1>Sorry...</h1><p>Our systems have detected unusual traffic from your computer "
+                "network.</p></body></html>")
+
+
+def interstitials(html):
+    without_results = html.replace("Nv2PK", "removed").replace('href="/maps/place/', 'href="/removed/') \
+                          .replace('href="https://www.google.com/maps/place/', 'href="/removed/')
+    return {
+        "consent": (without_results.replace('<div class="Hk4XGb id-consent-bump" id="consent-bump"></div>',
+                                            CONSENT_DIALOG), "https://www.google.com/maps/search/x"),
+        "captcha": (SORRY_PAGE, "https://www.google.com/sorry/index?continue=..."),
+        "blocked": (BLOCKED_PAGE, "https://www.google.com/maps/search/x"),
+        "empty": (without_results.replace("<body", "<body><div>Google Maps can't find xyz</div><div", 1),
+                  "https://www.google.com/maps/search/x"),
+    }
+
+
+def main():
+    cases = []
+    for path in sorted(glob.glob("minimal_html/*.html")):
+        with open(path, encoding="utf-8") as f:
+            cases.append((path, READY, f.read(), "https://www.google.com/maps/search/x"))
+    for expected, (html, url) in interstitials(cases[0][2]).items():
+        cases.append((f"synthetic {expected}", expected, html, url))
+
+    for name, expected, html, url in cases:
+        start = time.perf_counter()
+        state = classify_html(html, url)
+        elapsed = (time.perf_counter() - start) * 1000
+        mark = "✅" if state == expected else "❌"
+        was = f" (was a {OLD_TIMEOUT}s timeout)" if expected != READY else ""
+        print(f"{mark} {name}: {state} in {elapsed:.1f} ms{was}")
+    assert all(classify_html(html, url) == expected for _, expected, html, url in cases)
+
+
+if __name__ == "__main__":
+    main()
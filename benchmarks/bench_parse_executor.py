@@ -0,0 +1,86 @@
+# Event-loop lag and throughput: parsing inline vs. in ParseExecutor workers.
+#
+#   python -m benchmarks.bench_parse_executor
+#
+# Simulates CONCURRENT_PAGES detail tabs: each "navigation" is an async sleep,
+# then the fixture HTML is parsed with v8.parse_place_details. A ticker task
+# sleeps TICK seconds in a loop and records how late it wakes up; that overshoot
+# is the time other coroutines (scrolling, navigation, HTTP) would stall.
+import asyncio
+import glob
+import statistics
+import time
+
+import v8
+from parse_executor import ParseExecutor
+
+CONCURRENT_PAGES = 12
+PAGES_PER_RUN = 120
+NAVIGATION_DELAY = 0.05
+TICK = 0.01
+
+
+async def ticker(lags, stop):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(TICK)
+        lags.append((loop.time() - start - TICK) * 1000)
+
+
+async def run(documents, parse):
+    queue = asyncio.Queue()
+    for i in range(PAGES_PER_RUN):
+        queue.put_nowait(documents[i % len(documents)])
+    results, lags, stop = [], [], asyncio.Event()
+
+    async def tab():
+        while not queue.empty():
+            html = queue.get_nowait()
+            await asyncio.sleep(NAVIGATION_DELAY)
+            results.append(await parse(html))
+
+    tick_task = asyncio.create_task(ticker(lags, stop))
+    start = time.perf_counter()
+    await asyncio.gather(*(tab() for _ in range(CONCURRENT_PAGES)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await tick_task
+    return results, elapsed, lags
+
+
+def report(label, elapsed, lags):
+    lags = sorted(lags)
+    p95 = lags[int(len(lags) * 0.95) - 1] if lags else 0.0
+    print(
+        f"⏱️ {label}: {PAGES_PER_RUN / elapsed:.1f} pages/sec | "
+        f"loop lag p50 {statistics.median(lags) if lags else 0.0:.1f} ms, "
+        f"p95 {p95:.1f} ms, max {lags[-1] if lags else 0.0:.1f} ms"
+    )
+
+
+async def main():
+    documents = []
+    for path in sorted(glob.glob("minimal_html/*.html")):
+        with open(path, encoding="utf-8") as f:
+            documents.append(f.read())
+
+    async def inline(html):
+        return v8.parse_place_details(html)
+
+    inline_results, elapsed, lags = await run(documents, inline)
+    report("Inline parsing   ", elapsed, lags)
+
+    async with ParseExecutor(v8.parse_place_details) as executor:
+        await executor.submit(documents[0])  # Spawn workers outside the timed run
+        pooled_results, elapsed, lags = await run(documents, executor.submit)
+        report("Process pool     ", elapsed, lags)
+        print(f"📦 {executor.stats['documents'] - 1} documents in {executor.stats['batches'] - 1} batches")
+
+    key = lambda r: sorted(map(repr, r))
+    assert key(inline_results) == key(pooled_results), "Pooled results differ from inline parsing"
+    print(f"✅ Identical results for {PAGES_PER_RUN} pages")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
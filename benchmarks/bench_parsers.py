@@ -0,0 +1,40 @@
+# Parser backend equivalence check and docs/sec on the minimal_html fixtures.
+#
+#   python -m benchmarks.bench_parsers
+#
+# Every backend must produce exactly the html.parser record for every page.
+import glob
+import time
+
+import v8
+from parser_backends import get_backend
+
+BACKENDS = ["html.parser", "bs4-lxml", "lxml"]
+ROUNDS = 5
+
+
+def main():
+    pages = []
+    for path in sorted(glob.glob("minimal_html/*.html")):
+        with open(path, encoding="utf-8") as f:
+            pages.append((path, f.read()))
+
+    reference = get_backend("html.parser")
+    expected = {path: v8.parse_place_details(html, reference) for path, html in pages}
+
+    for name in BACKENDS:
+        backend = get_backend(name)
+        for path, html in pages:
+            got = v8.parse_place_details(html, backend)
+            assert got == expected[path], f"{name} differs on {path}: {got} != {expected[path]}"
+
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            for _, html in pages:
+                v8.parse_place_details(html, backend)
+        elapsed = time.perf_counter() - start
+        print(f"✅ {name:<12} identical on {len(pages)} pages | {ROUNDS * len(pages) / elapsed:7.1f} docs/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# Phone extraction: the old regex / PhoneNumberMatcher variants vs. PhoneExtractor.
+#
+#   python -m benchmarks.bench_phones
+#
+# Coverage: every result-card phone of the minimal_html pages, with the US
+# numbers also written the ways US sites show them ((706) 323-3816,
+# 706-323-3816, 706.323.3816); the pages mix US and Kenyan numbers, so the
+# region hint decides which national formats parse. Throughput: the
+# whole-document text of each page, first phone only, as v7.3 used to scan
+# it; PhoneExtractor is timed with a cold LRU and again warm, and reports
+# candidates/sec.
+import glob
+import re
+import time
+
+import lxml.html
+import phonenumbers
+
+from phones import PhoneExtractor
+from result_cards import parse_cards
+
+ROUNDS = 20
+
+# v5-v8 before phones.py; `$$` is a literal-end anchor, so (555) numbers never match
+OLD_US_PHONE_PATTERNS = [
+    r'\+1\s\d{3}-\d{3}-\d{4}',
+    r'$$\d{3}$$\s\d{3}-\d{4}',
+    r'\d{3}-\d{3}-\d{4}'
+]
+
+
+def old_regex_phone(text):
+    for pattern in OLD_US_PHONE_PATTERNS:
+        match = re.search(pattern, text)
+        if match:
+            return match.group(0)
+    return None
+
+
+def old_matcher_phone(text):
+    # v7.3 before phones.py: no region, so only +country numbers parse
+    for match in phonenumbers.PhoneNumberMatcher(text, None):
+        return phonenumbers.format_number(match.number, phonenumbers.PhoneNumberFormat.E164)
+    return None
+
+
+def us_variants(phone):
+    digits = "".join(ch for ch in phone if ch.isdigit())[-10:]
+    area, exchange, line = digits[:3], digits[3:6], digits[6:]
+    return [phone, f"({area}) {exchange}-{line}", f"{area}-{exchange}-{line}", f"{area}.{exchange}.{line}"]
+
+
+def load_pages():
+    pages = []
+    for path in sorted(glob.glob("minimal_html/*.html")):
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        doc = lxml.html.document_fromstring(html)
+        text = " ".join(s for s in (s.strip() for s in doc.xpath("//text()")) if s)
+        pages.append((text, [c["phone"] for c in parse_cards(html) if c["phone"]]))
+    return pages
+
+
+def coverage(pages):
+    samples = []
+    for _, phones in pages:
+        for phone in phones:
+            samples.extend(us_variants(phone) if phone.startswith("+1 ") else [phone])
+    extractors = {
+        "old v8 regex": old_regex_phone,
+        "old v7.3 matcher": old_matcher_phone,
+        "phones (US hint)": PhoneExtractor(region="US").extract,
+        "phones (KE hint)": PhoneExtractor(region="KE").extract,
+    }
+    print(f"📞 {len(samples)} displayed phones:")
+    for name, fn in extractors.items():
+        start = time.perf_counter()
+        found = sum(1 for sample in samples if fn(sample))
+        elapsed = time.perf_counter() - start
+        line = f"   {name:<17} {found:>3} parsed | {elapsed / len(samples) * 1_000_000:5.1f} µs/phone"
+        if hasattr(fn, "__self__"):
+            line += f" | {fn.__self__.candidate_count / elapsed:,.0f} candidates/s (cold LRU)"
+        print(line)
+
+
+def throughput(pages):
+    texts = [text for text, _ in pages]
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        old = [old_matcher_phone(text) for text in texts]
+    old_s = time.perf_counter() - start
+
+    extractor = PhoneExtractor(region="US")
+    start = time.perf_counter()
+    cold = [extractor.extract(text) for text in texts]
+    cold_s = time.perf_counter() - start
+    cold_candidates = extractor.candidate_count
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        warm = [extractor.extract(text) for text in texts]
+    warm_s = time.perf_counter() - start
+    warm_candidates = extractor.candidate_count - cold_candidates
+
+    per_text = lambda seconds, rounds: seconds / (rounds * len(texts)) * 1000
+    print(f"⏱️ Whole-page text, first phone: old v7.3 matcher {per_text(old_s, ROUNDS):.2f} ms/page "
+          f"({sum(1 for p in old if p)}/{len(texts)} found)")
+    print(f"⏱️ PhoneExtractor cold: {per_text(cold_s, 1):.2f} ms/page, {cold_candidates / cold_s:,.0f} candidates/s "
+          f"({sum(1 for p in cold if p)}/{len(texts)} found)")
+    print(f"⏱️ PhoneExtractor warm: {per_text(warm_s, ROUNDS):.3f} ms/page, {warm_candidates / warm_s:,.0f} "
+          f"candidates/s ({sum(1 for p in warm if p)}/{len(texts)} found)")
+    print(extractor.summary())
+
+
+def main():
+    pages = load_pages()
+    coverage(pages)
+    throughput(pages)
+
+
+if __name__ == "__main__":
+    main()
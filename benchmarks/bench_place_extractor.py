@@ -0,0 +1,63 @@
+# Single-pass ExtractionPlan vs. per-selector soup.select lookups in v8.
+#
+#   python -m benchmarks.bench_place_extractor
+#
+# Also asserts both paths return identical fields on every minimal_html page.
+import glob
+import time
+
+from bs4 import BeautifulSoup
+
+import v8
+
+ROUNDS = 5
+
+
+def sequential_fields(soup):
+    rating_block = None
+    rating_span = soup.select_one('span[role="img"]')
+    if rating_span and rating_span.has_attr("aria-label"):
+        rating_block = rating_span["aria-label"]
+    website = None
+    for selector in v8.SELECTORS["website"]:
+        el = soup.select_one(selector)
+        if el and el.has_attr("href"):
+            href = el["href"]
+            if href.startswith(("http://", "https://")):
+                website = href
+                break
+    return {
+        "name": v8.get_first_text(soup, v8.SELECTORS["name"], filter_invalid=True),
+        "rating_block": rating_block,
+        "address": v8.get_first_text(soup, v8.SELECTORS["address"]),
+        "website": website,
+    }
+
+
+def timed(fn, soups):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for soup in soups:
+            fn(soup)
+    return (time.perf_counter() - start) / (ROUNDS * len(soups)) * 1000
+
+
+def main():
+    files = sorted(glob.glob("minimal_html/*.html"))
+    soups = []
+    for path in files:
+        with open(path, encoding="utf-8") as f:
+            soups.append(BeautifulSoup(f.read(), "html.parser"))
+
+    for path, soup in zip(files, soups):
+        assert sequential_fields(soup) == v8.PLACE_PLAN.extract(soup), f"Mismatch on {path}"
+    print(f"✅ Identical fields on {len(files)} fixtures")
+
+    before = timed(sequential_fields, soups)
+    after = timed(v8.PLACE_PLAN.extract, soups)
+    print(f"⏱️ Per-selector lookups: {before:.2f} ms/doc")
+    print(f"⏱️ Single-pass plan:     {after:.2f} ms/doc ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# Time spent waiting on detail pages: fixed sleeps vs. readiness waits.
+#
+#   python -m benchmarks.bench_readiness
+#
+# SimulatedPlacePage renders its header and rating/address block after a
+# delay drawn from RENDER_TIMES (most pages are quick, a few are slow, one
+# never finishes), and answers wait_for_function the way Playwright does:
+# resolve once the condition holds, raise on timeout. The cap is
+# READY_TIMEOUT, the old sleep, so a page that never renders costs no more
+# than before.
+import asyncio
+import random
+import time
+
+from readiness import READY_TIMEOUT, ReadinessStats, wait_until_ready
+
+FIXED_WAIT = 5.0  # What main.py / google.py / v2-v4 slept after every goto
+RENDER_TIMES = [0.4, 0.6, 0.8, 0.9, 1.1, 1.4, 2.0, None]  # None: never renders
+PAGES = 40
+TABS = 8
+
+
+class SimulatedPlacePage:
+    def __init__(self, render_time):
+        self.render_time = render_time
+
+    async def wait_for_function(self, script, arg=None, timeout=None):
+        if self.render_time is None or self.render_time * 1000 > timeout:
+            await asyncio.sleep(timeout / 1000)
+            raise TimeoutError(f"Timeout {timeout}ms exceeded.")
+        await asyncio.sleep(self.render_time)
+        return True
+
+
+async def run(pages, wait):
+    tabs = asyncio.Semaphore(TABS)
+
+    async def visit(page):
+        async with tabs:
+            await wait(page)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(visit(page) for page in pages))
+    return time.perf_counter() - start
+
+
+async def main():
+    random.seed(7)
+    pages = [SimulatedPlacePage(random.choice(RENDER_TIMES)) for _ in range(PAGES)]
+
+    fixed = await run(pages, lambda page: asyncio.sleep(FIXED_WAIT))
+    stats = ReadinessStats()
+    ready = await run(pages, lambda page: wait_until_ready(page, stats, timeout=READY_TIMEOUT))
+
+    print(stats.summary(fixed_wait=FIXED_WAIT))
+    print(f"⏱️ {PAGES} pages over {TABS} tabs | fixed {FIXED_WAIT:g}s sleeps: {fixed:.1f}s | "
+          f"readiness waits capped at {READY_TIMEOUT:g}s: {ready:.1f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
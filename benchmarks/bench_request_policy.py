@@ -0,0 +1,84 @@
+# Bandwidth and latency per place with and without the RequestPolicy.
+#
+#   python -m benchmarks.bench_request_policy --places 10
+#
+# Loads place URLs from links.json against live Google Maps, so it needs
+# network access. Transfer sizes come from request.sizes() of every finished
+# request, i.e. what actually crossed the wire.
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from browser_pool import BrowserPool
+from request_policy import RequestPolicy
+
+LINKS_FILE = "links.json"
+
+
+async def load_place(context, url):
+    page = await context.new_page()
+    sizes = []
+
+    async def record(request):
+        try:
+            info = await request.sizes()
+            sizes.append(info["responseBodySize"] + info["responseHeadersSize"])
+        except Exception:
+            pass
+
+    pending = []
+    page.on("requestfinished", lambda request: pending.append(asyncio.ensure_future(record(request))))
+    start = time.perf_counter()
+    await page.goto(url, timeout=120000)
+    await page.wait_for_selector(".DUwDvf", timeout=60000)
+    elapsed = time.perf_counter() - start
+    await asyncio.gather(*pending)
+    await page.close()
+    return sum(sizes), elapsed
+
+
+async def run(pool, links, policy):
+    transferred, latencies = [], []
+    async with pool.context() as context:
+        if policy:
+            await policy.install(context)
+        for url in links:
+            try:
+                size, elapsed = await load_place(context, url)
+            except Exception as e:
+                print(f"⚠️ {url[:80]}: {str(e)}")
+                continue
+            transferred.append(size)
+            latencies.append(elapsed)
+    return transferred, latencies
+
+
+def report(label, transferred, latencies):
+    if not transferred:
+        print(f"{label}: no successful loads")
+        return
+    print(
+        f"{label}: {statistics.mean(transferred) / 1024:.0f} KB/place | "
+        f"median {statistics.median(latencies):.2f}s | max {max(latencies):.2f}s"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--places", type=int, default=10)
+    args = parser.parse_args()
+
+    with open(LINKS_FILE, "r") as f:
+        links = json.load(f)[:args.places]
+
+    policy = RequestPolicy()
+    async with BrowserPool() as pool:
+        report("🌐 No policy  ", *await run(pool, links, None))
+        report("🛡️ With policy", *await run(pool, links, policy))
+    print(policy.summary())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
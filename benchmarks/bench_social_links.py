@@ -0,0 +1,107 @@
+# Social link extraction: the old per-URL regex loop vs. SocialLinkMatcher.
+#
+#   python -m benchmarks.bench_social_links
+#
+# The minimal_html pages carry no social links, so each gets a place pane
+# with the kind of links Maps and business sites show: www/m./tracking
+# variants of the same profiles, a Google /url? redirect and look-alike hosts
+# (dropbox.com, linux.com) the old substring patterns also matched. Times
+# both matchers on the same candidates in two scopes: the place pane (text
+# and hrefs, mostly social) and every link on the page (mostly Maps place and
+# business website URLs), and counts the links each returns.
+import glob
+import re
+import time
+
+import lxml.html
+
+from social_links import extract_social_links
+from text_regions import TextRegions
+
+ROUNDS = 200
+BATCHES = 5
+
+# v8's matcher before social_links.py
+OLD_PATTERNS = [
+    r"(?:facebook\.com|fb\.com)",
+    r"(?:instagram\.com|instagr\.am)",
+    r"(?:twitter\.com|x\.com)",
+    r"linkedin\.com",
+    r"youtube\.com|youtu\.be",
+    r"tiktok\.com|tik\.to|tiktok\.tv",
+    r"pinterest\.com",
+    r"reddit\.com",
+    r"whatsapp\.com",
+]
+OLD_URL_PATTERN = r"https?://[^\s\"'>]+"
+OLD_URL_RE = re.compile(OLD_URL_PATTERN)
+
+PLACE_PANE = """
+<div role="main" aria-label="Joe's Pizza">
+  <h1 class="DUwDvf">Joe's Pizza</h1>
+  <a data-item-id="authority" href="https://www.google.com/url?q=https://joespizza.example/&sa=U">joespizza.example</a>
+  <div class="Io6YTe">Follow us https://www.facebook.com/JoesPizza/ or https://m.facebook.com/JoesPizza?ref=bookmarks,
+    https://www.instagram.com/joes.pizza/?igshid=abc and https://twitter.com/joespizza.
+    Menu PDF: https://www.dropbox.com/s/menu.pdf - blog https://www.linux.com/news</div>
+  <a href="https://www.google.com/url?q=https://www.facebook.com/JoesPizza&sa=U">Facebook</a>
+  <a href="https://instagram.com/joes.pizza">Instagram</a>
+  <a href="https://x.com/joespizza?s=20">X</a>
+  <a href="https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=10s">Video</a>
+  <a href="https://www.tiktok.com/@joespizza">TikTok</a>
+</div>
+"""
+
+
+def old_extract_social_links(full_text, patterns, url_pattern):
+    urls = re.findall(url_pattern, full_text)
+    matched = []
+    for url in urls:
+        for pattern in patterns:
+            if re.search(pattern, url, re.IGNORECASE):
+                matched.append(url)
+                break
+    return list(set(matched))
+
+
+def time_it(fn):
+    """Best of BATCHES runs of ROUNDS calls, in µs per call."""
+    times = []
+    for _ in range(BATCHES):
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times) / ROUNDS * 1_000_000, result
+
+
+def main():
+    totals = {}
+    for path in sorted(glob.glob("minimal_html/*.html")):
+        with open(path, encoding="utf-8") as f:
+            html = f.read().replace("</body>", PLACE_PANE + "</body>", 1)
+        doc = lxml.html.document_fromstring(html)
+        regions = TextRegions(doc)
+        scopes = {  # (text, hrefs); the old matcher only reads text, so hrefs are appended to it
+            "place pane": (regions.pane, regions.hrefs),
+            "page links": ("", [el.get("href") for el in doc.iter("a") if el.get("href")]),
+        }
+        line = []
+        for scope, (text, hrefs) in scopes.items():
+            old_text = "\n".join([text] + hrefs)
+            old_us, old = time_it(lambda: old_extract_social_links(old_text, OLD_PATTERNS, OLD_URL_PATTERN))
+            new_us, new = time_it(lambda: extract_social_links(text, hrefs))
+            total = totals.setdefault(scope, {"old": 0.0, "new": 0.0, "urls": 0})
+            total["old"] += old_us
+            total["new"] += new_us
+            total["urls"] += len(OLD_URL_RE.findall(old_text))
+            line.append(f"{scope}: regex loop {old_us:.0f} µs, {len(old)} links | matcher {new_us:.0f} µs, {len(new)} links")
+        print(f"🔗 {path}: " + " || ".join(line))
+    for scope, total in totals.items():
+        print(f"⏱️ {scope} ({total['urls']} URLs): regex loop {total['old']:.0f} µs | "
+              f"matcher {total['new']:.0f} µs ({total['old'] / total['new']:.1f}x)")
+    print("   regex loop: " + ", ".join(sorted(old)))
+    print("   matcher:    " + ", ".join(new))
+
+
+if __name__ == "__main__":
+    main()
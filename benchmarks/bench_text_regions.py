@@ -0,0 +1,102 @@
+# Regex-field extraction from whole-document text vs. scoped TextRegions.
+#
+#   python -m benchmarks.bench_text_regions
+#
+# Builds place pages the way Maps serves them when a place is opened from
+# the results: every minimal_html results list, plus a place pane (header,
+# address / phone / website info rows) for one of its cards. Times the text
+# gathering and v8's phone and social extraction on one parsed document, and
+# counts phones that belong to another business (wrong) or were not found at
+# all (missed; with the US region hint, Kenyan national numbers do not parse).
+import glob
+import importlib.util
+import time
+
+import lxml.html
+
+from result_cards import parse_cards
+from text_regions import TextRegions
+
+ROUNDS = 20
+
+PLACE_PANE = """
+<div role="main" aria-label="{name}">
+  <h1 class="DUwDvf">{name}</h1>
+  <div class="F7nice"><span role="img" aria-label="{rating} stars">{rating}</span></div>
+  <button data-item-id="address"><div class="Io6YTe">{address}</div></button>
+  <a data-item-id="authority" href="{website}"><div class="Io6YTe">{domain}</div></a>
+  <button data-item-id="phone:tel:{digits}"><div class="Io6YTe">{phone}</div></button>
+</div>
+"""
+
+
+def load(path, name):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def place_pages():
+    pages = []
+    for path in sorted(glob.glob("minimal_html/*.html")):
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        # A card deep in the list, so the list's own phones come first in document order
+        card = [c for c in parse_cards(html) if c["phone"] and c["address"]][-1]
+        pane = PLACE_PANE.format(
+            name=card["name"], rating=card["rating_text"] or "4.5", address=card["address"],
+            website="https://example.com/", domain="example.com", phone=card["phone"],
+            digits="".join(ch for ch in card["phone"] if ch.isdigit()),
+        )
+        pages.append((html.replace("</body>", pane + "</body>", 1), card["phone"]))
+    return pages
+
+
+def fields_full_text(module, doc, text):
+    full_text = text(doc)
+    return module.extract_phone(full_text), module.extract_social_links(full_text)
+
+
+def fields_regions(module, doc):
+    regions = TextRegions(doc)
+    phone = module.extract_phone(regions.info) or module.extract_phone(regions.pane)
+    return phone, module.extract_social_links(regions.pane, regions.hrefs)
+
+
+def digits(phone):
+    return "".join(ch for ch in phone if ch.isdigit())[-9:]
+
+
+def time_it(fn):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        result = fn()
+    return (time.perf_counter() - start) / ROUNDS * 1000, result
+
+
+def main():
+    v8 = load("v8.py", "v8")
+    text = lambda doc: " ".join(s for s in (s.strip() for s in doc.xpath("//text()")) if s)
+    for label, module in (("v8", v8),):
+        totals = {"full": 0.0, "scoped": 0.0}
+        outcomes = {"full": {"wrong": 0, "missed": 0}, "scoped": {"wrong": 0, "missed": 0}}
+        pages = place_pages()
+        for html, expected in pages:
+            doc = lxml.html.document_fromstring(html)
+            full_ms, (full_phone, _) = time_it(lambda: fields_full_text(module, doc, text))
+            scoped_ms, (scoped_phone, _) = time_it(lambda: fields_regions(module, doc))
+            totals["full"] += full_ms
+            totals["scoped"] += scoped_ms
+            for key, phone in (("full", full_phone), ("scoped", scoped_phone)):
+                if phone is None:
+                    outcomes[key]["missed"] += 1
+                elif digits(phone) != digits(expected):
+                    outcomes[key]["wrong"] += 1
+        describe = lambda key: (f"{totals[key]:.1f} ms, {outcomes[key]['wrong']} wrong / "
+                                f"{outcomes[key]['missed']} missed of {len(pages)} phones")
+        print(f"⏱️ {label}: whole document {describe('full')} | text regions {describe('scoped')}")
+
+
+if __name__ == "__main__":
+    main()
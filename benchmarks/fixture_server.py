@@ -0,0 +1,26 @@
+import os
+import threading
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+# --- Configurable Settings ---
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "minimal_html")
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+# --- Serve minimal_html fixtures on localhost for offline benchmarks ---
+def start_fixture_server(directory=FIXTURE_DIR, port=0):
+    handler = partial(_QuietHandler, directory=directory)
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    return server, base_url
+
+
+def fixture_urls(base_url, directory=FIXTURE_DIR):
+    return [f"{base_url}/{name}" for name in sorted(os.listdir(directory)) if name.endswith(".html")]
@@ -0,0 +1,78 @@
+# Build captured_payloads/ from the result cards in minimal_html/.
+#
+#   python -m benchmarks.make_capture_fixtures
+#
+# These are synthetic stand-ins shaped like the Maps wire format (XSSI
+# prefix, `{"c":0,"d":...}` wrapper for search, place arrays laid out per
+# network_capture.PLACE_FIELD_PATHS). Being written from that table, they
+# cannot validate it; replace them with real bodies by running a scraper
+# with CAPTURE_RECORD_DIR=captured_payloads.
+import glob
+import json
+import os
+import re
+
+from network_capture import PLACE_FIELD_PATHS, PREVIEW_PLACE_INDEX, SEARCH_PLACE_INDEX, TRAILER, XSSI_PREFIX, place_keys
+from result_cards import card_details, parse_cards
+
+OUT_DIR = "captured_payloads"
+PLACE_ARRAY_LENGTH = 200
+PREVIEWS_PER_PAGE = 2
+COORDINATES_RE = re.compile(r"!3d(-?[\d.]+)!4d(-?[\d.]+)")
+
+
+def _put(place, path, value):
+    for depth, index in enumerate(path[:-1]):
+        if not isinstance(place[index], list):
+            place[index] = []
+        place[index] += [None] * (path[depth + 1] + 1 - len(place[index]))
+        place = place[index]
+    place[path[-1]] = value
+
+
+def place_array(card):
+    record = card_details(card)
+    place = [None] * PLACE_ARRAY_LENGTH
+    feature_id, place_id = (place_keys(card["href"]) + [None, None])[:2]
+    coordinates = COORDINATES_RE.search(card["href"])
+    values = {
+        "name": record["name"],
+        "category": record["category"],
+        "address": record["address"],
+        "short_address": f"{record['name']}, {record['address']}" if record["address"] else None,
+        "website": record["website"],
+        "phone": record["phone"],
+        "rating": float(record["rating"]) if record["rating"] else None,
+        "review_count": int(record["review_count"]) if record["review_count"] else None,
+        "latitude": float(coordinates.group(1)) if coordinates else None,
+        "longitude": float(coordinates.group(2)) if coordinates else None,
+        "feature_id": feature_id,
+        "place_id": place_id,
+    }
+    for field, value in values.items():
+        if value is not None:
+            _put(place, PLACE_FIELD_PATHS[field], value)
+    return place
+
+
+def main():
+    os.makedirs(OUT_DIR, exist_ok=True)
+    for path in sorted(glob.glob("minimal_html/*.html")):
+        name = os.path.splitext(os.path.basename(path))[0]
+        with open(path, encoding="utf-8") as f:
+            cards = parse_cards(f.read())
+        if not cards:
+            continue
+        entries = [["metadata"]] + [[None] * SEARCH_PLACE_INDEX + [place_array(card)] for card in cards]
+        body = XSSI_PREFIX + "\n" + json.dumps([[name, entries]], separators=(",", ":"))
+        with open(os.path.join(OUT_DIR, f"search_{name}.txt"), "w", encoding="utf-8") as f:
+            f.write(json.dumps({"c": 0, "d": body}, separators=(",", ":")) + TRAILER)
+        for i, card in enumerate(cards[:PREVIEWS_PER_PAGE]):
+            preview = [None] * PREVIEW_PLACE_INDEX + [place_array(card)]
+            with open(os.path.join(OUT_DIR, f"place_{name}_{i}.txt"), "w", encoding="utf-8") as f:
+                f.write(XSSI_PREFIX + "\n" + json.dumps(preview, separators=(",", ":")))
+    print(f"✅ Wrote {len(glob.glob(os.path.join(OUT_DIR, '*.txt')))} payloads to {OUT_DIR}/")
+
+
+if __name__ == "__main__":
+    main()
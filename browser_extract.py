@@ -0,0 +1,275 @@
+import re
+import json
+import time
+from collections import defaultdict
+
+from phones import PHONES
+from text_regions import INFO_ROW_SELECTORS, PANE_SELECTORS
+
+# --- Selector Translation ---
+# Browsers have no `:-soup-contains()`, so text conditions are split off the
+# CSS and applied in JS. Supported forms are the ones SELECTORS uses:
+# `sel:contains('x')` and `sel:has(inner:contains('x'))`.
+_CONTAINS_RE = re.compile(r""":(?:-soup-)?contains\((['"])(.*?)\1\)""")
+_HAS_RE = re.compile(r":has\((.*)\)$")
+
+
+def _split_contains(selector):
+    match = _CONTAINS_RE.search(selector)
+    if not match:
+        return selector.strip(), None
+    css = (selector[:match.start()] + selector[match.end():]).strip()
+    if _CONTAINS_RE.search(css):
+        raise ValueError("only one :contains() per selector is supported")
+    return css, match.group(2)
+
+
+def compile_selector(selector):
+    has = None
+    match = _HAS_RE.search(selector)
+    if match and _CONTAINS_RE.search(match.group(1)):
+        has_css, has_contains = _split_contains(match.group(1))
+        has = {"css": has_css, "contains": has_contains}
+        selector = selector[:match.start()]
+    css, contains = _split_contains(selector)
+    return {"css": css, "contains": contains, "has": has}
+
+
+def build_spec(fields, patterns, invalid_keywords):
+    """Serialisable extraction spec for EXTRACT_PLACE_JS.
+
+    `fields` maps an output name to (kind, selectors, first_only) where kind is
+    "text", "aria-label" or "http-href"; `patterns` carries the regex sources
+    the Python parser uses so both paths apply the same rules, and `regions`
+    the TextRegions selectors so they read the same text.
+    """
+    compiled = {}
+    for name, (kind, selectors, first_only) in fields.items():
+        chain = []
+        for selector in selectors:
+            try:
+                chain.append(compile_selector(selector))
+            except ValueError as e:
+                print(f"⚠️ Skipping selector '{selector}' for in-page extraction: {str(e)}")
+        compiled[name] = {"kind": kind, "selectors": chain, "firstOnly": first_only}
+    return {
+        "fields": compiled,
+        "patterns": patterns,
+        "regions": {"pane": PANE_SELECTORS, "info": INFO_ROW_SELECTORS},
+        "invalidKeywords": sorted(invalid_keywords),
+    }
+
+
+# --- In-Page Extractor ---
+# Mirrors parse_place_details: bs4-style text (script/style/template strings
+# skipped, each string stripped), first-match selector chains, then the same
+# rating/address/email/social rules over the same TextRegions: phones from
+# the info rows then the place pane, email and social links from the pane.
+# Returns only the final record, plus the phone candidates extract_in_page
+# validates with phonenumbers.
+EXTRACT_PLACE_JS = r"""
+(spec) => {
+    const SKIP = new Set(["SCRIPT", "STYLE", "TEMPLATE"]);
+    const P = spec.patterns;
+    const strings = (root) => {
+        const out = [];
+        const walker = document.createTreeWalker(root, NodeFilter.SHOW_TEXT);
+        for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+            if (node.parentElement && SKIP.has(node.parentElement.tagName.toUpperCase())) continue;
+            const text = node.nodeValue.trim();
+            if (text) out.push(text);
+        }
+        return out;
+    };
+    const first = (pattern, text) => {
+        const m = new RegExp(pattern).exec(text);
+        return m ? m : null;
+    };
+    const isRatingString = (text) => new RegExp(`^(?:${P.ratingString})$`).test(text);
+    const select = (sel) => {
+        let els;
+        try {
+            els = Array.from(document.querySelectorAll(sel.css));
+        } catch (e) {
+            return [];
+        }
+        if (sel.contains !== null) els = els.filter((el) => el.textContent.includes(sel.contains));
+        if (sel.has) {
+            els = els.filter((el) => Array.from(el.querySelectorAll(sel.has.css)).some(
+                (child) => sel.has.contains === null || child.textContent.includes(sel.has.contains)));
+        }
+        return els;
+    };
+    const accept = {
+        "text": (el) => {
+            if (SKIP.has(el.tagName.toUpperCase())) return null;
+            const text = strings(el).join("");
+            if (!text) return null;
+            const lower = text.toLowerCase();
+            if (spec.invalidKeywords.some((kw) => lower.includes(kw))) return null;
+            if (isRatingString(text)) return null;
+            return text;
+        },
+        "aria-label": (el) => el.getAttribute("aria-label"),
+        "http-href": (el) => {
+            const href = el.getAttribute("href");
+            return href && /^https?:\/\//.test(href) ? href : null;
+        },
+    };
+
+    const fields = {};
+    for (const [name, field] of Object.entries(spec.fields)) {
+        fields[name] = null;
+        for (const sel of field.selectors) {
+            let els = select(sel);
+            if (field.firstOnly) els = els.slice(0, 1);
+            let value = null;
+            for (const el of els) {
+                value = accept[field.kind](el);
+                if (value !== null) break;
+            }
+            if (value !== null) {
+                fields[name] = value;
+                break;
+            }
+        }
+    }
+
+    // text_regions.TextRegions: the place pane (else the whole document) and its info rows
+    const queryAll = (root, css) => {
+        try {
+            return Array.from(root.querySelectorAll(css));
+        } catch (e) {
+            return [];
+        }
+    };
+    const paneRoot = spec.regions.pane.map((css) => queryAll(document, css)[0]).find((el) => el)
+        || document.documentElement;
+    const infoTexts = [];
+    for (const css of spec.regions.info) {
+        for (const el of queryAll(paneRoot, css)) {
+            const text = strings(el).join(" ");
+            if (text && !infoTexts.includes(text)) infoTexts.push(text);
+        }
+    }
+    const infoText = infoTexts.join(" | ");
+    const paneText = strings(paneRoot).join(" ");
+
+    let address = fields.address;
+    let ratingBlock = fields.rating_block;
+    if (address && isRatingString(address)) ratingBlock = address;
+
+    let rating = null, reviewCount = null;
+    if (ratingBlock) {
+        const m = first(P.ratingFull, ratingBlock) || first(P.ratingShort, ratingBlock);
+        if (m) [rating, reviewCount] = [m[1], m[2]];
+    }
+    if (address && isRatingString(address)) address = null;
+    else if (address && !new RegExp(P.validAddress).test(address)) address = null;
+
+    // Validated and normalized to E.164 in Python (extract_in_page)
+    const phoneRe = new RegExp(P.phone, "g");
+    const phoneCandidates = (infoText.match(phoneRe) || []).concat(paneText.match(phoneRe) || []);
+    let email = null;
+    for (const pattern of P.email) {
+        const m = first(pattern, paneText);
+        if (m) { email = m[0]; break; }
+    }
+    // social_links.SocialLinkMatcher: host suffix lookup, then https://<domain><path>[?<kept query>]
+    const S = P.social;
+    const lookup = new Set(S.redirectDomains.concat(Object.keys(S.domains)));
+    const domainOf = (host) => {
+        const labels = host.split(".");
+        for (let i = 0; i < labels.length - 1; i++) {
+            const suffix = labels.slice(i).join(".");
+            if (lookup.has(suffix)) return suffix;
+        }
+        return null;
+    };
+    const linkRe = new RegExp(`^(?:${S.link})`, "i");
+    const redirectRe = new RegExp(S.redirect);
+    const canonicalSocial = (raw) => {
+        let text = raw.trim();
+        while (text && S.trailing.includes(text[text.length - 1])) text = text.slice(0, -1);
+        const m = linkRe.exec(text);
+        if (!m) return null;
+        const path = m[2], query = m[3] || "";
+        const domain = domainOf(m[1].toLowerCase());
+        if (!(domain in S.domains)) {
+            const target = domain && path === "/url" && query ? redirectRe.exec(query) : null;
+            if (!target) return null;
+            try {
+                return canonicalSocial(decodeURIComponent(target[1].replace(/\+/g, " ")));
+            } catch (e) {
+                return null;
+            }
+        }
+        const trimmed = path.replace(/\/+$/, "");
+        const search = query.split("&").filter((p) => S.keepQuery.includes(p.split("=")[0])).join("&");
+        if (!trimmed && !search) return null;
+        const link = `https://${S.aliases[domain] || domain}${trimmed}`;
+        return [S.domains[domain], search ? `${link}?${search}` : link];
+    };
+    const hrefs = queryAll(paneRoot, "a[href]").map((a) => a.getAttribute("href"));
+    const profiles = new Map();
+    for (const url of hrefs.concat(paneText.match(new RegExp(S.url, "g")) || [])) {
+        const match = url ? canonicalSocial(url) : null;
+        if (!match) continue;
+        if (!profiles.has(match[0])) profiles.set(match[0], new Set());
+        profiles.get(match[0]).add(match[1]);
+    }
+    const social = Array.from(profiles.values(), (links) => Array.from(links)).flat();
+
+    return {
+        name: fields.name,
+        rating: rating,
+        review_count: reviewCount,
+        address: address,
+        phone: null,
+        phone_candidates: phoneCandidates,
+        website: fields.website,
+        email: email,
+        social_links: social,
+    };
+}
+"""
+
+
+async def extract_in_page(page, spec, phone_region=None):
+    details = await page.evaluate(EXTRACT_PLACE_JS, spec)
+    details["phone"] = PHONES.pick(details.pop("phone_candidates"), phone_region)
+    return details
+
+
+# --- Per-Mode Extraction Stats ---
+class ExtractionStats:
+    """Wall time, Python CPU time and bytes pulled over the Playwright pipe."""
+
+    def __init__(self):
+        self.totals = defaultdict(lambda: {"pages": 0, "wall": 0.0, "cpu": 0.0, "ipc_bytes": 0})
+
+    def start(self):
+        return time.perf_counter(), time.process_time()
+
+    def record(self, mode, started, payload):
+        wall_start, cpu_start = started
+        entry = self.totals[mode]
+        entry["pages"] += 1
+        entry["wall"] += time.perf_counter() - wall_start
+        entry["cpu"] += time.process_time() - cpu_start
+        if isinstance(payload, str):
+            entry["ipc_bytes"] += len(payload.encode("utf-8"))
+        else:
+            entry["ipc_bytes"] += len(json.dumps(payload).encode("utf-8"))
+
+    def summary(self):
+        lines = []
+        for mode, entry in self.totals.items():
+            pages = entry["pages"] or 1
+            lines.append(
+                f"🧪 {mode}: {entry['pages']} pages | "
+                f"{entry['wall'] / pages * 1000:.0f} ms/page | "
+                f"CPU {entry['cpu'] / pages * 1000:.0f} ms/page | "
+                f"IPC {entry['ipc_bytes'] / pages / 1024:.1f} KB/page"
+            )
+        return "\n".join(lines)
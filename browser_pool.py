@@ -0,0 +1,177 @@
+import os
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+import psutil
+from playwright.async_api import async_playwright
+
+# --- Configurable Settings ---
+BROWSER_POOL_SIZE = int(os.environ.get("BROWSER_POOL_SIZE", 1))
+MAX_PAGES_PER_BROWSER = int(os.environ.get("MAX_PAGES_PER_BROWSER", 300))  # Recycle after this many pages
+MAX_BROWSER_RSS_MB = int(os.environ.get("MAX_BROWSER_RSS_MB", 1500))  # Recycle when Chromium grows past this
+BROWSER_LAUNCH_ARGS = [
+    "--disable-gpu",
+    "--disable-dev-shm-usage",
+    "--disable-setuid-sandbox",
+    "--no-first-run",
+    "--no-sandbox",
+]
+BROWSER_PROCESS_NAMES = ("chrome", "chromium", "headless_shell")
+
+
+# --- Helper: Find Chromium Processes Spawned by This Worker ---
+def _browser_processes():
+    found = {}
+    try:
+        for child in psutil.Process(os.getpid()).children(recursive=True):
+            try:
+                if any(name in child.name().lower() for name in BROWSER_PROCESS_NAMES):
+                    found[child.pid] = child
+            except psutil.Error:
+                continue
+    except psutil.Error:
+        pass
+    return found
+
+
+class _PooledBrowser:
+    def __init__(self, browser, root_pids):
+        self.browser = browser
+        self.root_pids = root_pids
+        self.pages_served = 0
+        self.active_contexts = 0
+        self.retiring = False
+        self.launched_at = time.monotonic()
+
+    def rss_mb(self):
+        total = 0
+        for pid in self.root_pids:
+            try:
+                root = psutil.Process(pid)
+                total += root.memory_info().rss
+                for child in root.children(recursive=True):
+                    try:
+                        total += child.memory_info().rss
+                    except psutil.Error:
+                        continue
+            except psutil.Error:
+                continue
+        return total / 1024 ** 2
+
+
+class BrowserPool:
+    """Long-lived Chromium instances shared by every query a worker runs.
+
+    Browsers are launched once, hand out fresh contexts/pages, and are replaced
+    after `max_pages` pages or when their process tree exceeds `max_rss_mb`.
+    With a `storage_state` manager, every context starts from its warmed
+    cookies and localStorage.
+    """
+
+    def __init__(self, size=BROWSER_POOL_SIZE, max_pages=MAX_PAGES_PER_BROWSER,
+                 max_rss_mb=MAX_BROWSER_RSS_MB, headless=True, launch_args=None, storage_state=None):
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.headless = headless
+        self.launch_args = launch_args if launch_args is not None else BROWSER_LAUNCH_ARGS
+        self.storage_state = storage_state
+        self._playwright = None
+        self._browsers = []
+        self._lock = asyncio.Lock()
+        self.stats = {"launches": 0, "recycles": 0, "contexts": 0, "pages": 0}
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+    async def start(self):
+        if self._playwright:
+            return
+        self._playwright = await async_playwright().start()
+        async with self._lock:
+            for _ in range(self.size):
+                self._browsers.append(await self._launch())
+        print(f"🧭 Browser pool ready: {self.size} browser(s)")
+
+    async def stop(self):
+        async with self._lock:
+            for pooled in self._browsers:
+                await self._close(pooled)
+            self._browsers = []
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def _launch(self):
+        before = _browser_processes()
+        browser = await self._playwright.chromium.launch(headless=self.headless, args=self.launch_args)
+        # Only the top-level Chromium processes are new children of this worker
+        spawned = {pid: proc for pid, proc in _browser_processes().items() if pid not in before}
+        roots = [pid for pid, proc in spawned.items() if proc.ppid() not in spawned]
+        self.stats["launches"] += 1
+        return _PooledBrowser(browser, roots)
+
+    async def _close(self, pooled):
+        try:
+            await pooled.browser.close()
+        except Exception as e:
+            print(f"⚠️ Error closing pooled browser: {str(e)}")
+
+    def _needs_recycle(self, pooled):
+        if pooled.pages_served >= self.max_pages:
+            return True
+        return self.max_rss_mb and pooled.rss_mb() >= self.max_rss_mb
+
+    async def _acquire(self):
+        async with self._lock:
+            if not self._playwright:
+                raise RuntimeError("BrowserPool.start() must be called before use")
+            for i, pooled in enumerate(self._browsers):
+                if not pooled.browser.is_connected() or self._needs_recycle(pooled):
+                    print(f"♻️ Recycling browser after {pooled.pages_served} pages ({pooled.rss_mb():.0f} MB)")
+                    pooled.retiring = True
+                    if pooled.active_contexts == 0:
+                        await self._close(pooled)
+                    self._browsers[i] = await self._launch()
+                    self.stats["recycles"] += 1
+            pooled = min(self._browsers, key=lambda b: b.active_contexts)
+            pooled.active_contexts += 1
+            return pooled
+
+    async def _release(self, pooled):
+        pooled.active_contexts -= 1
+        if pooled.retiring and pooled.active_contexts == 0:
+            await self._close(pooled)
+
+    @asynccontextmanager
+    async def context(self, **context_options):
+        pooled = await self._acquire()
+        context = None
+        try:
+            if self.storage_state is not None:
+                context_options = {**await self.storage_state.options(pooled.browser), **context_options}
+            context = await pooled.browser.new_context(**context_options)
+            context.on("page", lambda _: self._count_page(pooled))
+            self.stats["contexts"] += 1
+            yield context
+        finally:
+            if context:
+                try:
+                    await context.close()
+                except Exception:
+                    pass
+            await self._release(pooled)
+
+    @asynccontextmanager
+    async def page(self, **context_options):
+        async with self.context(**context_options) as context:
+            yield await context.new_page()
+
+    def _count_page(self, pooled):
+        pooled.pages_served += 1
+        self.stats["pages"] += 1
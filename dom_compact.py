@@ -0,0 +1,128 @@
+import os
+import re
+
+try:
+    import lxml.html
+    from lxml import etree
+    from lxml.cssselect import CSSSelector
+except ImportError:  # Only compact_html needs lxml; compact_page prunes inside the browser
+    lxml = None
+
+from app_state import STATE_MARKER
+
+# --- Configurable Settings ---
+DOM_COMPACT = os.environ.get("DOM_COMPACT", "1") == "1"  # Prune the DOM in the page before serializing it
+DOM_COMPACT_ROOT = os.environ.get("DOM_COMPACT_ROOT") or None  # e.g. 'div[role="main"]' to ship only the place pane
+
+# Never read by the extractors; the script holding APP_INITIALIZATION_STATE is kept
+DROP_TAGS = ["script", "style", "svg", "noscript", "template", "link", "meta", "iframe", "canvas", "img", "picture",
+             "video", "audio", "input"]
+DROP_SELECTORS = [".goog-tooltip", '[role="tooltip"]', '[style*="display: none"]', '[style*="display:none"]']
+# Every attribute a selector, card parser or fallback in this repo reads
+KEEP_ATTRIBUTES = ["class", "id", "href", "role", "aria-label", "aria-hidden", "data-item-id", "data-section-id",
+                   "data-value", "jslog"]
+
+COMPACT_JS = """
+({root, dropTags, dropSelectors, keepAttributes, stateMarker}) => {
+    const source = root ? document.querySelector(root) : document.documentElement;
+    if (!source) return null;
+    const rawChars = source.outerHTML.length;
+    const clone = source.cloneNode(true);
+    for (const el of clone.querySelectorAll(dropTags.join(","))) {
+        if (el.tagName === "SCRIPT" && stateMarker && el.textContent.includes(stateMarker)) continue;
+        el.remove();
+    }
+    for (const el of clone.querySelectorAll(dropSelectors.join(","))) el.remove();
+    const keep = new Set(keepAttributes);
+    for (const el of [clone, ...clone.querySelectorAll("*")]) {
+        for (const name of el.getAttributeNames()) {
+            if (!keep.has(name)) el.removeAttribute(name);
+        }
+    }
+    const walker = document.createTreeWalker(clone, NodeFilter.SHOW_COMMENT | NodeFilter.SHOW_TEXT);
+    const comments = [];
+    while (walker.nextNode()) {
+        const node = walker.currentNode;
+        if (node.nodeType === Node.COMMENT_NODE) comments.push(node);
+        else if (!node.nodeValue.trim()) node.nodeValue = " ";
+    }
+    comments.forEach((node) => node.remove());
+    return {html: clone.outerHTML, rawChars};
+}
+"""
+
+_WHITESPACE_RE = re.compile(r"^\s+$")
+_drop_tags_selector = CSSSelector(",".join(DROP_TAGS)) if lxml is not None else None
+_drop_selector = CSSSelector(",".join(DROP_SELECTORS)) if lxml is not None else None
+
+
+class CompactStats:
+    """Characters serialized before and after pruning."""
+
+    def __init__(self):
+        self.pages = 0
+        self.raw_chars = 0
+        self.compact_chars = 0
+
+    def record(self, raw_chars, compact_chars):
+        self.pages += 1
+        self.raw_chars += raw_chars
+        self.compact_chars += compact_chars
+
+    def summary(self):
+        raw = self.raw_chars or 1
+        return (f"🗜️ DOM compaction: {self.pages} pages | {self.raw_chars / 1024:.0f} KB -> "
+                f"{self.compact_chars / 1024:.0f} KB ({1 - self.compact_chars / raw:.0%} smaller)")
+
+
+async def compact_page(page, root=DOM_COMPACT_ROOT, stats=None):
+    """Pruned outerHTML of `root` (whole document by default); unpruned if compaction is off or fails."""
+    if DOM_COMPACT:
+        try:
+            result = await page.evaluate(COMPACT_JS, {
+                "root": root,
+                "dropTags": DROP_TAGS,
+                "dropSelectors": DROP_SELECTORS,
+                "keepAttributes": KEEP_ATTRIBUTES,
+                "stateMarker": STATE_MARKER,
+            })
+        except Exception as e:
+            print(f"⚠️ DOM compaction failed, serializing the full page: {str(e)}")
+            result = None
+        if result:
+            if stats is not None:
+                stats.record(result["rawChars"], len(result["html"]))
+            return result["html"]
+    if root:
+        return await page.eval_on_selector(root, "el => el.outerHTML")
+    return await page.content()
+
+
+def compact_html(html, root=None):
+    """Python mirror of COMPACT_JS for saved pages; returns the pruned HTML. Needs lxml and cssselect."""
+    if lxml is None:
+        raise ImportError("compact_html needs lxml and cssselect (pip install lxml cssselect)")
+    document = lxml.html.document_fromstring(html)
+    if root:
+        matches = CSSSelector(root)(document)
+        if not matches:
+            return ""
+        document = matches[0]
+    for el in _drop_tags_selector(document):
+        if el.tag == "script" and STATE_MARKER in (el.text or ""):
+            continue
+        el.drop_tree()
+    for el in _drop_selector(document):
+        if el.getparent() is not None:
+            el.drop_tree()
+    keep = set(KEEP_ATTRIBUTES)
+    for el in document.iter():
+        if isinstance(el.tag, str):
+            for name in [name for name in el.attrib if name not in keep]:
+                del el.attrib[name]
+            if el.text and _WHITESPACE_RE.match(el.text):
+                el.text = " "
+        if el.tail and _WHITESPACE_RE.match(el.tail):
+            el.tail = " "
+    etree.strip_elements(document, etree.Comment, with_tail=False)
+    return lxml.html.tostring(document, encoding="unicode")
@@ -1,6 +1,10 @@
 import os
 import asyncio
 from playwright.async_api import async_playwright
+from request_policy import MAPS_ASSET_PATTERNS, RequestPolicy
+from readiness import ReadinessStats, wait_until_ready
+from latency import LatencyTracker, timed_goto
+from dom_compact import CompactStats, compact_page
 from datetime import datetime
 import requests
 import random
@@ -9,23 +13,16 @@ import random
 # --- Configurable Settings ---
 API_URL = "http://82.112.254.77:8000/queries?country=usa_blockdata&machine_id=2"
 OUTPUT_HTML_DIR = "minimal_html"
+COMPACT_STATS = CompactStats()  # HTML size before/after in-page pruning (DOM_COMPACT, DOM_COMPACT_ROOT)
+READINESS_STATS = ReadinessStats()  # Pages and seconds spent waiting for result cards to render
+LATENCY = LatencyTracker()  # Rolling navigation/readiness times; timeouts derive from their p99
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0 Safari/537.36",
 ]
 
-# Resource types to block
-BLOCKED_RESOURCE_TYPES = [
-    "image",          # Images (.png, .jpg, etc.)
-    "stylesheet",     # CSS files
-    "font",           # Fonts (.woff, .ttf, etc.)
-    "media",          # Audio/video
-    "iframe",         # Embedded iframes (e.g., maps)
-    "websocket",      # Real-time connections
-    "manifest",       # App manifest
-    "xhr",            # AJAX/XHR calls
-    "fetch",          # fetch() API calls
-    "other"           # Other misc. network requests
-]
+# Only the Maps page and its scripts: the saved HTML needs the rendered cards,
+# not their styles, images or the XHRs fired on scroll
+ALLOWED_URL_PATTERNS = {"script": MAPS_ASSET_PATTERNS}
 
 
 # --- Create Output Folder ---
@@ -42,21 +39,16 @@ async def save_minimal_html(industry: str, lat: float, lon: float, zoom_level: i
             context = await browser.new_context(user_agent=random.choice(USER_AGENTS))
             page = await context.new_page()
 
-            # Route handler to block unwanted resources
-            async def route_handler(route, request):
-                if request.resource_type in BLOCKED_RESOURCE_TYPES:
-                    await route.abort()
-                else:
-                    await route.continue_()
-
-            await page.route("**/*", route_handler)
+            # Allow only the document and Maps scripts
+            request_policy = RequestPolicy(allowed_patterns=ALLOWED_URL_PATTERNS)
+            await request_policy.install(page)
 
-            # Navigate and wait briefly for minimal DOM
-            await page.goto(url, timeout=60000)
-            await page.wait_for_timeout(5000)  # Minimal JS rendering time
+            # Navigate and wait until the first result cards render
+            await timed_goto(page, url, LATENCY, "search", 60000)
+            await wait_until_ready(page, READINESS_STATS, kind="search", latency=LATENCY)
 
-            # Extract only <body> content
-            body_html = await page.eval_on_selector("body", "el => el.outerHTML")
+            # Extract only <body> content, pruned in the page before serializing
+            body_html = await compact_page(page, root="body", stats=COMPACT_STATS)
 
             # Generate safe filename
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -68,6 +60,7 @@ async def save_minimal_html(industry: str, lat: float, lon: float, zoom_level: i
                 f.write(body_html)
 
             print(f"💾 Saved minimal body HTML to: {filename}")
+            print(request_policy.summary())
 
             await context.close()
             await browser.close()
@@ -108,6 +101,9 @@ async def main():
             tasks.append(task)
 
         await asyncio.gather(*tasks)
+        print(READINESS_STATS.summary(fixed_wait=5))
+        print(LATENCY.summary())
+        print(COMPACT_STATS.summary())
         print("✅ All lightweight HTML pages saved successfully.")
 
     except Exception as e:
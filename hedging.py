@@ -0,0 +1,84 @@
+import os
+import asyncio
+from collections import Counter
+
+from latency import percentile
+
+# --- Configurable Settings ---
+HEDGE_NAVIGATION = os.environ.get("HEDGE_NAVIGATION", "0") == "1"  # Duplicate slow detail loads on a spare tab
+HEDGE_BUDGET = float(os.environ.get("HEDGE_BUDGET", 0.05))  # Hedges allowed per primary load (0.05 = 5% extra loads)
+HEDGE_PERCENTILE = float(os.environ.get("HEDGE_PERCENTILE", 95))  # Hedge once a load outlives this percentile
+HEDGE_MIN_DELAY = float(os.environ.get("HEDGE_MIN_DELAY", 1.0))  # Seconds; never hedge sooner than this
+HEDGE_SLOTS = int(os.environ.get("HEDGE_SLOTS", 2))  # Tabs added to the pool beyond the workers, so hedges find a spare mid-run
+
+
+class Hedger:
+    """Runs an attempt and, if it is slower than the stage's p95, a duplicate.
+
+    `await run(attempt, spare)` starts `attempt(started)`, which sets the
+    `started` event once it holds its slot (tab), so time queued for a slot
+    does not count. Once it has run longer than the current `q` percentile
+    of `stage` in `latency`, a second attempt starts, provided the budget
+    allows and `spare()` (when given) says a free slot exists. The first to
+    succeed wins and the other is cancelled. With too few samples to know
+    the percentile, no hedging. Size the slot pool at workers + HEDGE_SLOTS:
+    with one slot per worker, none is free until the queue drains.
+    """
+
+    def __init__(self, latency, stage="place", budget=HEDGE_BUDGET, q=HEDGE_PERCENTILE, min_delay=HEDGE_MIN_DELAY):
+        self.latency = latency
+        self.stage = stage
+        self.budget = budget
+        self.q = q
+        self.min_delay = min_delay
+        self.stats = Counter()
+
+    def delay(self):
+        samples = self.latency.samples.get(self.stage)
+        if not samples or len(samples) < self.latency.min_samples:
+            return None
+        return max(self.min_delay, percentile(samples, self.q))
+
+    def _within_budget(self):
+        return self.stats["hedges"] + 1 <= self.budget * self.stats["loads"]
+
+    async def run(self, attempt, spare=None):
+        self.stats["loads"] += 1
+        started = asyncio.Event()
+        primary = asyncio.ensure_future(attempt(started))
+        roles = {primary: "primary"}
+        try:
+            delay = self.delay()
+            if delay is not None:
+                holding = asyncio.ensure_future(started.wait())
+                await asyncio.wait({primary, holding}, return_when=asyncio.FIRST_COMPLETED)
+                holding.cancel()
+                if not primary.done():
+                    await asyncio.wait({primary}, timeout=delay)
+            if delay is None or primary.done() or not self._within_budget() or (spare is not None and not spare()):
+                return await primary
+
+            self.stats["hedges"] += 1
+            roles[asyncio.ensure_future(attempt(asyncio.Event()))] = "hedge"
+            pending = set(roles)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        self.stats[f"won:{roles[task]}"] += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            # The loser, or everything if our caller was cancelled
+            pending = [task for task in roles if not task.done()]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def summary(self):
+        loads = self.stats["loads"] or 1
+        return (f"🪁 Hedged {self.stats['hedges']}/{self.stats['loads']} loads "
+                f"({self.stats['hedges'] / loads:.1%} extra, budget {self.budget:.0%}) | "
+                f"hedge won {self.stats['won:hedge']}, primary won {self.stats['won:primary']}")
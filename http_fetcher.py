@@ -0,0 +1,112 @@
+import os
+import time
+import asyncio
+from collections import Counter
+
+import aiohttp
+
+from app_state import extract_place_state
+
+# --- Configurable Settings ---
+HTTP_FAST_PATH = os.environ.get("HTTP_FAST_PATH", "0") == "1"  # Try plain HTTP before rendering place pages (needs APP_STATE_DECODE=1)
+HTTP_POOL_SIZE = int(os.environ.get("HTTP_POOL_SIZE", 20))  # Pooled connections, also the request concurrency
+HTTP_TIMEOUT = float(os.environ.get("HTTP_TIMEOUT", 15))
+HTTP_REQUIRED_FIELDS = [f for f in os.environ.get("HTTP_REQUIRED_FIELDS", "name,address").split(",") if f]
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0 Safari/537.36",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+# Responses that mean "render it in the browser instead"
+BLOCKED_STATUS = {403, 429, 503}
+BLOCKED_URL_MARKERS = ("consent.google.", "/sorry/")
+BLOCKED_TEXT_MARKERS = ("unusual traffic", "detected unusual", "recaptcha")
+
+
+class HttpDetailFetcher:
+    """Fetches place pages over pooled HTTP and extracts them without a browser.
+
+    `await fetch(url)` returns a details dict, or None when the caller should
+    escalate to the Playwright path: blocked or consent pages, error status,
+    network errors, or records missing any of `required` fields. `parse` is
+    an (async) callable from HTML to details; it defaults to the embedded
+    APP_INITIALIZATION_STATE decoder, which returns nothing (so every page
+    escalates) unless APP_STATE_DECODE is set.
+    """
+
+    def __init__(self, parse=None, required=HTTP_REQUIRED_FIELDS, pool_size=HTTP_POOL_SIZE,
+                 timeout=HTTP_TIMEOUT, headers=HTTP_HEADERS):
+        self.parse = parse or extract_place_state
+        self.required = list(required)
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.headers = headers
+        self.session = None
+        self.stats = Counter()
+        self.seconds = 0.0
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def start(self):
+        if self.session is None:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, ttl_dns_cache=300)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def _escalate(self, reason):
+        self.stats["escalated"] += 1
+        self.stats[f"escalated:{reason}"] += 1
+        return None
+
+    async def fetch(self, url):
+        self.stats["requests"] += 1
+        started = time.perf_counter()
+        try:
+            async with self.session.get(url) as response:
+                final_url = str(response.url)
+                status = response.status
+                html = await response.text(errors="replace")
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return self._escalate("error")
+        finally:
+            self.seconds += time.perf_counter() - started
+
+        if status in BLOCKED_STATUS or any(m in final_url for m in BLOCKED_URL_MARKERS):
+            return self._escalate("blocked")
+        if status != 200:
+            return self._escalate("status")
+        lowered = html[:20000].lower()
+        if any(m in lowered for m in BLOCKED_TEXT_MARKERS):
+            return self._escalate("blocked")
+
+        try:
+            details = self.parse(html)
+            if asyncio.iscoroutine(details):
+                details = await details
+        except Exception:
+            return self._escalate("parse")
+        if not details or any(not details.get(field) for field in self.required):
+            return self._escalate("incomplete")
+        self.stats["served"] += 1
+        return details
+
+    def summary(self):
+        requests = self.stats["requests"] or 1
+        reasons = ", ".join(f"{key.split(':', 1)[1]} {count}" for key, count in sorted(self.stats.items())
+                            if key.startswith("escalated:"))
+        return (f"⚡ HTTP fast path: {self.stats['served']}/{self.stats['requests']} served | "
+                f"escalated {self.stats['escalated'] / requests:.0%}" + (f" ({reasons})" if reasons else "") +
+                f" | {self.seconds / requests * 1000:.0f} ms/request")
@@ -0,0 +1,87 @@
+import math
+import os
+import time
+from collections import defaultdict, deque
+
+# --- Configurable Settings ---
+LATENCY_WINDOW = int(os.environ.get("LATENCY_WINDOW", 200))  # Recent samples kept per stage
+LATENCY_MIN_SAMPLES = int(os.environ.get("LATENCY_MIN_SAMPLES", 20))  # Until then, the call site's own timeout applies
+TIMEOUT_PERCENTILE = float(os.environ.get("TIMEOUT_PERCENTILE", 99))
+TIMEOUT_MULTIPLIER = float(os.environ.get("TIMEOUT_MULTIPLIER", 3))
+TIMEOUT_FLOOR = float(os.environ.get("TIMEOUT_FLOOR", 10))  # Seconds
+TIMEOUT_CEILING = float(os.environ.get("TIMEOUT_CEILING", 120))  # Seconds
+
+
+def percentile(samples, q):
+    """Nearest-rank percentile of a non-empty sequence."""
+    ordered = sorted(samples)
+    rank = max(1, min(len(ordered), math.ceil(q / 100 * len(ordered))))
+    return ordered[rank - 1]
+
+
+class LatencyTracker:
+    """Rolling per-stage latencies and the timeouts derived from them.
+
+    `timeout(stage, default)` is p99 * multiplier clamped to [floor, ceiling]
+    once the stage has `min_samples` successes, else `default`. Timed-out
+    attempts are counted as stragglers rather than sampled, so a burst of
+    dead pages cannot drag the timeout up to the ceiling.
+    """
+
+    def __init__(self, window=LATENCY_WINDOW, min_samples=LATENCY_MIN_SAMPLES, q=TIMEOUT_PERCENTILE,
+                 multiplier=TIMEOUT_MULTIPLIER, floor=TIMEOUT_FLOOR, ceiling=TIMEOUT_CEILING):
+        self.samples = defaultdict(lambda: deque(maxlen=window))
+        self.stragglers = defaultdict(int)
+        self.min_samples = min_samples
+        self.q = q
+        self.multiplier = multiplier
+        self.floor = floor
+        self.ceiling = ceiling
+
+    def record(self, stage, seconds):
+        self.samples[stage].append(seconds)
+
+    def straggler(self, stage):
+        self.stragglers[stage] += 1
+
+    def timeout(self, stage, default, floor=None):
+        samples = self.samples.get(stage)
+        if not samples or len(samples) < self.min_samples:
+            return default
+        floor = self.floor if floor is None else floor
+        return min(self.ceiling, max(floor, percentile(samples, self.q) * self.multiplier))
+
+    def timeout_ms(self, stage, default_ms):
+        return self.timeout(stage, default_ms / 1000) * 1000
+
+    def summary(self):
+        lines = []
+        for stage in sorted(set(self.samples) | set(self.stragglers)):
+            samples = self.samples.get(stage)
+            if samples:
+                p50, p95, p99 = (percentile(samples, q) for q in (50, 95, 99))
+                line = (f"⏱️ {stage}: n={len(samples)} p50 {p50:.2f}s p95 {p95:.2f}s p99 {p99:.2f}s "
+                        f"-> timeout {self.timeout(stage, self.ceiling):.1f}s")
+            else:
+                line = f"⏱️ {stage}: no completed samples"
+            lines.append(line + f" | {self.stragglers[stage]} stragglers cut")
+        return "\n".join(lines) or "⏱️ No latency samples"
+
+
+async def timed_goto(page, url, tracker, stage, default_ms):
+    """page.goto with a timeout derived from `stage` latencies; records the outcome.
+
+    A navigation that outlives the derived timeout raises as before, so the
+    caller's error handling releases the page slot instead of holding it for
+    the old fixed limit.
+    """
+    timeout_ms = tracker.timeout_ms(stage, default_ms)
+    started = time.perf_counter()
+    try:
+        response = await page.goto(url, timeout=timeout_ms)
+    except Exception as e:
+        if "Timeout" in type(e).__name__ or "Timeout" in str(e):
+            tracker.straggler(stage)
+        raise
+    tracker.record(stage, time.perf_counter() - started)
+    return response
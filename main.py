@@ -1,6 +1,12 @@
 import os
 import asyncio
-from playwright.async_api import async_playwright
+from collections import Counter
+from browser_pool import BrowserPool
+from results_feed import scroll_results_feed, format_scroll_stats
+from readiness import ReadinessStats, wait_until_ready
+from latency import LatencyTracker, timed_goto
+from page_state import READY, format_page_states, settle_page_state
+from result_cards import harvest_cards
 from bs4 import BeautifulSoup
 import random
 import requests
@@ -14,6 +20,9 @@ def save_link_to_file(link):
 # --- Configurable Settings ---
 API_URL = "http://82.112.254.77:8000/queries?country=usa_blockdata&machine_id=2"
 GOOGLE_MAPS_TEMPLATE = "https://www.google.com/maps/search/{query}/@{lat},{lon},{zoom_level}z"
+READINESS_STATS = ReadinessStats()  # Pages and seconds spent waiting for detail pages to render
+LATENCY = LatencyTracker()  # Rolling navigation/readiness times; timeouts derive from their p99
+PAGE_STATES = Counter()  # Search page outcomes: ready, consent, captcha, blocked, empty, timeout
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0 Safari/537.36",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Safari/605.1.15",
@@ -144,66 +153,42 @@ async def extract_links_from_page(page):
     businesses = []
     # Wait for map result containers
     await page.wait_for_selector('.Nv2PK', timeout=60000)
-    # Get all business cards
-    cards = await page.query_selector_all('.Nv2PK')
+    # Get all business cards in one round trip
+    cards = await harvest_cards(page)
     for card in cards:
-        link_el = await card.query_selector('a.hfpxzc')
-        if link_el:
-            href = await link_el.get_attribute('href')
-            name = await link_el.get_attribute('aria-label')
-            if href and name:
-                businesses.append({
-                    "name": name,
-                    "link": href
-                })
-                save_link_to_file(href)  # Save to found_links.txt or similar
-                print(f"🔗 Found: {name} - {href}")
+        href = card["href"]
+        name = card["name"]
+        if href and name:
+            businesses.append({
+                "name": name,
+                "link": href
+            })
+            save_link_to_file(href)  # Save to found_links.txt or similar
+            print(f"🔗 Found: {name} - {href}")
     return businesses
 
-async def scrape_google_maps_page(industry, lat, lon, zoom_level, proxy=None):
+async def scrape_google_maps_page(industry, lat, lon, zoom_level, pool, proxy=None):
     results = []
 
     try:
-        async with async_playwright() as p:
-            # Launch browser in headless mode with realistic args
-            browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                    "--disable-gpu",
-                    "--disable-dev-shm-usage",
-                    "--disable-setuid-sandbox",
-                    "--no-first-run",
-                    "--no-sandbox",
-                    "--ignore-certificate-errors"
-                ]
-            )
-            context = await browser.new_context(user_agent=random.choice(USER_AGENTS))
+        async with pool.context(user_agent=random.choice(USER_AGENTS), ignore_https_errors=True) as context:
             page = await context.new_page()
 
             query = industry.replace(" ", "+")
             url = GOOGLE_MAPS_TEMPLATE.format(query=query, lat=lat, lon=lon, zoom_level=zoom_level)
             print(f"🔍 Navigating to: {url}")
 
-            await page.goto(url, timeout=120000)
+            await timed_goto(page, url, LATENCY, "search", 120000)
 
-            # Wait for map pins to load
-            try:
-                await page.wait_for_selector('a[href^="/maps/place/"]', timeout=60000)
-            except Exception:
-                print("❌ No business links found on the page.")
-                await context.close()
-                await browser.close()
+            # Wait for results, failing fast on consent/captcha/block pages
+            state = await settle_page_state(page, "search", stats=PAGE_STATES)
+            if state != READY:
+                print(f"❌ No business cards found ({state}).")
                 return {"industry": industry, "results": []}
 
-            # Scroll to load more results
-            last_height = await page.evaluate("document.body.scrollHeight")
-            while True:
-                await page.keyboard.press('PageDown')
-                await asyncio.sleep(1.5)
-                new_height = await page.evaluate("document.body.scrollHeight")
-                if new_height == last_height:
-                    break
-                last_height = new_height
+            # Scroll the results feed until the list ends or stops growing
+            scroll_stats = await scroll_results_feed(page)
+            print(format_scroll_stats(scroll_stats))
 
             # Extract and normalize links
             links = await page.locator('a[href^="/maps/place/"]').all_attribute_values("href", timeout=60000)
@@ -224,8 +209,8 @@ async def scrape_google_maps_page(industry, lat, lon, zoom_level, proxy=None):
             for link in hrefs[:3]:  # Limit for demo
                 try:
                     new_page = await context.new_page()
-                    await new_page.goto(link, timeout=120000)
-                    await new_page.wait_for_timeout(5000)
+                    await timed_goto(new_page, link, LATENCY, "place", 120000)
+                    await wait_until_ready(new_page, READINESS_STATS, latency=LATENCY)
 
                     html = await new_page.content()
                     details = await scrape_place_details(html)
@@ -238,9 +223,6 @@ async def scrape_google_maps_page(industry, lat, lon, zoom_level, proxy=None):
                 except Exception as e:
                     print(f"🚨 Failed to scrape detail page: {str(e)}")
 
-            await context.close()
-            await browser.close()
-
     except Exception as e:
         print(f"🚨 Critical error scraping '{industry}': {str(e)}")
 
@@ -259,7 +241,7 @@ async def run_scrape_job():
             return
 
         tasks = []
-        async with async_playwright() as p:
+        async with BrowserPool() as pool:
             for i, query in enumerate(queries):
                 if not isinstance(query, dict):
                     print(f"⚠️ Skipping invalid query at index {i}: {query}")
@@ -274,10 +256,13 @@ async def run_scrape_job():
                     print(f"⚠️ Missing required fields in query: {query}")
                     continue
 
-                task = scrape_google_maps_page(industry, lat, lon, zoom_level)
+                task = scrape_google_maps_page(industry, lat, lon, zoom_level, pool)
                 tasks.append(task)
 
             all_results = await asyncio.gather(*tasks)
+            print(READINESS_STATS.summary(fixed_wait=5))
+            print(LATENCY.summary())
+            print(format_page_states(PAGE_STATES))
 
             for result in all_results:
                 print(f"\n📌 Industry: {result['industry']}")
@@ -0,0 +1,186 @@
+import os
+import re
+import json
+import time
+import asyncio
+import hashlib
+
+# --- Configurable Settings ---
+SEARCH_URL_PATTERN = re.compile(r"/search\?tbm=map")
+PLACE_URL_PATTERN = re.compile(r"/maps/preview/place")
+XSSI_PREFIX = ")]}'"
+TRAILER = '/*""*/'
+CAPTURE_RECORD_DIR = os.environ.get("CAPTURE_RECORD_DIR")  # Save raw bodies here to refresh captured_payloads/
+
+# --- Place Array Layout ---
+# Index paths into the place array Maps ships in both the search results
+# (`d[0][1][i][14]`) and the place preview (`d[6]`) payloads. Not yet checked
+# against a real Maps response: captured_payloads/ is generated from this
+# table, so replaying it only round-trips it. Record real bodies with
+# CAPTURE_RECORD_DIR; v8 offers no network extraction mode until they are checked.
+PLACE_FIELD_PATHS = {
+    "name": (11,),
+    "category": (13, 0),
+    "address": (39,),
+    "short_address": (18,),
+    "website": (7, 0),
+    "phone": (178, 0, 0),
+    "rating": (4, 7),
+    "review_count": (4, 8),
+    "latitude": (9, 2),
+    "longitude": (9, 3),
+    "feature_id": (10,),
+    "place_id": (78,),
+}
+SEARCH_RESULTS_PATH = (0, 1)
+SEARCH_PLACE_INDEX = 14
+PREVIEW_PLACE_INDEX = 6
+
+# Keys a place URL carries: `!1s0x..:0x..` (feature id) and `!19sChIJ..` (place id)
+_FEATURE_ID_RE = re.compile(r"!1s(0x[0-9a-f]+:0x[0-9a-f]+)")
+_PLACE_ID_RE = re.compile(r"!19s([\w-]+)")
+
+
+def _dig(data, path):
+    for index in path:
+        if not isinstance(data, list) or index >= len(data):
+            return None
+        data = data[index]
+    return data
+
+
+def load_payload(text):
+    """JSON body of a Maps XHR, unwrapping `{"d": ...}`, XSSI prefix and trailer."""
+    text = text.strip()
+    if text.endswith(TRAILER):
+        text = text[:-len(TRAILER)]
+    if text.startswith("{"):
+        text = json.loads(text)["d"]
+    if text.startswith(XSSI_PREFIX):
+        text = text[len(XSSI_PREFIX):]
+    return json.loads(text)
+
+
+def _number_text(value, fmt):
+    return format(value, fmt) if isinstance(value, (int, float)) else None
+
+
+def decode_place(place):
+    """Place array -> business record, or None when it has no name."""
+    name = _dig(place, PLACE_FIELD_PATHS["name"])
+    if not isinstance(name, str) or not name:
+        return None
+    record = {field: _dig(place, path) for field, path in PLACE_FIELD_PATHS.items()}
+    short_address = record.pop("short_address")
+    if not record["address"] and isinstance(short_address, str):
+        record["address"] = short_address.split(", ", 1)[-1] if short_address.startswith(name) else short_address
+    record["rating"] = _number_text(record["rating"], ".1f")  # Same text as the UI: "4.0", "4.7"
+    record["review_count"] = _number_text(record["review_count"], ".0f")
+    record["email"] = None
+    record["social_links"] = []
+    return record
+
+
+def decode_search(payload):
+    records = []
+    for entry in _dig(payload, SEARCH_RESULTS_PATH) or []:
+        record = decode_place(_dig(entry, (SEARCH_PLACE_INDEX,)))
+        if record:
+            records.append(record)
+    return records
+
+
+def decode_place_preview(payload):
+    record = decode_place(_dig(payload, (PREVIEW_PLACE_INDEX,)))
+    return [record] if record else []
+
+
+def decode_response(url, text):
+    """Business records from one captured response body; raises on bad JSON."""
+    payload = load_payload(text)
+    if SEARCH_URL_PATTERN.search(url):
+        return decode_search(payload)
+    if PLACE_URL_PATTERN.search(url):
+        return decode_place_preview(payload)
+    return []
+
+
+def place_keys(url):
+    return [m.group(1) for m in (_FEATURE_ID_RE.search(url), _PLACE_ID_RE.search(url)) if m]
+
+
+# --- Response Listener ---
+class NetworkCapture:
+    """Collects business records from a page's search and place XHR payloads.
+
+    `attach(page)` listens on `page.on("response")`; `await settle()` waits
+    for bodies still being read, then `lookup(place_url)` returns the decoded
+    record for that place (matched on feature or place id) or None so the
+    caller can fall back to DOM extraction.
+    """
+
+    def __init__(self, record_dir=CAPTURE_RECORD_DIR):
+        self.record_dir = record_dir
+        self.places = {}
+        self._pending = set()
+        self.stats = {"responses": 0, "records": 0, "decode_errors": 0, "decode_ms": 0.0}
+
+    def attach(self, page):
+        page.on("response", self._on_response)
+        return self
+
+    def _on_response(self, response):
+        url = response.url
+        if SEARCH_URL_PATTERN.search(url) or PLACE_URL_PATTERN.search(url):
+            task = asyncio.ensure_future(self._read(url, response))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    async def _read(self, url, response):
+        try:
+            text = await response.text()
+        except Exception as e:
+            print(f"⚠️ Could not read captured response: {str(e)}")
+            return
+        self.feed(url, text)
+
+    def feed(self, url, text):
+        self.stats["responses"] += 1
+        if self.record_dir:
+            self._save(url, text)
+        started = time.perf_counter()
+        try:
+            records = decode_response(url, text)
+        except Exception as e:
+            self.stats["decode_errors"] += 1
+            print(f"⚠️ Could not decode captured payload: {str(e)}")
+            return []
+        finally:
+            self.stats["decode_ms"] += (time.perf_counter() - started) * 1000
+        for record in records:
+            for key in (record.get("feature_id"), record.get("place_id")):
+                if key:
+                    self.places[key] = record
+        self.stats["records"] += len(records)
+        return records
+
+    def _save(self, url, text):
+        os.makedirs(self.record_dir, exist_ok=True)
+        kind = "search" if SEARCH_URL_PATTERN.search(url) else "place"
+        digest = hashlib.sha1(url.encode("utf-8")).hexdigest()[:12]
+        with open(os.path.join(self.record_dir, f"{kind}_{digest}.txt"), "w", encoding="utf-8") as f:
+            f.write(text)
+
+    async def settle(self):
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+    def lookup(self, place_url):
+        for key in place_keys(place_url):
+            if key in self.places:
+                return dict(self.places[key])
+        return None
+
+    def summary(self):
+        return (f"🛰️ Captured {self.stats['responses']} payloads | {self.stats['records']} places | "
+                f"{self.stats['decode_errors']} decode errors | {self.stats['decode_ms']:.1f} ms decoding")
@@ -0,0 +1,112 @@
+import re
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from phones import PHONES
+
+# --- API Record Layout ---
+API_COLUMNS = ["id", "title", "category", "address", "phone", "website", "email", "star_rating", "review_count",
+               "source_url", "scraped_at"]
+RAW_COLUMNS = ["name", "category", "address", "phone", "website", "email", "rating", "review_count", "source_url"]
+DEDUP_COLUMNS = ["id", "title", "address"]  # Same place twice in one query (case-insensitive); rows are merged
+
+_URL_PARTS = r"^(?P<scheme>https?)://(?P<host>[^/?#\s]+)(?P<rest>[^#\s]*)"
+
+
+def _per_value(values, clean):
+    """Apply the vectorized `clean` to the distinct values only and broadcast back; missing values become None.
+
+    Scraped columns repeat a lot (one category per query, the same phone or
+    website on duplicate places), so the .str work runs on the uniques.
+    """
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    cleaned = clean(pd.Series(np.asarray(uniques, dtype=object), dtype=object))
+    cleaned = [None if pd.isna(value) else value for value in cleaned.tolist()]
+    return np.array(cleaned + [None], dtype=object)[codes]  # Code -1 (missing) picks the trailing None
+
+
+def _clean_text(series):
+    cleaned = series.astype(str).str.replace(r"\s+", " ", regex=True).str.strip()
+    return cleaned.mask(cleaned == "")
+
+
+def _canonical_urls(series):
+    """http(s) URLs with the scheme and host lowercased, fragment and bare trailing slash dropped; others None."""
+    parts = series.astype(str).str.strip().str.extract(_URL_PARTS, flags=re.IGNORECASE)
+    rest = parts["rest"].mask(parts["rest"] == "/", "")
+    return parts["scheme"].str.lower() + "://" + parts["host"].str.lower() + rest
+
+
+def _numbers(pattern, decimal_comma=False):
+    """Parser for the first number matching `pattern` ("4,5" stars, "1,234" reviews), NaN when absent."""
+    def parse(series):
+        text = series.astype(str).str.replace(",", "." if decimal_comma else "", regex=False)
+        return pd.to_numeric(text.str.extract(pattern, expand=False), errors="coerce")
+    return parse
+
+
+def _phones(region):
+    # phonenumbers runs once per distinct phone, and the PHONES LRU spans batches
+    def parse(series):
+        return pd.Series([PHONES.extract(phone, region) or phone if isinstance(phone, str) else None
+                          for phone in _clean_text(series)], dtype=object)
+    return parse
+
+
+def _merge_duplicates(columns):
+    """Merge rows sharing DEDUP_COLUMNS into one holding each column's first non-null value."""
+    keys = pd.DataFrame({
+        name: pd.Series(columns[name], dtype=object).fillna("").astype(str).str.casefold() for name in DEDUP_COLUMNS
+    })
+    # Rows without a title or address never merge: two branches of a chain can share a name
+    unkeyed = pd.isna(columns["title"]) | pd.isna(columns["address"])
+    keys["unkeyed"] = np.where(unkeyed, np.arange(len(keys)), -1)
+    if not keys.duplicated().any():
+        return columns
+    merged = pd.DataFrame(columns).groupby([keys[name] for name in keys.columns], sort=False).first()
+    return {name: np.array([None if pd.isna(v) else v for v in merged[name].tolist()], dtype=object)
+            for name in columns}
+
+
+def format_results_for_api(result_batches, region=None):
+    """API-ready records for [(query_id, industry, businesses), ...], normalized column-wise with pandas.
+
+    Ratings and review counts are parsed to numbers, phones to E.164 (kept
+    as cleaned text when they do not validate), websites canonicalized,
+    whitespace stripped from source URLs, text fields trimmed, and duplicate
+    places (same title and address) within a query merged. Pass a whole
+    scrape cycle at once: the pandas overhead is per call. Rows without an
+    industry keep the business's own "category".
+    """
+    records, ids, industries = [], [], []
+    for query_id, industry, businesses in result_batches:
+        for business in businesses or []:
+            if business:
+                records.append(business)
+                ids.append(query_id)
+                industries.append(industry if industry is not None else business.get("category"))
+    if not records:
+        return []
+    raw = pd.DataFrame.from_records(records, columns=RAW_COLUMNS)  # Absent keys become NaN columns
+
+    reviews = _per_value(raw["review_count"], _numbers(r"(\d+)"))
+    source_urls = _per_value(raw["source_url"], lambda s: s.astype(str).str.replace(r"\s+", "", regex=True))
+    columns = {
+        "id": np.array(ids, dtype=object),
+        "title": _per_value(raw["name"], _clean_text),
+        "category": _per_value(industries, _clean_text),
+        "address": _per_value(raw["address"], _clean_text),
+        "phone": _per_value(raw["phone"], _phones(region)),
+        "website": _per_value(raw["website"], _canonical_urls),
+        "email": _per_value(raw["email"], lambda s: _clean_text(s).str.lower()),
+        "star_rating": _per_value(raw["rating"], _numbers(r"(\d+(?:\.\d+)?)", decimal_comma=True)),
+        "review_count": np.array([None if v is None else int(v) for v in reviews], dtype=object),
+        "source_url": np.array(["" if v is None else v for v in source_urls], dtype=object),
+    }
+    columns = _merge_duplicates(columns)
+
+    scraped_at = datetime.utcnow().isoformat() + "Z"  # One timestamp per batch
+    values = [columns[name].tolist() for name in API_COLUMNS[:-1]]
+    return [dict(zip(API_COLUMNS, row + (scraped_at,))) for row in zip(*values)]
@@ -0,0 +1,109 @@
+import os
+import asyncio
+from contextlib import asynccontextmanager
+
+# --- Configurable Settings ---
+PAGE_POOL_SIZE = int(os.environ.get("PAGE_POOL_SIZE", 7))
+MAX_NAVIGATIONS_PER_PAGE = int(os.environ.get("MAX_NAVIGATIONS_PER_PAGE", 50))  # Replace tab after this many places
+MAX_PAGE_HEAP_MB = int(os.environ.get("MAX_PAGE_HEAP_MB", 300))  # Replace tab when its JS heap grows past this
+
+HEAP_USAGE_JS = "() => (performance.memory ? performance.memory.usedJSHeapSize : 0)"
+
+
+class _PooledPage:
+    def __init__(self, page):
+        self.page = page
+        self.uses = 0
+        self.crashed = False
+        page.on("crash", self._on_crash)
+
+    def _on_crash(self, _):
+        self.crashed = True
+
+
+class PagePool:
+    """Bounded set of pre-created tabs in one context that navigate in place.
+
+    Use as `async with PagePool(context) as pages:` and borrow with
+    `async with pages.page() as page:`. Borrowing blocks while every tab is
+    busy, so the pool size also caps detail-stage concurrency.
+    """
+
+    def __init__(self, context, size=PAGE_POOL_SIZE, max_uses=MAX_NAVIGATIONS_PER_PAGE,
+                 max_heap_mb=MAX_PAGE_HEAP_MB):
+        self.context = context
+        self.size = max(1, size)
+        self.max_uses = max_uses
+        self.max_heap_mb = max_heap_mb
+        self._idle = asyncio.Queue()
+        self._all = set()
+        self.stats = {"borrows": 0, "replaced": 0, "crashed": 0}
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def start(self):
+        for _ in range(self.size - len(self._all)):
+            self._idle.put_nowait(await self._new_page())
+
+    async def close(self):
+        for pooled in list(self._all):
+            await self._discard(pooled)
+
+    async def _new_page(self):
+        pooled = _PooledPage(await self.context.new_page())
+        self._all.add(pooled)
+        return pooled
+
+    async def _discard(self, pooled):
+        self._all.discard(pooled)
+        try:
+            if not pooled.page.is_closed():
+                await pooled.page.close()
+        except Exception:
+            pass
+
+    async def _is_healthy(self, pooled):
+        if pooled.crashed or pooled.page.is_closed():
+            self.stats["crashed"] += 1
+            return False
+        if pooled.uses >= self.max_uses:
+            return False
+        if self.max_heap_mb:
+            try:
+                heap = await pooled.page.evaluate(HEAP_USAGE_JS)
+            except Exception:
+                self.stats["crashed"] += 1
+                return False
+            if heap / 1024 ** 2 >= self.max_heap_mb:
+                return False
+        return True
+
+    def idle(self):
+        return self._idle.qsize()
+
+    @asynccontextmanager
+    async def page(self):
+        if self._idle.empty() and len(self._all) < self.size:
+            # Refill a slot lost to a failed replacement
+            self._idle.put_nowait(await self._new_page())
+        pooled = await self._idle.get()
+        self.stats["borrows"] += 1
+        try:
+            pooled.uses += 1
+            yield pooled.page
+        finally:
+            if not await self._is_healthy(pooled):
+                await self._discard(pooled)
+                self.stats["replaced"] += 1
+                try:
+                    pooled = await self._new_page()
+                except Exception as e:
+                    print(f"⚠️ Could not replace pooled page: {str(e)}")
+                    pooled = None
+            if pooled:
+                self._idle.put_nowait(pooled)
@@ -0,0 +1,146 @@
+import os
+import random
+import asyncio
+import time
+
+from bs4 import BeautifulSoup
+
+# --- Configurable Settings ---
+PAGE_STATE_TIMEOUT = float(os.environ.get("PAGE_STATE_TIMEOUT", 30))  # Seconds before an unknown page counts as "timeout"
+PAGE_STATE_POLL_MS = 250  # innerText forces layout, so poll rather than check every frame
+PAGE_STATE_RETRIES = int(os.environ.get("PAGE_STATE_RETRIES", 2))  # Fresh contexts tried after a block
+BLOCK_BACKOFF = float(os.environ.get("BLOCK_BACKOFF", 20))  # Seconds before the first retry; doubles per retry
+BLOCK_BACKOFF_CAP = float(os.environ.get("BLOCK_BACKOFF_CAP", 300))
+
+# --- Outcomes ---
+READY = "ready"
+CONSENT = "consent"
+CAPTCHA = "captcha"
+BLOCKED = "blocked"
+EMPTY = "empty"
+TIMEOUT = "timeout"
+BLOCK_STATES = {CAPTCHA, BLOCKED}  # Back off and retry in a fresh context
+
+# --- Markers ---
+READY_SELECTORS = {
+    "search": ['.Nv2PK', 'a[href^="/maps/place/"]', 'a[href^="https://www.google.com/maps/place/"]', '.DUwDvf'],
+    "place": ['.DUwDvf'],
+}
+# Maps always renders an empty #consent-bump; only a populated one is the dialog
+CONSENT_BUMP_SELECTOR = "#consent-bump"
+CONSENT_SELECTORS = ['form[action*="consent.google."]', 'button[aria-label^="Accept all"]', 'button[aria-label^="Reject all"]']
+CONSENT_ACCEPT_SELECTORS = ['button[aria-label^="Accept all"]', 'form[action*="consent.google."] button']
+CAPTCHA_SELECTORS = ['#captcha-form', 'form[action*="/sorry/"]', 'iframe[src*="recaptcha"]', '.g-recaptcha']
+CONSENT_URL_MARKERS = ["consent.google."]
+CAPTCHA_URL_MARKERS = ["/sorry/"]
+BLOCKED_TEXT_MARKERS = ["unusual traffic", "automated queries"]
+EMPTY_TEXT_MARKERS = ["google maps can't find", "no results found"]
+TEXT_SCAN_CHARS = 5000
+
+MARKERS = {
+    "consentBump": CONSENT_BUMP_SELECTOR,
+    "consent": CONSENT_SELECTORS,
+    "captcha": CAPTCHA_SELECTORS,
+    "consentUrls": CONSENT_URL_MARKERS,
+    "captchaUrls": CAPTCHA_URL_MARKERS,
+    "blockedText": BLOCKED_TEXT_MARKERS,
+    "emptyText": EMPTY_TEXT_MARKERS,
+    "textChars": TEXT_SCAN_CHARS,
+}
+
+CLASSIFY_JS = """
+(m) => {
+    const any = (selectors) => selectors.some((s) => document.querySelector(s));
+    const url = location.href;
+    if (any(m.ready)) return "ready";
+    const bump = document.querySelector(m.consentBump);
+    if ((bump && bump.childElementCount > 0) || any(m.consent) || m.consentUrls.some((u) => url.includes(u))) return "consent";
+    if (any(m.captcha) || m.captchaUrls.some((u) => url.includes(u))) return "captcha";
+    const text = document.body ? document.body.innerText.slice(0, m.textChars).toLowerCase() : "";
+    if (m.blockedText.some((t) => text.includes(t))) return "blocked";
+    if (m.emptyText.some((t) => text.includes(t))) return "empty";
+    return null;
+}
+"""
+
+
+class PageBlocked(Exception):
+    """Raised by callers when a page classified as captcha/blocked; carries the outcome."""
+
+    def __init__(self, state):
+        super().__init__(f"page blocked ({state})")
+        self.state = state
+
+
+def classify_html(html, url="", kind="search"):
+    """Same classification as CLASSIFY_JS on saved HTML; None when nothing matched yet."""
+    soup = BeautifulSoup(html, "html.parser")
+    any_match = lambda selectors: any(soup.select_one(s) for s in selectors)
+    if any_match(READY_SELECTORS[kind]):
+        return READY
+    bump = soup.select_one(CONSENT_BUMP_SELECTOR)
+    if (bump and bump.find(True)) or any_match(CONSENT_SELECTORS) or any(u in url for u in CONSENT_URL_MARKERS):
+        return CONSENT
+    if any_match(CAPTCHA_SELECTORS) or any(u in url for u in CAPTCHA_URL_MARKERS):
+        return CAPTCHA
+    body = soup.body or soup
+    text = " ".join(body.get_text(" ").split())[:TEXT_SCAN_CHARS].lower()
+    if any(t in text for t in BLOCKED_TEXT_MARKERS):
+        return BLOCKED
+    if any(t in text for t in EMPTY_TEXT_MARKERS):
+        return EMPTY
+    return None
+
+
+async def classify_page(page, kind="search", timeout=PAGE_STATE_TIMEOUT, stats=None):
+    """Wait for the first of: results/place rendered, consent, captcha, block or empty page.
+
+    Returns one of the outcome constants, TIMEOUT when nothing recognisable
+    appeared within `timeout` seconds.
+    """
+    started = time.perf_counter()
+    try:
+        handle = await page.wait_for_function(CLASSIFY_JS, arg={**MARKERS, "ready": READY_SELECTORS[kind]},
+                                              timeout=timeout * 1000, polling=PAGE_STATE_POLL_MS)
+        state = await handle.json_value()
+    except Exception:
+        state = TIMEOUT
+    if stats is not None:
+        stats[state] += 1
+        stats["seconds"] += time.perf_counter() - started
+    return state
+
+
+async def resolve_consent(page):
+    """Click through a consent interstitial; True if a button was clicked."""
+    for selector in CONSENT_ACCEPT_SELECTORS:
+        button = await page.query_selector(selector)
+        if button:
+            try:
+                await button.click()
+                await page.wait_for_load_state()
+                return True
+            except Exception as e:
+                print(f"⚠️ Could not accept consent: {str(e)}")
+    return False
+
+
+async def settle_page_state(page, kind="search", timeout=PAGE_STATE_TIMEOUT, stats=None):
+    """classify_page, resolving one consent interstitial before giving up on it."""
+    state = await classify_page(page, kind, timeout, stats)
+    if state == CONSENT and await resolve_consent(page):
+        state = await classify_page(page, kind, timeout, stats)
+    return state
+
+
+async def block_backoff(attempt, base=BLOCK_BACKOFF, cap=BLOCK_BACKOFF_CAP):
+    """Sleep before retry number `attempt` (0-based): base * 2**attempt, jittered, capped."""
+    delay = min(cap, base * 2 ** attempt) * random.uniform(0.75, 1.25)
+    print(f"🧊 Backing off {delay:.0f}s before retrying in a fresh context...")
+    await asyncio.sleep(delay)
+
+
+def format_page_states(stats):
+    checks = sum(count for state, count in stats.items() if state != "seconds") or 1
+    outcomes = ", ".join(f"{state} {count}" for state, count in sorted(stats.items()) if state != "seconds")
+    return f"🚦 Page states: {outcomes or 'none'} | {stats['seconds'] / checks:.1f}s to classify on average"
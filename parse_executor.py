@@ -0,0 +1,109 @@
+import os
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+
+# --- Configurable Settings ---
+PARSE_WORKERS = int(os.environ.get("PARSE_WORKERS", max(1, (os.cpu_count() or 2) - 1)))
+PARSE_BATCH_SIZE = int(os.environ.get("PARSE_BATCH_SIZE", 4))  # Documents per worker round trip
+PARSE_BATCH_WAIT = float(os.environ.get("PARSE_BATCH_WAIT", 0.005))  # Seconds to wait for a batch to fill
+PARSE_MAX_PENDING = int(os.environ.get("PARSE_MAX_PENDING", 64))  # Submitters block beyond this
+
+
+def _run_batch(fn, documents):
+    results = []
+    for document in documents:
+        try:
+            results.append((True, fn(document)))
+        except Exception as e:
+            results.append((False, f"{type(e).__name__}: {e}"))
+    return results
+
+
+class ParseExecutor:
+    """Runs a synchronous parse function in worker processes.
+
+    `await executor.submit(html)` never blocks the event loop: documents are
+    grouped into small batches per worker round trip, and at most
+    `max_pending` documents may be queued or in flight before submitters wait.
+    `fn` must be a module-level function so it can be pickled.
+    """
+
+    def __init__(self, fn, workers=PARSE_WORKERS, batch_size=PARSE_BATCH_SIZE,
+                 batch_wait=PARSE_BATCH_WAIT, max_pending=PARSE_MAX_PENDING):
+        self.fn = fn
+        self.workers = workers
+        self.batch_size = max(1, batch_size)
+        self.batch_wait = batch_wait
+        self._slots = asyncio.Semaphore(max_pending)
+        self._queue = asyncio.Queue()
+        self._pool = None
+        self._batcher = None
+        self._in_flight = set()
+        self.stats = {"documents": 0, "batches": 0, "errors": 0}
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def start(self):
+        if self._pool:
+            return
+        self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        self._batcher = asyncio.create_task(self._dispatch())
+
+    async def close(self):
+        if self._batcher:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+            self._batcher = None
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+        if self._pool:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    async def submit(self, document):
+        async with self._slots:
+            future = asyncio.get_running_loop().create_future()
+            await self._queue.put((document, future))
+            return await future
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_wait
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            task = asyncio.create_task(self._run(loop, batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _run(self, loop, batch):
+        documents = [document for document, _ in batch]
+        try:
+            results = await loop.run_in_executor(self._pool, _run_batch, self.fn, documents)
+        except Exception as e:  # Broken pool, unpicklable result, ...
+            results = [(False, f"{type(e).__name__}: {e}")] * len(batch)
+        self.stats["batches"] += 1
+        for (_, future), (ok, value) in zip(batch, results):
+            self.stats["documents"] += 1
+            if future.done():
+                continue
+            if ok:
+                future.set_result(value)
+            else:
+                self.stats["errors"] += 1
+                future.set_exception(RuntimeError(value))
@@ -0,0 +1,141 @@
+import os
+import re
+
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html
+    from lxml import etree
+    from cssselect import HTMLTranslator
+except ImportError:  # lxml/cssselect are optional; html.parser always works
+    lxml = None
+
+# --- Configurable Settings ---
+PARSER_BACKEND = os.environ.get("PARSER_BACKEND", "lxml")
+NON_TEXT_TAGS = ("script", "style", "template")  # bs4's get_text() skips these strings
+
+
+# --- BeautifulSoup Backends ---
+class SoupBackend:
+    """BeautifulSoup tree built by `features` ("html.parser" or "lxml")."""
+
+    def __init__(self, name="html.parser", features="html.parser"):
+        self.name = name
+        self.features = features
+
+    def parse(self, html):
+        return BeautifulSoup(html, self.features)
+
+    def text(self, doc):
+        return doc.get_text(" ", strip=True)
+
+    def extract(self, plan, doc):
+        return plan.extract(doc)
+
+
+# --- Native lxml Backend ---
+_SOUP_CONTAINS = re.compile(r":-soup-contains\(")
+
+if lxml is not None:
+    _TEXT_PREDICATE = "[not(" + " or ".join(f"parent::{tag}" for tag in NON_TEXT_TAGS) + ")]"
+    _ALL_TEXT = etree.XPath("//text()" + _TEXT_PREDICATE, smart_strings=False)
+    _DESCENDANT_TEXT = etree.XPath(".//text()" + _TEXT_PREDICATE, smart_strings=False)
+
+
+class LxmlElement:
+    """The slice of the bs4 Tag API that extraction callbacks rely on."""
+
+    __slots__ = ("el",)
+
+    def __init__(self, el):
+        self.el = el
+
+    @property
+    def name(self):
+        return self.el.tag
+
+    def get_text(self, separator="", strip=False):
+        strings = _DESCENDANT_TEXT(self.el)
+        if strip:
+            strings = [s.strip() for s in strings]
+            strings = [s for s in strings if s]
+        return separator.join(strings)
+
+    def has_attr(self, key):
+        return key in self.el.attrib
+
+    def get(self, key, default=None):
+        return self.el.attrib.get(key, default)
+
+    def __getitem__(self, key):
+        return self.el.attrib[key]
+
+
+class LxmlBackend:
+    """libxml2 parsing plus XPath (compiled from the CSS selectors) matching.
+
+    Skips building a Python object per node, which is where BeautifulSoup
+    spends most of its time. Field semantics follow ExtractionPlan: selectors
+    are tried in order and the first accepted element wins.
+    """
+
+    name = "lxml"
+
+    def __init__(self):
+        self._translator = HTMLTranslator()
+        self._xpaths = {}
+
+    def parse(self, html):
+        return lxml.html.document_fromstring(html)
+
+    def text(self, doc):
+        return " ".join(s for s in (s.strip() for s in _ALL_TEXT(doc)) if s)
+
+    def _compile(self, selector):
+        if selector not in self._xpaths:
+            try:
+                css = _SOUP_CONTAINS.sub(":contains(", selector)
+                self._xpaths[selector] = etree.XPath(self._translator.css_to_xpath(css))
+            except Exception as e:
+                print(f"⚠️ Error using selector '{selector}': {str(e)}")
+                self._xpaths[selector] = None
+        return self._xpaths[selector]
+
+    def extract(self, plan, doc):
+        values = {}
+        for field_name, field in plan.fields.items():
+            values[field_name] = None
+            for selector in field.selectors:
+                xpath = self._compile(selector)
+                if xpath is None:
+                    continue
+                matches = xpath(doc)
+                if field.first_only:
+                    matches = matches[:1]
+                value = None
+                for el in matches:
+                    value = field.accept(LxmlElement(el))
+                    if value is not None:
+                        break
+                if value is not None:
+                    values[field_name] = value
+                    break
+        return values
+
+
+_BACKENDS = {}
+
+
+def get_backend(name=None):
+    name = name or PARSER_BACKEND
+    if name not in _BACKENDS:
+        if name == "lxml" and lxml is None:
+            print("⚠️ lxml/cssselect not installed, falling back to html.parser")
+            return get_backend("html.parser")
+        if name == "lxml":
+            _BACKENDS[name] = LxmlBackend()
+        elif name in ("html.parser", "bs4-lxml"):
+            _BACKENDS[name] = SoupBackend(name, "lxml" if name == "bs4-lxml" else name)
+        else:
+            raise ValueError(f"Unknown parser backend: {name}")
+    return _BACKENDS[name]
@@ -0,0 +1,99 @@
+import os
+import re
+import time
+from functools import lru_cache
+
+import phonenumbers
+
+# --- Configurable Settings ---
+PHONE_REGION = os.environ.get("PHONE_REGION", "US")  # Region for numbers written without a +country code
+PHONE_CACHE_SIZE = int(os.environ.get("PHONE_CACHE_SIZE", "4096"))  # Normalized candidates kept in the LRU
+
+# Query API country (e.g. "usa_blockdata") prefix -> phonenumbers region
+COUNTRY_REGIONS = {
+    "usa": "US", "us": "US", "canada": "CA", "ca": "CA", "uk": "GB", "gb": "GB", "australia": "AU",
+    "au": "AU", "india": "IN", "in": "IN", "kenya": "KE", "ke": "KE", "nigeria": "NG", "ng": "NG",
+    "southafrica": "ZA", "za": "ZA", "germany": "DE", "de": "DE", "france": "FR", "fr": "FR",
+}
+
+# A run of digits with the separators phone numbers use: +1 706-323-3816,
+# (706) 323-3816, 0722 640708. phonenumbers decides which runs are phones.
+CANDIDATE_PATTERN = r"(?<!\w)\+?\(?\d[\d\s().\-]{5,20}\d(?!\w)"
+MIN_DIGITS = 7
+DATE_PATTERN = r"\d{4}-\d{2}-\d{2}"  # ISO dates pass as numbers in some regions
+
+_candidate_re = re.compile(CANDIDATE_PATTERN)
+_date_re = re.compile(DATE_PATTERN)
+_digit_re = re.compile(r"\d")
+
+
+def region_for_country(country, default=PHONE_REGION):
+    """phonenumbers region for a query API country value, else `default`."""
+    key = (country or "").lower().split("_")[0].replace(" ", "")
+    return COUNTRY_REGIONS.get(key, default)
+
+
+class PhoneExtractor:
+    """Compiled candidate regex, phonenumbers validation and an LRU of E.164 results.
+
+    Only regex candidates with enough digits reach phonenumbers, and each
+    (candidate, region) pair is parsed once per process; `extract` returns
+    the first valid number of a text, normalized to E.164.
+    """
+
+    def __init__(self, region=PHONE_REGION, cache_size=PHONE_CACHE_SIZE):
+        self.region = region
+        self.normalize = lru_cache(maxsize=cache_size)(self._normalize)
+        self.texts = 0
+        self.candidate_count = 0
+        self.found = 0
+        self.seconds = 0.0
+
+    def candidates(self, text):
+        return (match.group(0) for match in _candidate_re.finditer(text or ""))
+
+    def _normalize(self, candidate, region):
+        try:
+            number = phonenumbers.parse(candidate, region)
+        except phonenumbers.NumberParseException:
+            number = None
+        if number is None or not phonenumbers.is_valid_number(number):
+            # The run may have glued a phone onto nearby digits ("Suite 200 706-323-3816")
+            number = next((m.number for m in phonenumbers.PhoneNumberMatcher(candidate, region)), None)
+            if number is None:
+                return None
+        return phonenumbers.format_number(number, phonenumbers.PhoneNumberFormat.E164)
+
+    def pick(self, candidates, region=None):
+        """E.164 of the first valid candidate (from `candidates` or CANDIDATE_PATTERN in-page), or None."""
+        start = time.perf_counter()
+        self.texts += 1
+        phone = None
+        for candidate in candidates:
+            self.candidate_count += 1
+            if len(_digit_re.findall(candidate)) < MIN_DIGITS or _date_re.fullmatch(candidate):
+                continue
+            phone = self.normalize(candidate, region or self.region)
+            if phone:
+                self.found += 1
+                break
+        self.seconds += time.perf_counter() - start
+        return phone
+
+    def extract(self, text, region=None):
+        return self.pick(self.candidates(text), region)
+
+    def summary(self):
+        cache = self.normalize.cache_info()
+        lookups = (cache.hits + cache.misses) or 1
+        rate = self.candidate_count / self.seconds if self.seconds else 0
+        return (f"📞 Phones: {self.found}/{self.texts} texts | {self.candidate_count} candidates "
+                f"({rate:,.0f}/s) | LRU {cache.hits / lookups:.0%} hits, {cache.currsize}/{cache.maxsize}")
+
+
+PHONES = PhoneExtractor()
+
+
+def extract_phone(text, region=None):
+    """First valid phone number in `text` as E.164, or None."""
+    return PHONES.extract(text, region)
@@ -0,0 +1,136 @@
+import re
+import warnings
+
+import soupsieve as sv
+from bs4 import Tag
+
+# --- Helper: Prefilter Key of a Selector ---
+# The rightmost compound of a selector names a class, tag or attribute every
+# match must carry. Checking that first skips the full soupsieve match for
+# almost every element in the document.
+_COMBINATORS = " >+~"
+_IDENT = r"-?[_a-zA-Z][\w-]*"
+
+
+def _rightmost_compound(selector):
+    depth, quote, start = 0, None, 0
+    for i, ch in enumerate(selector):
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in "'\"":
+            quote = ch
+        elif ch in "([":
+            depth += 1
+        elif ch in ")]":
+            depth -= 1
+        elif depth == 0 and ch in _COMBINATORS:
+            start = i + 1
+    return selector[start:].strip()
+
+
+def _top_level(compound):
+    # Drop bracketed/parenthesised parts so `:has(.x)` or `[a='.b']` don't leak keys
+    out, depth, quote = [], 0, None
+    for ch in compound:
+        if quote:
+            if ch == quote:
+                quote = None
+            continue
+        if ch in "'\"":
+            quote = ch
+        elif ch in "([":
+            if ch == "[" and depth == 0:
+                out.append("[")
+            depth += 1
+        elif ch in ")]":
+            depth -= 1
+        elif depth == 0:
+            out.append(ch)
+    return "".join(out)
+
+
+def _prefilter(selector):
+    if "," in _top_level(selector):
+        return None  # Selector lists have no single required key
+    compound = _rightmost_compound(selector)
+    top = _top_level(compound)
+    cls = re.search(r"\.(" + _IDENT + ")", top)
+    if cls:
+        name = cls.group(1)
+        return lambda el: name in el.get("class", ())
+    tag = re.match(_IDENT, top)
+    if tag:
+        name = tag.group(0).lower()
+        return lambda el: el.name == name
+    attr = re.match(r"\[\s*(" + _IDENT + ")", compound)
+    if attr:
+        name = attr.group(1)
+        return lambda el: el.has_attr(name)
+    return None
+
+
+class Field:
+    """Fallback selector chain for one output field.
+
+    `accept(el)` turns a matched element into a value or None to keep looking.
+    With `first_only`, only the first match of each selector is considered
+    (the `soup.select_one` semantics); otherwise every match is tried in
+    document order (the `soup.select` semantics).
+    """
+
+    def __init__(self, selectors, accept, first_only=False):
+        self.selectors = list(selectors)
+        self.accept = accept
+        self.first_only = first_only
+
+
+class ExtractionPlan:
+    """All field selector chains compiled into one document walk.
+
+    Output is identical to evaluating each field's selectors one after the
+    other: the earliest selector in a chain that yields a value wins, and
+    within a selector the first accepted element in document order wins.
+    """
+
+    def __init__(self, fields):
+        self.fields = fields
+        self._rules = []
+        for field_name, field in fields.items():
+            for rank, selector in enumerate(field.selectors):
+                try:
+                    with warnings.catch_warnings():
+                        warnings.simplefilter("ignore", FutureWarning)  # `:contains` alias
+                        matcher = sv.compile(selector)
+                except Exception as e:
+                    print(f"⚠️ Error using selector '{selector}': {str(e)}")
+                    continue
+                self._rules.append((len(self._rules), field_name, rank, _prefilter(selector), matcher))
+
+    def extract(self, soup):
+        best = {name: (len(field.selectors), None) for name, field in self.fields.items()}
+        exhausted = [False] * len(self._rules)
+        unresolved = set(self.fields)
+
+        for el in soup.descendants:
+            if not isinstance(el, Tag):
+                continue
+            for index, field_name, rank, prefilter, matcher in self._rules:
+                if exhausted[index] or rank >= best[field_name][0]:
+                    continue
+                if prefilter and not prefilter(el):
+                    continue
+                if not matcher.match(el):
+                    continue
+                field = self.fields[field_name]
+                if field.first_only:
+                    exhausted[index] = True
+                value = field.accept(el)
+                if value is not None:
+                    best[field_name] = (rank, value)
+                    if rank == 0:
+                        unresolved.discard(field_name)
+            if not unresolved:
+                break
+
+        return {name: value for name, (_, value) in best.items()}
@@ -0,0 +1,71 @@
+import os
+import time
+from collections import Counter
+
+# --- Configurable Settings ---
+READY_TIMEOUT = float(os.environ.get("READY_TIMEOUT", 5))  # Cap in seconds: the fixed sleep it replaces, never longer
+READY_TIMEOUT_FLOOR = float(os.environ.get("READY_TIMEOUT_FLOOR", 0.5))  # Lowest cap derived from latency samples
+
+# (required selector, any-of selectors) per page kind. A place is ready once
+# its header and the rating or address block exist; a search once the
+# results feed has cards (or Maps redirected straight to a single place).
+READY_SELECTORS = {
+    "place": (".DUwDvf", [".F7nice", 'span[role="img"][aria-label*="star"]', 'button[data-item-id="address"]']),
+    "search": ('div[role="feed"] .Nv2PK, .DUwDvf', []),
+}
+
+READY_JS = """
+({header, details}) => !!document.querySelector(header)
+    && (details.length === 0 || details.some((selector) => document.querySelector(selector)))
+"""
+
+
+class ReadinessStats:
+    """Pages waited on, seconds spent, and what ended each wait."""
+
+    def __init__(self):
+        self.pages = 0
+        self.seconds = 0.0
+        self.reasons = Counter()
+
+    def record(self, reason, seconds):
+        self.pages += 1
+        self.seconds += seconds
+        self.reasons[reason] += 1
+
+    def summary(self, fixed_wait=None):
+        pages = self.pages or 1
+        line = (f"⏳ Readiness waits: {self.pages} pages, {self.seconds:.1f}s total, "
+                f"{self.seconds / pages * 1000:.0f} ms/page | " +
+                ", ".join(f"{reason} {count}" for reason, count in sorted(self.reasons.items())))
+        if fixed_wait:
+            line += f" | {self.pages * fixed_wait - self.seconds:.1f}s saved vs fixed {fixed_wait:g}s waits"
+        return line
+
+
+async def wait_until_ready(page, stats=None, kind="place", timeout=READY_TIMEOUT, latency=None):
+    """Wait until the page has rendered what the extractors read, at most `timeout` seconds.
+
+    Returns False on timeout; the caller extracts whatever is there, as it did after
+    a fixed sleep. With a `latency` tracker, recent "ready:<kind>" times can
+    shorten the cap, but never stretch it past `timeout`.
+    """
+    header, details = READY_SELECTORS[kind]
+    stage = f"ready:{kind}"
+    if latency is not None:
+        timeout = min(timeout, latency.timeout(stage, timeout, floor=READY_TIMEOUT_FLOOR))
+    started = time.perf_counter()
+    try:
+        await page.wait_for_function(READY_JS, arg={"header": header, "details": details}, timeout=timeout * 1000)
+        reason = "dom"
+    except Exception:  # Timeout, or a navigation mid-evaluation
+        reason = "timeout"
+    elapsed = time.perf_counter() - started
+    if stats is not None:
+        stats.record(reason, elapsed)
+    if latency is not None:
+        if reason == "timeout":
+            latency.straggler(stage)
+        else:
+            latency.record(stage, elapsed)
+    return reason != "timeout"
@@ -0,0 +1,106 @@
+import re
+from collections import Counter
+
+# --- Configurable Settings ---
+# Only what the extractors need is let through; every other request is aborted.
+# Documents cover Maps search/place pages, consent pages and the business
+# websites emails are read from (their HTML only, not their scripts or XHRs).
+ALLOWED_RESOURCE_TYPES = {"document"}
+
+# Maps' own script and style bundles: the results feed only renders and
+# scrolls once the Maps app has booted and the layout is styled
+MAPS_ASSET_PATTERNS = [
+    r"^https://www\.google\.[a-z.]+/maps/_/js/",
+    r"^https://www\.google\.[a-z.]+/xjs/",
+    r"^https://maps\.gstatic\.com/",
+    r"^https://www\.gstatic\.com/",
+]
+
+# Payloads network_capture decodes (result cards on scroll, place previews)
+MAPS_DATA_PATTERNS = [
+    r"/search\?tbm=map",
+    r"/maps/preview/place",
+]
+
+# Resource type -> URL patterns allowed on top of ALLOWED_RESOURCE_TYPES
+ALLOWED_URL_PATTERNS = {
+    "script": MAPS_ASSET_PATTERNS,
+    "stylesheet": MAPS_ASSET_PATTERNS,
+    "xhr": MAPS_DATA_PATTERNS,
+    "fetch": MAPS_DATA_PATTERNS,
+}
+
+# Rough transfer size of a blocked request, used to estimate bandwidth saved
+ESTIMATED_BYTES_BY_TYPE = {
+    "image": 25_000,
+    "media": 250_000,
+    "font": 40_000,
+    "stylesheet": 30_000,
+    "script": 60_000,
+    "xhr": 4_000,
+    "fetch": 4_000,
+    "ping": 500,
+    "other": 2_000,
+}
+
+
+def _compile(patterns):
+    return re.compile("|".join(f"(?:{p})" for p in patterns)) if patterns else None
+
+
+class RequestPolicy:
+    """Context-level request allowlist by resource type and URL pattern.
+
+    Install once per context (or page) with `await policy.install(context)`.
+    Allowed requests fall through to any other route handler; everything
+    else is aborted and counted in `stats`.
+    """
+
+    def __init__(self, allowed_types=None, allowed_patterns=None):
+        self.allowed_types = set(ALLOWED_RESOURCE_TYPES if allowed_types is None else allowed_types)
+        patterns = ALLOWED_URL_PATTERNS if allowed_patterns is None else allowed_patterns
+        self._allowed_re = {resource_type: _compile(p) for resource_type, p in patterns.items()}
+        self.blocked_by_type = Counter()
+        self.stats = {
+            "allowed": 0,
+            "blocked": 0,
+            "bytes_received": 0,
+            "bytes_saved_estimate": 0,
+        }
+
+    def decide(self, url, resource_type):
+        if resource_type in self.allowed_types:
+            return True
+        allowed_re = self._allowed_re.get(resource_type)
+        return bool(allowed_re and allowed_re.search(url))
+
+    async def install(self, target):
+        await target.route("**/*", self._handle)
+        target.on("response", self._on_response)
+
+    async def _handle(self, route, request):
+        resource_type = request.resource_type
+        if self.decide(request.url, resource_type):
+            self.stats["allowed"] += 1
+            await route.fallback()
+            return
+        self.stats["blocked"] += 1
+        self.blocked_by_type[resource_type] += 1
+        self.stats["bytes_saved_estimate"] += ESTIMATED_BYTES_BY_TYPE.get(
+            resource_type, ESTIMATED_BYTES_BY_TYPE["other"]
+        )
+        await route.abort()
+
+    def _on_response(self, response):
+        length = response.headers.get("content-length")
+        if length and length.isdigit():
+            self.stats["bytes_received"] += int(length)
+
+    def summary(self):
+        total = self.stats["allowed"] + self.stats["blocked"]
+        blocked_types = ", ".join(f"{k}={v}" for k, v in self.blocked_by_type.most_common())
+        return (
+            f"🛡️ Requests blocked: {self.stats['blocked']}/{total} ({blocked_types or 'none'}) | "
+            f"📥 Received: {self.stats['bytes_received'] / 1024 ** 2:.2f} MB | "
+            f"💾 Saved (est.): {self.stats['bytes_saved_estimate'] / 1024 ** 2:.2f} MB"
+        )
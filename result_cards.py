@@ -0,0 +1,162 @@
+import re
+
+from bs4 import BeautifulSoup, Comment
+
+# --- Card Layout ---
+# A `.Nv2PK` result card holds the place link (aria-label = name), a rating
+# badge, then `.W4Efsd > .W4Efsd` info rows whose parts are separated by
+# aria-hidden "·" spans: "Category · [icons] · Address", "Hours · Phone".
+CARD_SELECTOR = ".Nv2PK"
+CARD_LINK_SELECTOR = "a.hfpxzc"
+CARD_NAME_SELECTOR = ".qBF1Pd"
+CARD_RATING_SELECTOR = '[role="img"][aria-label]'
+CARD_INFO_ROW_SELECTOR = ".W4Efsd > .W4Efsd"
+CARD_PHONE_SELECTOR = ".UsdlK"
+CARD_WEBSITE_SELECTOR = 'a[data-value="Website"]'
+HIDDEN_PART_SELECTOR = '[aria-hidden="true"], .google-symbols'
+
+# Function expression `(card) => payload | null`, shared by the harvest and
+# feed-scroll scripts so every caller sees the same card fields.
+CARD_PAYLOAD_JS = r"""
+(card) => {
+    const link = card.querySelector("%(link)s");
+    if (!link || !link.href.includes("/maps/place/")) return null;
+    const visibleText = (el) => {
+        const out = [];
+        const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+        for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+            const hidden = node.parentElement.closest('%(hidden)s');
+            if (hidden && el.contains(hidden)) continue;
+            const text = node.nodeValue.replace(/\s+/g, " ").trim();
+            if (text) out.push(text);
+        }
+        return out.join(" ");
+    };
+    const parts = (row) => row ? Array.from(row.children).map(visibleText).filter(Boolean) : [];
+    const rating = Array.from(card.querySelectorAll('%(rating)s'))
+        .find((el) => /star/i.test(el.getAttribute("aria-label")));
+    const nameEl = card.querySelector("%(name)s");
+    const phoneEl = card.querySelector("%(phone)s");
+    const websiteEl = card.querySelector('%(website)s');
+    const info = parts(card.querySelector("%(info)s"));
+    return {
+        href: link.href,
+        name: link.getAttribute("aria-label") || (nameEl ? nameEl.textContent.trim() : null),
+        rating_text: rating ? rating.getAttribute("aria-label") : null,
+        category: info.length ? info[0] : null,
+        address: info.length > 1 ? info[info.length - 1] : null,
+        phone: phoneEl ? phoneEl.textContent.trim() : null,
+        website: websiteEl ? websiteEl.getAttribute("href") : null,
+    };
+}
+""" % {
+    "link": CARD_LINK_SELECTOR,
+    "hidden": HIDDEN_PART_SELECTOR,
+    "rating": CARD_RATING_SELECTOR,
+    "name": CARD_NAME_SELECTOR,
+    "phone": CARD_PHONE_SELECTOR,
+    "website": CARD_WEBSITE_SELECTOR,
+    "info": CARD_INFO_ROW_SELECTOR,
+}
+
+HARVEST_CARDS_JS = r"""
+(cardSelector) => {
+    const payload = %s;
+    return Array.from(document.querySelectorAll(cardSelector)).map(payload).filter(Boolean);
+}
+""" % CARD_PAYLOAD_JS.strip()
+
+
+async def harvest_cards(page):
+    """Every rendered result card as a dict, in a single evaluate round trip."""
+    return await page.evaluate(HARVEST_CARDS_JS, CARD_SELECTOR)
+
+
+def unique_hrefs(cards):
+    return list(dict.fromkeys(card["href"] for card in cards))
+
+
+# --- Card Records ---
+CARD_RATING_PATTERN = r'(\d+(?:\.\d+)?)\s*stars?\s*([\d,]+)\s*[Rr]eviews?'
+
+
+def card_details(card):
+    """A card payload in the same record shape the detail parsers return."""
+    rating = review_count = None
+    match = re.search(CARD_RATING_PATTERN, card.get("rating_text") or "")
+    if match:
+        rating, review_count = match.group(1), match.group(2).replace(",", "")
+    return {
+        "name": card.get("name"),
+        "rating": rating,
+        "review_count": review_count,
+        "category": card.get("category"),
+        "address": card.get("address"),
+        "phone": card.get("phone"),
+        "website": card.get("website"),
+        "email": None,
+        "social_links": [],
+        "source_url": card["href"],
+    }
+
+
+def missing_fields(details, required):
+    return [field for field in required if not details.get(field)]
+
+
+def merge_details(card_record, detail_record):
+    """Fill the card record's empty fields from a detail page record."""
+    merged = dict(card_record)
+    for field, value in (detail_record or {}).items():
+        if value and not merged.get(field):
+            merged[field] = value
+    return merged
+
+
+# --- Offline Mirror ---
+# Same payload from saved HTML, for benchmarks and card-level checks on
+# minimal_html pages without a browser.
+def _is_hidden(tag):
+    return tag.get("aria-hidden") == "true" or "google-symbols" in tag.get("class", ())
+
+
+def _visible_text(el):
+    out = []
+    for text in el.find_all(string=True):
+        if isinstance(text, Comment):
+            continue
+        parent = text.parent
+        while parent is not None and not _is_hidden(parent) and parent is not el:
+            parent = parent.parent
+        if parent is not None and _is_hidden(parent):
+            continue
+        text = " ".join(text.split())
+        if text:
+            out.append(text)
+    return " ".join(out)
+
+
+def card_payload(card):
+    link = card.select_one(CARD_LINK_SELECTOR)
+    if not link or "/maps/place/" not in link.get("href", ""):
+        return None
+    rating = next((el for el in card.select(CARD_RATING_SELECTOR) if "star" in el["aria-label"].lower()), None)
+    name_el = card.select_one(CARD_NAME_SELECTOR)
+    phone_el = card.select_one(CARD_PHONE_SELECTOR)
+    website_el = card.select_one(CARD_WEBSITE_SELECTOR)
+    row = card.select_one(CARD_INFO_ROW_SELECTOR)
+    info = [part for part in map(_visible_text, row.find_all(recursive=False)) if part] if row else []
+    return {
+        "href": link["href"],
+        "name": link.get("aria-label") or (name_el.get_text(strip=True) if name_el else None),
+        "rating_text": rating["aria-label"] if rating else None,
+        "category": info[0] if info else None,
+        "address": info[-1] if len(info) > 1 else None,
+        "phone": phone_el.get_text(strip=True) if phone_el else None,
+        "website": website_el.get("href") if website_el else None,
+    }
+
+
+def parse_cards(html):
+    soup = BeautifulSoup(html, "html.parser")
+    return [payload for payload in map(card_payload, soup.select(CARD_SELECTOR)) if payload]
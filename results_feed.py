@@ -0,0 +1,173 @@
+import os
+import time
+import asyncio
+
+from result_cards import CARD_PAYLOAD_JS, CARD_SELECTOR
+
+# --- Configurable Settings ---
+FEED_SELECTOR = 'div[role="feed"]'  # Scrollable results list; document.body never grows
+END_OF_LIST_SELECTOR = ".HlvSq"  # "You've reached the end of the list."
+END_OF_LIST_TEXT = "end of the list"
+SCROLL_TIME_BUDGET = float(os.environ.get("SCROLL_TIME_BUDGET", 45))  # Seconds per query
+SCROLL_MUTATION_WAIT = float(os.environ.get("SCROLL_MUTATION_WAIT", 3))  # Max seconds to wait for new cards
+SCROLL_PLATEAU_ROUNDS = int(os.environ.get("SCROLL_PLATEAU_ROUNDS", 3))  # Rounds without new cards
+FEED_WAIT_TIMEOUT = 30000
+
+
+# --- In-Page Scroll Step ---
+# Scrolls the feed to its bottom and resolves as soon as a MutationObserver sees
+# more cards (or the end-of-list marker), or after `waitMs` without changes.
+# Payloads of cards from index `from` on are returned with the new count;
+# `waitMs` of 0 only collects them without scrolling.
+SCROLL_FEED_JS = r"""
+async ({feed, card, endSelector, endText, waitMs, from}) => {
+    const payload = %s;
+    const container = document.querySelector(feed);
+    const root = container || document;
+    const count = () => root.querySelectorAll(card).length;
+    const cards = () => Array.from(root.querySelectorAll(card)).slice(from).map(payload).filter(Boolean);
+    const atEnd = () => !!container && Array.from(container.querySelectorAll(endSelector))
+        .some((el) => el.textContent.toLowerCase().includes(endText));
+    const before = count();
+    if (!container || !waitMs || atEnd()) {
+        return {found: !!container, count: before, end: atEnd(), cards: cards()};
+    }
+
+    const changed = new Promise((resolve) => {
+        let timer = null;
+        const observer = new MutationObserver(() => {
+            if (count() > before || atEnd()) {
+                clearTimeout(timer);
+                observer.disconnect();
+                resolve(true);
+            }
+        });
+        observer.observe(container, {childList: true, subtree: true});
+        timer = setTimeout(() => {
+            observer.disconnect();
+            resolve(false);
+        }, waitMs);
+    });
+    container.scrollTop = container.scrollHeight;
+    await changed;
+    return {found: true, count: count(), end: atEnd(), cards: cards()};
+}
+""" % CARD_PAYLOAD_JS.strip()
+
+
+def _new_scroll_stats():
+    return {"cards": 0, "urls": 0, "rounds": 0, "seconds": 0.0, "reason": None}
+
+
+async def _feed_step(page, offset, wait_seconds):
+    return await page.evaluate(SCROLL_FEED_JS, {
+        "feed": FEED_SELECTOR,
+        "card": CARD_SELECTOR,
+        "endSelector": END_OF_LIST_SELECTOR,
+        "endText": END_OF_LIST_TEXT,
+        "waitMs": int(wait_seconds * 1000),
+        "from": offset,
+    })
+
+
+async def stream_place_cards(page, stats=None, budget=SCROLL_TIME_BUDGET, mutation_wait=SCROLL_MUTATION_WAIT,
+                             plateau_rounds=SCROLL_PLATEAU_ROUNDS):
+    """Yield each result card payload (see result_cards) as soon as it renders.
+
+    Scrolling continues between yields, so consumers can start on the first
+    places while later cards are still loading. Cards are de-duplicated by URL.
+    Stops on the end-of-list marker, after `plateau_rounds` scrolls that add
+    no cards, or when `budget` seconds are spent; `stats` (if given) is
+    filled with card/URL counts, scroll rounds, elapsed seconds and the
+    stop reason.
+    """
+    stats = stats if stats is not None else {}
+    stats.update(_new_scroll_stats())
+    started = time.perf_counter()
+    seen = set()
+    try:
+        await page.wait_for_selector(FEED_SELECTOR, timeout=FEED_WAIT_TIMEOUT)
+    except Exception:
+        pass  # Single-result or empty searches render no feed
+
+    wait = 0  # First step only collects the cards already on screen
+    stalls = 0
+    while True:
+        state = await _feed_step(page, stats["cards"], wait)
+        for card in state["cards"]:
+            if card["href"] not in seen:
+                seen.add(card["href"])
+                stats["urls"] += 1
+                yield card
+        if wait:
+            stats["rounds"] += 1
+            stalls = stalls + 1 if state["count"] <= stats["cards"] else 0
+        stats["cards"] = max(stats["cards"], state["count"])
+        stats["seconds"] = round(time.perf_counter() - started, 2)
+
+        if not state["found"]:
+            stats["reason"] = "no-feed"
+            break
+        if state["end"]:
+            stats["reason"] = "end-of-list"
+            break
+        if stalls >= plateau_rounds:
+            stats["reason"] = "plateau"
+            break
+        remaining = budget - (time.perf_counter() - started)
+        if remaining <= 0:
+            stats["reason"] = "budget"
+            break
+        wait = min(mutation_wait, remaining)
+
+
+async def stream_place_urls(page, stats=None, **options):
+    async for card in stream_place_cards(page, stats, **options):
+        yield card["href"]
+
+
+async def scroll_results_feed(page, **options):
+    """Load every result card in the search feed and return the scroll stats."""
+    stats = {}
+    async for _ in stream_place_cards(page, stats, **options):
+        pass
+    return stats
+
+
+async def pipe_place_urls(items, handle, workers):
+    """Run `handle(item)` on `workers` concurrent tasks as stream items arrive.
+
+    Items are place URLs or card payloads. Returns the non-empty results. A
+    failing item is logged and skipped so one bad page cannot stall the stream.
+    """
+    queue = asyncio.Queue()
+    results = []
+
+    async def worker():
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            try:
+                result = await handle(item)
+            except Exception as e:
+                label = item["href"] if isinstance(item, dict) else item
+                print(f"🚨 Detail worker error on {label}: {str(e)}")
+                continue
+            if result:
+                results.append(result)
+
+    tasks = [asyncio.create_task(worker()) for _ in range(max(1, workers))]
+    try:
+        async for item in items:
+            queue.put_nowait(item)
+    finally:
+        for _ in tasks:
+            queue.put_nowait(None)
+        await asyncio.gather(*tasks)
+    return results
+
+
+def format_scroll_stats(stats):
+    return (f"📜 Scrolled {stats['rounds']} times in {stats['seconds']:.1f}s: "
+            f"{stats['cards']} cards, {stats['urls']} places ({stats['reason']})")
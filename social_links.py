@@ -0,0 +1,123 @@
+import re
+from urllib.parse import unquote_plus
+
+# --- Platform Domains ---
+# Registrable domain -> platform. Hosts match on label boundaries, so
+# m.facebook.com is Facebook while dropbox.com is not X.
+SOCIAL_DOMAINS = {
+    "facebook.com": "facebook",
+    "fb.com": "facebook",
+    "fb.me": "facebook",
+    "instagram.com": "instagram",
+    "instagr.am": "instagram",
+    "twitter.com": "x",
+    "x.com": "x",
+    "linkedin.com": "linkedin",
+    "youtube.com": "youtube",
+    "youtu.be": "youtube",
+    "tiktok.com": "tiktok",
+    "tik.to": "tiktok",
+    "tiktok.tv": "tiktok",
+    "pinterest.com": "pinterest",
+    "pin.it": "pinterest",
+    "reddit.com": "reddit",
+    "whatsapp.com": "whatsapp",
+    "wa.me": "whatsapp",
+}
+# Canonical host for alias domains; every subdomain (www., m., uk.) is dropped
+DOMAIN_ALIASES = {"fb.com": "facebook.com", "instagr.am": "instagram.com", "twitter.com": "x.com"}
+# Query parameters that identify a profile or video; tracking parameters are dropped
+KEEP_QUERY = ["id", "v", "list", "phone"]
+# Hosts whose /url?q=<target> links are unwrapped to the target
+REDIRECT_DOMAINS = ["google.com"]
+REDIRECT_PATTERN = r"(?:^|&)(?:q|url)=([^&]+)"
+
+URL_PATTERN = r"https?://[^\s\"'<>]+"
+# Host, path and query of a candidate, without a full urlsplit
+LINK_PATTERN = r"https?://(?:[^/?#@]*@)?([^/?#:]+)(?::\d*)?([^?#]*)(?:\?([^#]*))?"
+_TRAILING = ".,;:!?)]}"
+_url_re = re.compile(URL_PATTERN)
+_link_re = re.compile(LINK_PATTERN, re.IGNORECASE)
+_redirect_re = re.compile(REDIRECT_PATTERN)
+
+
+class SocialLinkMatcher:
+    """Classifies candidate URLs by host suffix and returns canonical profile links.
+
+    Each candidate is matched once; its host is looked up label by label in
+    the domain table (memoized per host), and the link is rebuilt as
+    https://<domain><path>[?<kept query>] so www/m./tracking variants of the
+    same profile collapse into one entry per platform.
+    """
+
+    def __init__(self, domains=SOCIAL_DOMAINS, aliases=DOMAIN_ALIASES, keep_query=KEEP_QUERY):
+        self.domains = dict(domains)
+        self.aliases = dict(aliases)
+        self.keep_query = set(keep_query)
+        self._lookup = dict.fromkeys(REDIRECT_DOMAINS) | dict.fromkeys(self.domains)
+        self._hosts = {}
+
+    def domain(self, host):
+        """The social or redirect domain `host` belongs to, or None; memoized per host."""
+        if host not in self._hosts:
+            if len(self._hosts) > 4096:
+                self._hosts.clear()
+            labels = host.split(".")
+            suffixes = (".".join(labels[i:]) for i in range(len(labels) - 1))
+            self._hosts[host] = next((suffix for suffix in suffixes if suffix in self._lookup), None)
+        return self._hosts[host]
+
+    def canonical(self, url):
+        """(platform, canonical URL) for a social profile link, else None."""
+        match = _link_re.match(url.strip().rstrip(_TRAILING))
+        if not match:
+            return None
+        host, path, query = match.groups()
+        domain = self.domain(host.lower())
+        if domain not in self.domains:
+            target = _redirect_re.search(query) if domain and path == "/url" and query else None
+            return self.canonical(unquote_plus(target.group(1))) if target else None
+        path = path.rstrip("/")
+        query = "&".join(p for p in query.split("&") if p.split("=", 1)[0] in self.keep_query) if query else ""
+        if not path and not query:
+            return None  # Platform home page, not a profile
+        link = f"https://{self.aliases.get(domain, domain)}{path}"
+        return self.domains[domain], f"{link}?{query}" if query else link
+
+    def profiles(self, text="", hrefs=()):
+        """Platform -> canonical links, deduplicated, in first-seen order (hrefs before text)."""
+        found = {}
+        seen = set()
+        candidates = list(hrefs)
+        if text:
+            candidates.extend(_url_re.findall(text))
+        for url in candidates:
+            match = self.canonical(url) if url else None
+            if match and match[1] not in seen:
+                seen.add(match[1])
+                found.setdefault(match[0], []).append(match[1])
+        return found
+
+    def links(self, text="", hrefs=()):
+        return [link for links in self.profiles(text, hrefs).values() for link in links]
+
+    def in_page_spec(self):
+        """The same rules for browser_extract.EXTRACT_PLACE_JS."""
+        return {
+            "url": URL_PATTERN,
+            "link": LINK_PATTERN,
+            "trailing": _TRAILING,
+            "domains": self.domains,
+            "aliases": self.aliases,
+            "keepQuery": sorted(self.keep_query),
+            "redirectDomains": REDIRECT_DOMAINS,
+            "redirect": REDIRECT_PATTERN,
+        }
+
+
+SOCIAL_LINKS = SocialLinkMatcher()
+
+
+def extract_social_links(text="", hrefs=()):
+    """Canonical social profile links found in `hrefs` and the URLs of `text`."""
+    return SOCIAL_LINKS.links(text, hrefs)
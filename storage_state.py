@@ -0,0 +1,101 @@
+import os
+import json
+import time
+import asyncio
+
+from page_state import resolve_consent
+
+# --- Configurable Settings ---
+STORAGE_STATE_PATH = os.environ.get("STORAGE_STATE_PATH", "storage_state.json")  # Cookies + localStorage of a warmed context
+STORAGE_STATE_MAX_AGE = float(os.environ.get("STORAGE_STATE_MAX_AGE", 6 * 3600))  # Seconds before re-warming
+STORAGE_STATE_RETRY = 60  # Seconds to wait after a failed warm-up before trying again
+WARMUP_URL = "https://www.google.com/maps?hl=en"
+WARMUP_TIMEOUT = 60000
+
+
+class StorageStateManager:
+    """Seeds new contexts with the cookies and localStorage of one warmed context.
+
+    `await options(browser)` returns `{"storage_state": ...}` to splat into
+    `browser.new_context(...)`. The state is loaded from `path` when it is
+    younger than `max_age`, otherwise captured once from a context that
+    opens Maps and clicks through consent, then written back to `path`.
+    Call `invalidate()` when a seeded context still hit consent or a block
+    page, so the next context re-warms.
+    """
+
+    def __init__(self, path=STORAGE_STATE_PATH, max_age=STORAGE_STATE_MAX_AGE, warmup_url=WARMUP_URL):
+        self.path = path
+        self.max_age = max_age
+        self.warmup_url = warmup_url
+        self.state = None
+        self.captured_at = 0.0
+        self._retry_at = 0.0
+        self._lock = asyncio.Lock()
+        self.stats = {"seeded": 0, "cold": 0, "loaded": 0, "warmups": 0, "warmup_failures": 0, "invalidated": 0}
+
+    def _fresh(self):
+        return self.state is not None and time.time() - self.captured_at < self.max_age
+
+    def _load(self):
+        try:
+            captured_at = os.path.getmtime(self.path)
+            if time.time() - captured_at >= self.max_age:
+                return False
+            with open(self.path, encoding="utf-8") as f:
+                self.state = json.load(f)
+        except (OSError, ValueError):
+            return False
+        self.captured_at = captured_at
+        self.stats["loaded"] += 1
+        return True
+
+    def _save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.path)
+
+    async def warm(self, browser, **context_options):
+        """Open Maps in a throwaway context, accept consent, keep its storage state."""
+        self.stats["warmups"] += 1
+        context = await browser.new_context(**context_options)
+        try:
+            page = await context.new_page()
+            await page.goto(self.warmup_url, timeout=WARMUP_TIMEOUT)
+            await resolve_consent(page)  # No-op when no consent dialog was served
+            self.state = await context.storage_state()
+            self.captured_at = time.time()
+            self._save()
+            print(f"🍪 Warmed storage state: {len(self.state.get('cookies', []))} cookies -> {self.path}")
+        finally:
+            await context.close()
+
+    async def options(self, browser, **warm_options):
+        async with self._lock:
+            if not self._fresh() and not self._load() and time.time() >= self._retry_at:
+                try:
+                    await self.warm(browser, **warm_options)
+                except Exception as e:
+                    self.stats["warmup_failures"] += 1
+                    self._retry_at = time.time() + STORAGE_STATE_RETRY
+                    print(f"⚠️ Storage state warm-up failed, using cold contexts: {str(e)}")
+        if self._fresh():
+            self.stats["seeded"] += 1
+            return {"storage_state": self.state}
+        self.stats["cold"] += 1
+        return {}
+
+    def invalidate(self):
+        self.stats["invalidated"] += 1
+        self.state = None
+        self._retry_at = 0.0
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def summary(self):
+        s = self.stats
+        return (f"🍪 Storage state: {s['seeded']} contexts seeded, {s['cold']} cold | {s['warmups']} warm-ups "
+                f"({s['warmup_failures']} failed), {s['loaded']} loaded from disk, {s['invalidated']} invalidated")
@@ -0,0 +1,82 @@
+from functools import cached_property
+
+from parser_backends import LxmlElement
+
+try:
+    from lxml.cssselect import CSSSelector
+except ImportError:  # Only needed for lxml documents; bs4 documents use soup.select
+    CSSSelector = None
+
+# --- Region Selectors ---
+# The place pane is the main pane holding the place header; a search page's
+# main pane (the results list) is only used when no place pane exists.
+PANE_SELECTORS = ['div[role="main"]:has(.DUwDvf)', 'div[role="main"]']
+# Address / phone / website / plus-code rows of the place pane
+INFO_ROW_SELECTORS = ['[data-item-id]', '[data-section-id]', '.rogA2c', '.Io6YTe']
+
+
+class _SoupAdapter:
+    def select(self, root, selector):
+        return root.select(selector)
+
+    def text(self, el):
+        return el.get_text(" ", strip=True)
+
+
+class _LxmlAdapter:
+    def __init__(self):
+        self._selectors = {}
+
+    def select(self, root, selector):
+        if selector not in self._selectors:
+            self._selectors[selector] = CSSSelector(selector)
+        return self._selectors[selector](root)
+
+    def text(self, el):
+        return LxmlElement(el).get_text(" ", strip=True)
+
+
+_SOUP = _SoupAdapter()
+_LXML = _LxmlAdapter()
+
+
+class TextRegions:
+    """Scoped text of one parsed document for the regex-based extractors.
+
+    Each region is computed on first use and cached on the instance, so
+    build one per document and hand it to every extractor: `info` is the
+    place pane's info rows, `pane` the whole place pane, `hrefs` its link
+    targets. Works on BeautifulSoup and lxml documents; without a place
+    pane, `pane` falls back to the whole document.
+    """
+
+    def __init__(self, doc):
+        self.doc = doc
+        self._dom = _SOUP if hasattr(doc, "select") else _LXML
+
+    @cached_property
+    def root(self):
+        for selector in PANE_SELECTORS:
+            matches = self._dom.select(self.doc, selector)
+            if matches:
+                return matches[0]
+        return self.doc
+
+    @cached_property
+    def info(self):
+        seen, texts = set(), []
+        for selector in INFO_ROW_SELECTORS:
+            for el in self._dom.select(self.root, selector):
+                text = self._dom.text(el)
+                if text and text not in seen:
+                    seen.add(text)
+                    texts.append(text)
+        return " | ".join(texts)
+
+    @cached_property
+    def pane(self):
+        return self._dom.text(self.root)
+
+    @cached_property
+    def hrefs(self):
+        return [el.get("href") for el in self._dom.select(self.root, "a[href]")]
@@ -1,7 +1,13 @@
 import os
 import asyncio
+from collections import Counter
 import re
-from playwright.async_api import async_playwright
+from browser_pool import BrowserPool
+from results_feed import scroll_results_feed, format_scroll_stats
+from readiness import ReadinessStats, wait_until_ready
+from latency import LatencyTracker, timed_goto
+from page_state import READY, format_page_states, settle_page_state
+from result_cards import harvest_cards, unique_hrefs
 from bs4 import BeautifulSoup
 import random
 import requests
@@ -9,6 +15,9 @@ import requests
 # --- Configurable Settings ---
 API_URL = "http://82.112.254.77:8000/queries?country=usa_blockdata&machine_id=2"
 GOOGLE_MAPS_TEMPLATE = "https://www.google.com/maps/search/{query}/@{lat},{lon},{zoom_level}z"
+READINESS_STATS = ReadinessStats()  # Pages and seconds spent waiting for detail pages to render
+LATENCY = LatencyTracker()  # Rolling navigation/readiness times; timeouts derive from their p99
+PAGE_STATES = Counter()  # Search page outcomes: ready, consent, captcha, blocked, empty, timeout
 
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0 Safari/537.36",
@@ -159,57 +168,38 @@ async def scrape_place_details(html: str) -> dict:
         "social_links": social_links
     }
 
-async def scrape_google_maps_page(industry, lat, lon, zoom_level):
+async def scrape_google_maps_page(industry, lat, lon, zoom_level, pool):
     results = []
 
     try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context(user_agent=random.choice(USER_AGENTS))
+        async with pool.context(user_agent=random.choice(USER_AGENTS)) as context:
             page = await context.new_page()
 
             query = industry.replace(" ", "+")
             url = GOOGLE_MAPS_TEMPLATE.format(query=query, lat=lat, lon=lon, zoom_level=zoom_level)
             print(f"🔍 Navigating to: {url}")
-            await page.goto(url, timeout=120000)
-
-            # Wait for map pins
-            try:
-                await page.wait_for_selector('.Nv2PK', timeout=60000)
-            except Exception:
-                print("❌ No business cards found.")
-                await context.close()
-                await browser.close()
+            await timed_goto(page, url, LATENCY, "search", 120000)
+
+            # Wait for results, failing fast on consent/captcha/block pages
+            state = await settle_page_state(page, "search", stats=PAGE_STATES)
+            if state != READY:
+                print(f"❌ No business cards found ({state}).")
                 return {"industry": industry, "results": []}
 
-            # Scroll to load more results
-            last_height = await page.evaluate("document.body.scrollHeight")
-            while True:
-                await page.keyboard.press('PageDown')
-                await asyncio.sleep(1.5)
-                new_height = await page.evaluate("document.body.scrollHeight")
-                if new_height == last_height:
-                    break
-                last_height = new_height
+            # Scroll the results feed until the list ends or stops growing
+            scroll_stats = await scroll_results_feed(page)
+            print(format_scroll_stats(scroll_stats))
 
             # Extract all business links
-            hrefs = set()
-            cards = await page.query_selector_all('.Nv2PK')
-            for card in cards:
-                link_el = await card.query_selector('a.hfpxzc')
-                if link_el:
-                    link = await link_el.get_attribute('href')
-                    if link and '/maps/place/' in link:
-                        hrefs.add(link)
-
-            hrefs = list(hrefs)
+            cards = await harvest_cards(page)  # One round trip for every card
+            hrefs = unique_hrefs(cards)
             print(f"🔗 Found {len(hrefs)} businesses.")
 
             for link in hrefs:
                 try:
                     new_page = await context.new_page()
-                    await new_page.goto(link, timeout=120000)
-                    await new_page.wait_for_timeout(5000)
+                    await timed_goto(new_page, link, LATENCY, "place", 120000)
+                    await wait_until_ready(new_page, READINESS_STATS, latency=LATENCY)
 
                     html = await new_page.content()
                     details = await scrape_place_details(html)
@@ -222,9 +212,6 @@ async def scrape_google_maps_page(industry, lat, lon, zoom_level):
                 except Exception as e:
                     print(f"🚨 Failed to scrape detail page: {str(e)}")
 
-            await context.close()
-            await browser.close()
-
     except Exception as e:
         print(f"🚨 Critical error scraping '{industry}': {str(e)}")
 
@@ -265,25 +252,29 @@ async def run_scrape_job():
             print("❌ No queries returned from API.")
             return
 
-        tasks = []
-        for i, query in enumerate(queries):
-            if not isinstance(query, dict):
-                print(f"⚠️ Skipping invalid query at index {i}: {query}")
-                continue
-
-            industry = query.get("industry")
-            lat = query.get("latitude")
-            lon = query.get("longitude")
-            zoom_level = query.get("zoom_level")
-
-            if not all([industry, lat, lon, zoom_level]):
-                print(f"⚠️ Missing required fields in query: {query}")
-                continue
-
-            task = scrape_google_maps_page(industry, lat, lon, zoom_level)
-            tasks.append(task)
-
-        all_results = await asyncio.gather(*tasks)
+        async with BrowserPool() as pool:
+            tasks = []
+            for i, query in enumerate(queries):
+                if not isinstance(query, dict):
+                    print(f"⚠️ Skipping invalid query at index {i}: {query}")
+                    continue
+
+                industry = query.get("industry")
+                lat = query.get("latitude")
+                lon = query.get("longitude")
+                zoom_level = query.get("zoom_level")
+
+                if not all([industry, lat, lon, zoom_level]):
+                    print(f"⚠️ Missing required fields in query: {query}")
+                    continue
+
+                task = scrape_google_maps_page(industry, lat, lon, zoom_level, pool)
+                tasks.append(task)
+
+            all_results = await asyncio.gather(*tasks)
+            print(READINESS_STATS.summary(fixed_wait=5))
+            print(LATENCY.summary())
+            print(format_page_states(PAGE_STATES))
 
         for result in all_results:
             print(f"\n📌 Industry: {result['industry']}")
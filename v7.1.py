@@ -1,9 +1,17 @@
 import os
 import asyncio
 import re
+from collections import Counter
 import aiohttp
 from playwright.async_api import async_playwright
 from bs4 import BeautifulSoup
+from page_pool import PagePool
+from request_policy import RequestPolicy
+from app_state import extract_place_state
+from phones import extract_phone, region_for_country
+from latency import LatencyTracker, timed_goto
+from page_state import READY, format_page_states, settle_page_state
+from results_feed import stream_place_urls, pipe_place_urls, format_scroll_stats
 import random
 import psutil
 import tracemalloc
@@ -18,6 +26,9 @@ DEFAULT_PARAMS = {
     "machine_id": "2"
 }
 CHUNK_SIZE = 20  # Send every 20 records
+LATENCY = LatencyTracker()  # Rolling navigation times; timeouts derive from their p99
+PAGE_STATES = Counter()  # Search page outcomes: ready, consent, captcha, blocked, empty, timeout
+PHONE_REGION_HINT = region_for_country(DEFAULT_PARAMS["country"])  # Region for phones without +country (PHONE_REGION if unknown)
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0 Safari/537.36",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Safari/605.1.15",
@@ -75,7 +86,8 @@ SELECTORS = {
     }
 }
 
-semaphore = asyncio.Semaphore(5)
+DETAIL_PAGES = 5  # Pre-created tabs reused for detail pages
+CSS_FIELDS = ["name", "rating", "review_count", "address", "phone", "website"]  # Filled from the page when the embedded state lacks them
 
 # --- Utility Functions ---
 def is_valid_address(text):
@@ -101,18 +113,6 @@ def parse_rating_and_reviews(rating_block):
         return short_match.group(1), short_match.group(2)
     return None, None
 
-def extract_phone(full_text):
-    us_phone_patterns = [
-        r'\+1\s\d{3}-\d{3}-\d{4}',     # +1 555-123-4567
-        r'$$\d{3}$$\s\d{3}-\d{4}',    # (555) 123-4567
-        r'\d{3}-\d{3}-\d{4}'          # 555-123-4567
-    ]
-    for pattern in us_phone_patterns:
-        match = re.search(pattern, full_text)
-        if match:
-            return match.group(0)
-    return None
-
 def get_first_text(soup, selectors, filter_invalid=True):
     invalid_keywords = {"photos", "write", "add", "videos", "menu", "share", "edit", "more", "visit"}
     for selector in selectors:
@@ -159,10 +159,7 @@ async def extract_email_from_website(url, session):
     return None
 
 # --- Scrape Business Page Details ---
-async def scrape_place_details(html: str) -> dict:
-    soup = BeautifulSoup(html, 'html.parser')
-    full_text = soup.get_text(" ", strip=True)
-    
+def parse_css_fields(soup, full_text) -> dict:
     name = get_first_text(soup, SELECTORS["name"])
     rating_block = None
     rating_span = soup.select_one('span[role="img"]')
@@ -176,7 +173,7 @@ async def scrape_place_details(html: str) -> dict:
         address = None
     elif address and not is_valid_address(address):
         address = None
-    phone = extract_phone(full_text)
+    phone = extract_phone(full_text, PHONE_REGION_HINT)
     website = None
     for selector in SELECTORS["website"]:
         el = soup.select_one(selector)
@@ -185,6 +182,24 @@ async def scrape_place_details(html: str) -> dict:
             if href.startswith(("http://", "https://")):
                 website = href
                 break
+
+    return {
+        "name": name,
+        "rating": rating,
+        "review_count": review_count,
+        "address": address,
+        "phone": phone,
+        "website": website,
+    }
+
+async def scrape_place_details(html: str) -> dict:
+    # Embedded APP_INITIALIZATION_STATE first; CSS selectors only for the fields it lacks
+    state = extract_place_state(html) or {}
+
+    soup = BeautifulSoup(html, 'html.parser')
+    full_text = soup.get_text(" ", strip=True)
+
+    # Email and social links are never in the state, so the page text is always read
     email = None
     for pattern in SELECTORS["email"]["text_patterns"]:
         match = re.search(pattern, full_text)
@@ -198,16 +213,12 @@ async def scrape_place_details(html: str) -> dict:
         SELECTORS["social_links"]["url_pattern"]
     )
 
-    return {
-        "name": name,
-        "rating": rating,
-        "review_count": review_count,
-        "address": address,
-        "phone": phone,
-        "website": website,
-        "email": email,
-        "social_links": social_links
-    }
+    details = {**state, "email": email, "social_links": social_links}
+    missing = [field for field in CSS_FIELDS if details.get(field) is None]
+    if missing:
+        css_fields = parse_css_fields(soup, full_text)
+        details.update((field, css_fields[field]) for field in missing)
+    return details
 
 # --- Scrape Map Search Results ---
 async def scrape_google_maps_page(query_data, context, session):
@@ -224,40 +235,24 @@ async def scrape_google_maps_page(query_data, context, session):
         query = industry.replace(" ", "+")
         url = f"https://www.google.com/maps/search/ {query}/@{lat},{lon},{zoom_level}z?hl=en"
         print(f"🔍 Navigating to: {url}")
-        await page.goto(url, timeout=120000)
+        await timed_goto(page, url, LATENCY, "search", 120000)
 
-        try:
-            await page.wait_for_selector('.Nv2PK', timeout=60000)
-        except Exception:
-            print(f"❌ [{industry}] No business cards found.")
+        # Wait for results, failing fast on consent/captcha/block pages
+        state = await settle_page_state(page, "search", stats=PAGE_STATES)
+        if state != READY:
+            print(f"❌ [{industry}] No business cards found ({state}).")
             await page.close()
             return {"id": query_id, "results": []}
 
-        prev_count = 0
-        while True:
-            cards = await page.query_selector_all('.Nv2PK')
-            curr_count = len(cards)
-            if curr_count == prev_count:
-                break
-            prev_count = curr_count
-            await page.keyboard.press('PageDown')
-            await asyncio.sleep(0.5)
-
-        hrefs = set()
-        cards = await page.query_selector_all('.Nv2PK')
-        for card in cards:
-            link_el = await card.query_selector('a.hfpxzc')
-            if link_el:
-                href = await link_el.get_attribute('href')
-                if href and '/maps/place/' in href:
-                    hrefs.add(href)
-
-        hrefs = list(hrefs)
-        print(f"🔗 [{industry}] Found {len(hrefs)} businesses.")
-
-        tasks = [scrape_detail(link, context, query_id, industry, session) for link in hrefs]
-        batch_results = await asyncio.gather(*tasks)
-        results = [r for r in batch_results if r]
+        # Detail pages start on the first cards while the feed keeps scrolling
+        scroll_stats = {}
+        async with PagePool(context, size=DETAIL_PAGES) as pages:
+            results = await pipe_place_urls(
+                stream_place_urls(page, scroll_stats),
+                lambda link: scrape_detail(link, pages, query_id, industry, session),
+                DETAIL_PAGES,
+            )
+        print(f"[{industry}] {format_scroll_stats(scroll_stats)}")
 
         await page.close()
 
@@ -266,13 +261,11 @@ async def scrape_google_maps_page(query_data, context, session):
 
     return {"id": query_id, "results": results}
 
-async def scrape_detail(link, context, query_id, industry, session):
-    async with semaphore:
+async def scrape_detail(link, pages, query_id, industry, session):
+    async with pages.page() as page:
         try:
-            page = await context.new_page()
-            await page.goto(link, timeout=120000)
+            await timed_goto(page, link, LATENCY, "place", 120000)
             html = await page.content()
-            await page.close()
             details = await scrape_place_details(html)
             if details.get("name"):
                 return format_result_for_api(details, query_id, industry, link)
@@ -330,6 +323,8 @@ async def run_scrape_job():
     async with async_playwright() as p:
         browser = await p.chromium.launch(headless=True)
         context = await browser.new_context(user_agent=random.choice(USER_AGENTS))
+        request_policy = RequestPolicy()
+        await request_policy.install(context)
         async with aiohttp.ClientSession() as session:
             while True:
                 try:
@@ -369,6 +364,9 @@ async def run_scrape_job():
 
                         if all_results:
                             await send_to_api(all_results)
+                        print(request_policy.summary())
+                        print(LATENCY.summary())
+                        print(format_page_states(PAGE_STATES))
 
                 except Exception as e:
                     print(f"🚨 Error fetching queries: {str(e)}")
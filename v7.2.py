@@ -5,10 +5,24 @@ import json
 import random
 import requests
 import psutil
-from datetime import datetime
 from playwright.async_api import async_playwright
 from bs4 import BeautifulSoup
-from tenacity import retry, stop_after_attempt, wait_exponential
+from page_pool import PagePool
+from request_policy import RequestPolicy
+from storage_state import StorageStateManager
+from asset_cache import AssetCache
+from dom_compact import CompactStats, compact_page
+from text_regions import TextRegions
+from social_links import extract_social_links
+from phones import extract_phone, region_for_country
+from normalize import format_results_for_api
+from latency import LatencyTracker, timed_goto
+from hedging import HEDGE_NAVIGATION, HEDGE_SLOTS, Hedger
+from parse_executor import ParseExecutor
+from app_state import extract_place_state
+from http_fetcher import HttpDetailFetcher, HTTP_FAST_PATH
+from results_feed import stream_place_cards, stream_place_urls, pipe_place_urls, format_scroll_stats
+from result_cards import harvest_cards, unique_hrefs, card_details, merge_details, missing_fields
 import tracemalloc
 import aiohttp
 from itertools import islice
@@ -21,6 +35,7 @@ DEFAULT_PARAMS = {
     "machine_id": "2"
 }
 CHUNK_SIZE = 50  # Increased from 20
+PHONE_REGION_HINT = region_for_country(DEFAULT_PARAMS["country"])  # Region for phones without +country (PHONE_REGION if unknown)
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0 Safari/537.36",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Safari/605.1.15",
@@ -28,21 +43,17 @@ USER_AGENTS = [
 ]
 MAX_CONCURRENT_PAGES = 10  # Adjust based on system resources
 EMAIL_EXTRACTION_TIMEOUT = 20
-SCROLL_DELAY = 0.8  # Reduced from 1.5s
-RETRY_LIMIT = 3
 BATCH_SIZE = 50
-
-SOCIAL_PATTERNS = [
-    r"(?:facebook\.com|fb\.com)",
-    r"(?:instagram\.com|instagr\.am)",
-    r"(?:twitter\.com|x\.com)",
-    r"linkedin\.com",
-    r"youtube\.com|youtu\.be",
-    r"tiktok\.com|tik\.to|tiktok\.tv",
-    r"pinterest\.com",
-    r"reddit\.com",
-    r"whatsapp\.com",
-]
+REQUEST_POLICY = RequestPolicy()  # Shared so blocked/saved counters cover the whole run
+COMPACT_STATS = CompactStats()  # HTML size before/after in-page pruning (DOM_COMPACT, DOM_COMPACT_ROOT)
+ASSET_CACHE = AssetCache()  # Static Maps bundles served from disk; install before the request policy
+STORAGE_STATE = StorageStateManager()  # Contexts start from a warmed, consented session (STORAGE_STATE_PATH)
+LATENCY = LatencyTracker()  # Rolling navigation/readiness times; timeouts derive from their p99
+HEDGER = Hedger(LATENCY) if HEDGE_NAVIGATION else None  # Set HEDGE_NAVIGATION=1 to duplicate loads slower than p95
+PAGE_POOL_SIZE = MAX_CONCURRENT_PAGES + (HEDGE_SLOTS if HEDGER else 0)  # One tab per worker, plus spares for hedges
+SCRAPE_MODE = os.environ.get("SCRAPE_MODE", "detail")  # "detail" (visit every place) or "cards" (records from result cards)
+CARD_REQUIRED_FIELDS = [f for f in os.environ.get("CARD_REQUIRED_FIELDS", "phone,website").split(",") if f]  # Card mode visits the detail page only when one is missing
+CSS_FIELDS = ["name", "rating", "review_count", "address", "phone", "website"]  # Filled from the page when the embedded state lacks them
 
 SELECTORS = {
     "name": [
@@ -78,10 +89,6 @@ SELECTORS = {
     ],
     "email": {
         "text_patterns": [r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}"]
-    },
-    "social_links": {
-        "patterns": SOCIAL_PATTERNS,
-        "url_pattern": r"https?://[^\s\"'>]+"
     }
 }
 
@@ -89,10 +96,7 @@ async def get_hrefs_with_retry(page, max_retries=3):
     for attempt in range(max_retries):
         try:
             # Try primary selector
-            hrefs = await page.evaluate('''() => {
-                const links = document.querySelectorAll('a.hfpxzc');
-                return [...new Set([...links].map(l => l.href).filter(h => h.includes('/maps/place/')))];
-            }''')
+            hrefs = unique_hrefs(await harvest_cards(page))
             
             if hrefs and len(hrefs) > 0:
                 return hrefs
@@ -140,18 +144,6 @@ def parse_rating_and_reviews(rating_block):
         return short_match.group(1), short_match.group(2)
     return None, None
 
-def extract_phone(full_text):
-    us_phone_patterns = [
-        r'\+1\s\d{3}-\d{3}-\d{4}',     # +1 555-123-4567
-        r'$$\d{3}$$\s\d{3}-\d{4}',    # (555) 123-4567
-        r'\d{3}-\d{3}-\d{4}'          # 555-123-4567
-    ]
-    for pattern in us_phone_patterns:
-        match = re.search(pattern, full_text)
-        if match:
-            return match.group(0)
-    return None
-
 def get_first_text(soup, selectors, filter_invalid=True):
     invalid_keywords = {"photos", "write", "add", "videos", "menu", "share", "edit", "more", "visit"}
     for selector in selectors:
@@ -172,16 +164,6 @@ def get_first_text(soup, selectors, filter_invalid=True):
             print(f"⚠️ Error using selector '{selector}': {str(e)}")
     return None
 
-def extract_social_links(full_text, patterns, url_pattern):
-    urls = re.findall(url_pattern, full_text)
-    matched = []
-    for url in urls:
-        for pattern in patterns:
-            if re.search(pattern, url, re.IGNORECASE):
-                matched.append(url)
-                break
-    return list(set(matched))
-
 async def extract_email_from_website(url, session=None):
     try:
         # First try with requests for speed
@@ -198,7 +180,7 @@ async def extract_email_from_website(url, session=None):
         async with async_playwright() as p:
             browser = await p.chromium.launch(headless=True)
             page = await browser.new_page()
-            await page.goto(url, timeout=60000)
+            await timed_goto(page, url, LATENCY, "website", 60000)
             html = await page.content()
             await browser.close()
             soup = BeautifulSoup(html, "html.parser")
@@ -212,113 +194,128 @@ async def extract_email_from_website(url, session=None):
         print(f"🚨 Email extraction error: {str(e)}")
     return None
 
-# --- Scrape Business Page Details ---
-@retry(stop=stop_after_attempt(RETRY_LIMIT), wait=wait_exponential(multiplier=1, max=10))
-async def scrape_place_details(html: str) -> dict:
+# --- Parse Business Page Details ---
+def parse_css_fields(soup) -> dict:
+    # Efficient name extraction with fallbacks
+    name = None
+    for selector in SELECTORS["name"]:
+        name_element = soup.select_one(selector)
+        if name_element:
+            name = name_element.text.strip()
+            if name:
+                break
+    
+    # Rating extraction
+    rating_block = None
+    rating_span = soup.select_one('span[role="img"]')
+    if rating_span and rating_span.has_attr("aria-label"):
+        rating_block = rating_span["aria-label"]
+    elif soup.select_one('.DUwDvf'):
+        rating_block = soup.select_one('.DUwDvf').next_sibling
+        
+    address = None
+    for selector in SELECTORS["address"]:
+        el = soup.select_one(selector)
+        if el:
+            text = el.text.strip()
+            if text and is_valid_address(text):
+                address = text
+                break
+    
+    # Phone extraction
+    phone = None
+    for selector in SELECTORS["phone"]:
+        el = soup.select_one(selector)
+        if el:
+            text = el.text.strip()
+            potential_phone = extract_phone(text, PHONE_REGION_HINT)
+            if potential_phone:
+                phone = potential_phone
+                break
+    
+    # Website extraction
+    website = None
+    for selector in SELECTORS["website"]:
+        el = soup.select_one(selector)
+        if el and el.has_attr("href"):
+            href = el["href"]
+            if href.startswith(("http://", "https://")):
+                website = href
+                break
+
+    return {
+        "name": name,
+        "rating": rating_block.split()[0] if rating_block else None,
+        "review_count": rating_block.split()[-1].replace('(', '').replace(')', '') if rating_block and len(rating_block.split()) > 1 else None,
+        "address": address,
+        "phone": phone,
+        "website": website,
+    }
+
+# Pure CPU work, run in ParseExecutor worker processes to keep the event loop free
+def parse_place_details(html: str) -> dict:
     try:
+        # Embedded APP_INITIALIZATION_STATE first; CSS selectors only for the fields it lacks
+        state = extract_place_state(html) or {}
+
         soup = BeautifulSoup(html, 'html.parser')
-        full_text = soup.get_text(" ", strip=True)
+        regions = TextRegions(soup)  # Place pane text, not the results list and footers
         
-        # Efficient name extraction with fallbacks
-        name = None
-        for selector in SELECTORS["name"]:
-            name_element = soup.select_one(selector)
-            if name_element:
-                name = name_element.text.strip()
-                if name:
-                    break
+        # Social links are never in the state, so the page text is always read
+        social_links = extract_social_links(regions.pane, regions.hrefs)
         
-        # Rating extraction
-        rating_block = None
-        rating_span = soup.select_one('span[role="img"]')
-        if rating_span and rating_span.has_attr("aria-label"):
-            rating_block = rating_span["aria-label"]
-        elif soup.select_one('.DUwDvf'):
-            rating_block = soup.select_one('.DUwDvf').next_sibling
-            
-        address = None
-        for selector in SELECTORS["address"]:
-            el = soup.select_one(selector)
-            if el:
-                text = el.text.strip()
-                if text and is_valid_address(text):
-                    address = text
-                    break
-        
-        # Phone extraction
-        phone = None
-        for selector in SELECTORS["phone"]:
-            el = soup.select_one(selector)
-            if el:
-                text = el.text.strip()
-                potential_phone = extract_phone(text)
-                if potential_phone:
-                    phone = potential_phone
-                    break
-        
-        # Website extraction
-        website = None
-        for selector in SELECTORS["website"]:
-            el = soup.select_one(selector)
-            if el and el.has_attr("href"):
-                href = el["href"]
-                if href.startswith(("http://", "https://")):
-                    website = href
-                    break
-        
-        # Social links extraction
-        social_links = extract_social_links(
-            full_text,
-            SELECTORS["social_links"]["patterns"],
-            SELECTORS["social_links"]["url_pattern"]
-        )
-        
-        # Return results
-        return {
-            "name": name,
-            "rating": rating_block.split()[0] if rating_block else None,
-            "review_count": rating_block.split()[-1].replace('(', '').replace(')', '') if rating_block and len(rating_block.split()) > 1 else None,
-            "address": address,
-            "phone": phone,
-            "website": website,
-            "email": None,  # Will be filled later
-            "social_links": social_links
-        }
+        details = {**state, "email": None, "social_links": social_links}  # Email is filled later
+        missing = [field for field in CSS_FIELDS if details.get(field) is None]
+        if missing:
+            css_fields = parse_css_fields(soup)
+            details.update((field, css_fields[field]) for field in missing)
+        return details
     except Exception as e:
         print(f"🚨 Error parsing details: {str(e)}")
         return {}
 
-# --- Optimized Scrolling Function ---
-async def optimized_scrolling(page):
-    last_height = await page.evaluate("document.body.scrollHeight")
-    while True:
-        await page.keyboard.press('PageDown')
-        await asyncio.sleep(SCROLL_DELAY)
-        new_height = await page.evaluate("document.body.scrollHeight")
-        if new_height == last_height:
-            break
-        last_height = new_height
-
 # --- Concurrent Detail Scraping ---
-async def scrape_detail_page(context, href, semaphore):
-    async with semaphore:
-        try:
-            page = await context.new_page()
-            await page.goto(href, timeout=60000)
-            html = await page.content()
-            await page.close()
+async def scrape_detail_page(pages, href, parse_executor, http_fetcher=None):
+    if http_fetcher is not None:
+        # Plain HTTP first; only blocked or incomplete responses get a browser tab
+        details = await http_fetcher.fetch(href)
+        if details:
+            details["source_url"] = href
+            return details
 
-            details = await scrape_place_details(html)
-            if details.get("name"):
-                details["source_url"] = href
-                return details
-        except Exception as e:
-            print(f"🚨 Detail page error: {str(e)}")
-            return None
+    async def load(started=None):
+        async with pages.page() as page:
+            if started is not None:
+                started.set()
+            await timed_goto(page, href, LATENCY, "place", 60000)
+            return await compact_page(page, stats=COMPACT_STATS)
+
+    try:
+        if HEDGER is not None:
+            html = await HEDGER.run(load, spare=lambda: pages.idle() > 0)
+        else:
+            html = await load()
+
+        details = await parse_executor.submit(html)
+        if details.get("name"):
+            details["source_url"] = href
+            return details
+    except Exception as e:
+        print(f"🚨 Detail page error: {str(e)}")
+        return None
+
+# --- Card-Only Records ---
+async def scrape_card_record(pages, card, parse_executor, card_stats, http_fetcher=None):
+    card_stats["cards"] += 1
+    details = card_details(card)
+    if missing_fields(details, CARD_REQUIRED_FIELDS):
+        card_stats["detail_visits"] += 1
+        details = merge_details(details, await scrape_detail_page(pages, card["href"], parse_executor, http_fetcher))
+    return details if details.get("name") else None
 
 
 # --- Main Scraper Function ---
-async def scrape_google_maps_page(query_data, browser, email_session):
+async def scrape_google_maps_page(query_data, browser, email_session, parse_executor, http_fetcher=None):
     industry = query_data.get("industry")
     lat = query_data.get("latitude")
     lon = query_data.get("longitude")
@@ -328,23 +325,35 @@ async def scrape_google_maps_page(query_data, browser, email_session):
     
     try:
         print(f"🔍 [{industry}] Starting scrape...")
-        context = await browser.new_context(user_agent=random.choice(USER_AGENTS))
+        context = await browser.new_context(**await STORAGE_STATE.options(browser), user_agent=random.choice(USER_AGENTS))
+        await ASSET_CACHE.install(context)
+        await REQUEST_POLICY.install(context)
         page = await context.new_page()
         
         url = f"https://www.google.com/maps/search/{query_data.get('industry').replace(' ', '+')}/@{lat},{lon},{zoom_level}z?hl=en"
         print(url)
-        await page.goto(url, timeout=120000)
-        await optimized_scrolling(page)
+        await timed_goto(page, url, LATENCY, "search", 120000)
         
-        # Collect hrefs efficiently
-        # Replace the old href extraction code with:
-        hrefs = await get_hrefs_with_retry(page)
-        print(f"🔗 [{industry}] Found {len(hrefs)} businesses.")
-        
-        # Concurrent detail scraping
-        semaphore = asyncio.Semaphore(MAX_CONCURRENT_PAGES)
-        tasks = [scrape_detail_page(context, href, semaphore) for href in hrefs]
-        details_list = await asyncio.gather(*tasks)
+        # Detail pages start on the first cards while the feed keeps scrolling
+        scroll_stats = {}
+        async with PagePool(context, size=PAGE_POOL_SIZE) as pages:
+            scrape = lambda href: scrape_detail_page(pages, href, parse_executor, http_fetcher)
+            if SCRAPE_MODE == "cards":
+                card_stats = {"cards": 0, "detail_visits": 0}
+                from_card = lambda card: scrape_card_record(pages, card, parse_executor, card_stats, http_fetcher)
+                details_list = await pipe_place_urls(stream_place_cards(page, scroll_stats), from_card, MAX_CONCURRENT_PAGES)
+                print(f"🃏 [{industry}] {card_stats['cards']} places from cards, "
+                      f"{card_stats['detail_visits']} detail pages loaded")
+            else:
+                details_list = await pipe_place_urls(stream_place_urls(page, scroll_stats), scrape, MAX_CONCURRENT_PAGES)
+            print(f"[{industry}] {format_scroll_stats(scroll_stats)}")
+
+            if not scroll_stats["urls"]:
+                # No result cards; fall back to any place links on the page
+                hrefs = await get_hrefs_with_retry(page)
+                print(f"🔗 [{industry}] Found {len(hrefs)} businesses.")
+                tasks = [scrape(href) for href in hrefs]
+                details_list = await asyncio.gather(*tasks)
         
         # Extract emails concurrently
         valid_results = [d for d in details_list if d and d.get("name")]
@@ -362,6 +371,13 @@ async def scrape_google_maps_page(query_data, browser, email_session):
         
         await context.close()
         print(f"✅ [{industry}] Completed. Total records: {len(results)}")
+        print(f"[{industry}] {REQUEST_POLICY.summary()}")
+        print(LATENCY.summary())
+        print(STORAGE_STATE.summary())
+        print(ASSET_CACHE.summary())
+        print(COMPACT_STATS.summary())
+        if HEDGER is not None:
+            print(HEDGER.summary())
         return {"id": query_id, "results": results}
         
     except Exception as e:
@@ -371,21 +387,6 @@ async def scrape_google_maps_page(query_data, browser, email_session):
         return {"id": query_id, "results": []}
 
 # --- Send Scraped Data to API ---
-def format_result_for_api(business, query_id, industry, source_url=""):
-    return {
-        "id": query_id,
-        "title": business.get("name"),
-        "category": industry,
-        "address": business.get("address"),
-        "phone": business.get("phone"),
-        "website": business.get("website"),
-        "email": business.get("email"),
-        "star_rating": float(business.get("rating")) if business.get("rating") else None,
-        "review_count": int(business.get("review_count")) if business.get("review_count") else None,
-        "source_url": source_url or business.get("source_url", ""),
-        "scraped_at": datetime.utcnow().isoformat() + "Z"
-    }
-
 def send_to_api(data):
     payload = {
         "country": DEFAULT_PARAMS["country"],
@@ -416,7 +417,7 @@ def print_memory_usage(message=""):
 async def run_scrape_job():
     print("\n🔄 Starting optimized scrape job...")
     try:
-        async with async_playwright() as p:
+        async with async_playwright() as p, ParseExecutor(parse_place_details) as parse_executor:
             # Launch browser once and reuse it
             browser = await p.chromium.launch(headless=True)
             
@@ -424,6 +425,11 @@ async def run_scrape_job():
             connector = aiohttp.TCPConnector(limit_per_host=5, ssl=False)
             session = aiohttp.ClientSession(connector=connector)
             
+            # Optional browserless detail fetches, parsed in the same worker processes
+            http_fetcher = HttpDetailFetcher(parse=parse_executor.submit) if HTTP_FAST_PATH else None
+            if http_fetcher:
+                await http_fetcher.start()
+            
             while True:
                 try:
                     # Fetch queries
@@ -431,18 +437,16 @@ async def run_scrape_job():
                     queries = response.json().get("queries", [])
                     
                     # Process queries concurrently
-                    tasks = [scrape_google_maps_page(q, browser, session) for q in queries if valid_query(q)]
+                    tasks = [scrape_google_maps_page(q, browser, session, parse_executor, http_fetcher) for q in queries if valid_query(q)]
                     results = await asyncio.gather(*tasks)
+                    if http_fetcher:
+                        print(http_fetcher.summary())
                     
-                    # Format results
-                    all_results = []
-                    for result_batch in results:
-                        for business in result_batch.get("results", []):
-                            all_results.append(format_result_for_api(
-                                business, 
-                                result_batch["id"], 
-                                business.get("category")
-                            ))
+                    # Format results: one normalization pass per cycle; each business keeps its own category
+                    all_results = format_results_for_api(
+                        [(result_batch["id"], None, result_batch.get("results", [])) for result_batch in results],
+                        PHONE_REGION_HINT
+                    )
                     
                     # Send in batches
                     for i in range(0, len(all_results), BATCH_SIZE):
@@ -456,6 +460,8 @@ async def run_scrape_job():
                     await asyncio.sleep(60)
                     
             await session.close()
+            if http_fetcher:
+                await http_fetcher.close()
             await browser.close()
             
     except Exception as e:
@@ -4,43 +4,46 @@ import re
 import json
 from playwright.async_api import async_playwright
 from bs4 import BeautifulSoup
+from page_pool import PagePool
+from request_policy import RequestPolicy
+from storage_state import StorageStateManager
+from asset_cache import AssetCache
+from dom_compact import CompactStats, compact_page
+from text_regions import TextRegions
+from social_links import extract_social_links
+from phones import PHONES, extract_phone, region_for_country
+from readiness import ReadinessStats, wait_until_ready
+from latency import LatencyTracker, timed_goto
 import random
 import psutil
 from datetime import datetime
 from itertools import cycle
-import phonenumbers
 import time
 
 # --- Configurable Settings ---
 LINKS_FILE = "links.json"
 OUTPUT_FILE = "output_results.json"
 MAX_CONCURRENT_PAGES = 7  # Increase based on system resources
+LINKS_COUNTRY = os.environ.get("LINKS_COUNTRY")  # Query API country the links were collected for; links.json carries none
+PHONE_REGION_HINT = region_for_country(LINKS_COUNTRY)  # Region for phones without +country (PHONE_REGION if unknown)
+COMPACT_STATS = CompactStats()  # HTML size before/after in-page pruning (DOM_COMPACT, DOM_COMPACT_ROOT)
+ASSET_CACHE = AssetCache()  # Static Maps bundles served from disk; install before the request policy
+STORAGE_STATE = StorageStateManager()  # Contexts start from a warmed, consented session (STORAGE_STATE_PATH)
+READINESS_STATS = ReadinessStats()  # Pages and seconds spent waiting for place pages to render
+LATENCY = LatencyTracker()  # Rolling navigation/readiness times; timeouts derive from their p99
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0 Safari/537.36",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Safari/605.1.15",
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/535.11 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 ]
 
-SOCIAL_PATTERNS = [
-    r"(?:facebook\.com|fb\.com)",
-    r"(?:instagram\.com|instagr\.am)",
-    r"(?:twitter\.com|x\.com)",
-    r"linkedin\.com",
-    r"youtube\.com|youtu\.be",
-    r"tiktok\.com|tik\.to|tiktok\.tv",
-    r"pinterest\.com",
-    r"reddit\.com",
-    r"whatsapp\.com"
-]
-
 SELECTORS = {
     "name": [".qBF1Pd.fontHeadlineSmall", ".DUwDvf", ".hfpxzc[aria-label]"],
     "rating": [".e4rVHe.fontBodyMedium", ".ZkP5Je+span.e4rVHe", ".AJB7ye .e4rVHe", ".rsqaWe"],
     "address": [".W4Efsd span:nth-of-type(2)", ".W4Efsd span:-soup-contains('·')", ".Io6YTe.fontBodyMedium"],
     "phone": [".UsdlK", ".W4Efsd span:nth-of-type(2):contains('(')", "[data-item-id='phone:tel'] > div.fontBodyMedium"],
     "website": ["a[href]:has(span:-soup-contains('Visit'))", ".etWJQ a[href]", "[data-section-id='apn']"],
-    "email": {"text_patterns": [r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}"]},
-    "social_links": {"patterns": SOCIAL_PATTERNS, "url_pattern": r"https?://[^\s\"'>]+"}
+    "email": {"text_patterns": [r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}"]}
 }
 
 
@@ -53,12 +56,6 @@ def is_rating_string(text):
     return bool(re.fullmatch(r'\d+(\.\d+)?$$(\d+)$$', text))
 
 
-def extract_phone(full_text):
-    for match in phonenumbers.PhoneNumberMatcher(full_text, None):
-        return phonenumbers.format_number(match.number, phonenumbers.PhoneNumberFormat.E164)
-    return None
-
-
 def parse_rating_and_reviews(rating_block):
     if not rating_block:
         return None, None
@@ -70,14 +67,6 @@ def parse_rating_and_reviews(rating_block):
         return short_match.group(1), short_match.group(2)
     return None, None
 
-# def extract_phone(full_text):
-#     patterns = [r'\+1\s\d{3}-\d{3}-\d{4}', r'$$\d{3}$$\s\d{3}-\d{4}', r'\d{3}-\d{3}-\d{4}']
-#     for pattern in patterns:
-#         match = re.search(pattern, full_text)
-#         if match:
-#             return match.group(0)
-#     return None
-
 def get_first_text(soup, selectors, filter_invalid=True):
     invalid_keywords = {"photos", "write", "add", "videos", "menu", "share", "edit", "more", "visit"}
     for selector in selectors:
@@ -94,16 +83,6 @@ def get_first_text(soup, selectors, filter_invalid=True):
                 return text
     return None
 
-def extract_social_links(full_text, patterns, url_pattern):
-    urls = re.findall(url_pattern, full_text)
-    matched = []
-    for url in urls:
-        for pattern in patterns:
-            if re.search(pattern, url, re.IGNORECASE):
-                matched.append(url)
-                break
-    return list(set(matched))
-
 async def extract_email_from_website(page):
     try:
         html = await page.content()
@@ -141,72 +120,70 @@ def clean_place_url(href):
     return None  # Or raise an error if needed
 
 # --- Scrape Business Page Details ---
-async def scrape_place_details(context, link):
-    page = await context.new_page()
-    try:
-        cleaned_link = link.replace(" ", "")#clean_place_url(link)
-        print(f"📄 Scraping: {cleaned_link}")
-        await page.goto(cleaned_link, timeout=60000)
-        await page.wait_for_timeout(2000)  # Allow JS to load
-
-        html = await page.content()
-        soup = BeautifulSoup(html, "html.parser")
-        full_text = soup.get_text(" ", strip=True)
-
-        name = get_first_text(soup, SELECTORS["name"])
-        rating_block = None
-        rating_span = soup.select_one('span[role="img"]')
-        if rating_span and rating_span.has_attr("aria-label"):
-            rating_block = rating_span["aria-label"]
-        address = get_first_text(soup, SELECTORS["address"])
-        if address and is_rating_string(address):
-            rating_block = address
-        rating, review_count = parse_rating_and_reviews(rating_block)
-        if address and not is_valid_address(address):
-            address = None
-        phone = extract_phone(full_text)
-        website = None
-        for selector in SELECTORS["website"]:
-            el = soup.select_one(selector)
-            if el and el.has_attr("href"):
-                href = el["href"]
-                if href.startswith(("http://", "https://")):
-                    website = href
+async def scrape_place_details(pages, link):
+    async with pages.page() as page:
+        try:
+            cleaned_link = link.replace(" ", "")#clean_place_url(link)
+            print(f"📄 Scraping: {cleaned_link}")
+            await timed_goto(page, cleaned_link, LATENCY, "place", 60000)
+            await wait_until_ready(page, READINESS_STATS, timeout=2, latency=LATENCY)  # Header plus rating/address, capped at the old 2 s sleep
+
+            html = await compact_page(page, stats=COMPACT_STATS)
+            soup = BeautifulSoup(html, "html.parser")
+            regions = TextRegions(soup)  # Place pane text, not the results list and footers
+
+            name = get_first_text(soup, SELECTORS["name"])
+            rating_block = None
+            rating_span = soup.select_one('span[role="img"]')
+            if rating_span and rating_span.has_attr("aria-label"):
+                rating_block = rating_span["aria-label"]
+            address = get_first_text(soup, SELECTORS["address"])
+            if address and is_rating_string(address):
+                rating_block = address
+            rating, review_count = parse_rating_and_reviews(rating_block)
+            if address and not is_valid_address(address):
+                address = None
+            phone = extract_phone(regions.info, PHONE_REGION_HINT) or extract_phone(regions.pane, PHONE_REGION_HINT)
+            website = None
+            for selector in SELECTORS["website"]:
+                el = soup.select_one(selector)
+                if el and el.has_attr("href"):
+                    href = el["href"]
+                    if href.startswith(("http://", "https://")):
+                        website = href
+                        break
+            email = None
+            for pattern in SELECTORS["email"]["text_patterns"]:
+                match = re.search(pattern, regions.pane)
+                if match:
+                    email = match.group(0)
                     break
-        email = None
-        for pattern in SELECTORS["email"]["text_patterns"]:
-            match = re.search(pattern, full_text)
-            if match:
-                email = match.group(0)
-                break
-        if not email and website:
-            try:
-                await page.goto(website, timeout=30000)
-                email = await extract_email_from_website(page)
-            except:
-                pass
-
-        social_links = extract_social_links(full_text, SOCIAL_PATTERNS, SELECTORS["social_links"]["url_pattern"])
-
-        result = {
-            "name": name,
-            "rating": rating,
-            "review_count": review_count,
-            "address": address,
-            "phone": phone,
-            "website": website,
-            "email": email,
-            "social_links": social_links,
-            "source_url": link
-        }
-
-        print(f"✅ Success: {name}")
-        return result
-    except Exception as e:
-        print(f"❌ Failed to scrape {link}: {str(e)}")
-        return {"error": str(e), "source_url": link}
-    finally:
-        await page.close()
+            if not email and website:
+                try:
+                    await timed_goto(page, website, LATENCY, "website", 30000)
+                    email = await extract_email_from_website(page)
+                except:
+                    pass
+
+            social_links = extract_social_links(regions.pane, regions.hrefs)
+
+            result = {
+                "name": name,
+                "rating": rating,
+                "review_count": review_count,
+                "address": address,
+                "phone": phone,
+                "website": website,
+                "email": email,
+                "social_links": social_links,
+                "source_url": link
+            }
+
+            print(f"✅ Success: {name}")
+            return result
+        except Exception as e:
+            print(f"❌ Failed to scrape {link}: {str(e)}")
+            return {"error": str(e), "source_url": link}
 
 # --- Main Scraper Runner ---
 async def main():
@@ -224,10 +201,18 @@ async def main():
 
     async with async_playwright() as p:
         browser = await p.chromium.launch(headless=True)
-        contexts = [await browser.new_context(user_agent=random.choice(USER_AGENTS)) for _ in range(MAX_CONCURRENT_PAGES)]
-
-        # Use a page pool for context rotation
-        page_pool = cycle(contexts)
+        seed = await STORAGE_STATE.options(browser)
+        contexts = [await browser.new_context(**seed, user_agent=random.choice(USER_AGENTS)) for _ in range(MAX_CONCURRENT_PAGES)]
+        request_policy = RequestPolicy()
+        for context in contexts:
+            await ASSET_CACHE.install(context)
+            await request_policy.install(context)
+
+        # One pre-created tab per context, rotated across the batch
+        page_pools = [PagePool(context, size=1) for context in contexts]
+        for pages in page_pools:
+            await pages.start()
+        page_pool = cycle(page_pools)
 
         # Split links into batches
         for i in range(0, len(links), BATCH_SIZE):
@@ -236,8 +221,8 @@ async def main():
 
             tasks = []
             for link in batch_links:
-                context = next(page_pool)
-                tasks.append(scrape_place_details(context, link))
+                pages = next(page_pool)
+                tasks.append(scrape_place_details(pages, link))
 
             results = await asyncio.gather(*tasks)
             all_results.extend(results)
@@ -249,6 +234,13 @@ async def main():
 
         print(f"\n📊 Total records scraped: {len(all_results)}")
         print(f"⏱️ Total time taken: {elapsed_time:.2f} seconds")
+        print(request_policy.summary())
+        print(READINESS_STATS.summary(fixed_wait=2))
+        print(LATENCY.summary())
+        print(STORAGE_STATE.summary())
+        print(ASSET_CACHE.summary())
+        print(COMPACT_STATS.summary())
+        print(PHONES.summary())
 
         with open(OUTPUT_FILE, "w") as f:
             json.dump(all_results, f, indent=2)
@@ -6,6 +6,7 @@ import time
 from datetime import datetime
 from playwright.async_api import async_playwright
 from bs4 import BeautifulSoup
+from latency import LatencyTracker, timed_goto
 import random
 import requests
 import psutil
@@ -18,6 +19,7 @@ DEFAULT_PARAMS = {
     "machine_id": "your-machine-id"  # Replace with your actual machine ID
 }
 CHUNK_SIZE = 20  # Send every 20 results
+LATENCY = LatencyTracker()  # Rolling navigation times; timeouts derive from their p99
 
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0 Safari/537.36",
@@ -84,7 +86,7 @@ async def scrape_google_maps_page(industry, lat, lon, zoom_level):
             query = industry.replace(" ", "+")
             url = f"https://www.google.com/maps/search/ {query}/@{lat},{lon},{zoom_level}z?hl=en"
             print(f"🔍 Navigating to: {url}")
-            await page.goto(url, timeout=120000)
+            await timed_goto(page, url, LATENCY, "search", 120000)
 
             # Wait for map pins
             try:
@@ -117,7 +119,7 @@ async def scrape_google_maps_page(industry, lat, lon, zoom_level):
             for idx, link in enumerate(hrefs):
                 try:
                     new_page = await context.new_page()
-                    await new_page.goto(link, timeout=120000)
+                    await timed_goto(new_page, link, LATENCY, "place", 120000)
                     html = await new_page.content()
                     details = await scrape_place_details(html)
                     details["category"] = industry
@@ -196,6 +198,7 @@ async def run_scrape_job():
         # Send any remaining
         if all_results:
             send_to_api(all_results, DEFAULT_PARAMS["country"], DEFAULT_PARAMS["machine_id"])
+        print(LATENCY.summary())
 
 # --- Start Task ---
 if __name__ == "__main__":
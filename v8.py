@@ -1,13 +1,31 @@
 import os
 import asyncio
+from collections import Counter
 import re
-from playwright.async_api import async_playwright
+from browser_pool import BrowserPool
+from request_policy import RequestPolicy
+from storage_state import StorageStateManager
+from asset_cache import AssetCache
+from latency import LatencyTracker, timed_goto
+from page_state import (BLOCK_STATES, PAGE_STATE_RETRIES, READY, PageBlocked, block_backoff,
+                        format_page_states, settle_page_state)
+from results_feed import stream_place_cards, stream_place_urls, pipe_place_urls, format_scroll_stats
+from result_cards import card_details, merge_details, missing_fields
+from place_extractor import ExtractionPlan, Field
+from parser_backends import get_backend
+from browser_extract import ExtractionStats, build_spec, extract_in_page
+from network_capture import CAPTURE_RECORD_DIR, NetworkCapture
+from app_state import extract_place_state
+from dom_compact import CompactStats, compact_page
+from text_regions import TextRegions
+from social_links import SOCIAL_LINKS, extract_social_links
+from phones import CANDIDATE_PATTERN as PHONE_CANDIDATE_PATTERN, PHONES, extract_phone, region_for_country
+from normalize import format_results_for_api
 from bs4 import BeautifulSoup
 import random
 import requests
 import psutil
 import tracemalloc
-from datetime import datetime
 
 # --- Configurable Settings ---
 API_URL = "http://82.112.254.77:8000/queries?country=usa_blockdata&machine_id=2"
@@ -17,6 +35,24 @@ DEFAULT_PARAMS = {
     "machine_id": "2"
 }
 CHUNK_SIZE = 20  # Send every 20 records
+PHONE_REGION_HINT = region_for_country(DEFAULT_PARAMS["country"])  # Region for phones without +country (PHONE_REGION if unknown)
+REQUEST_POLICY = RequestPolicy()  # Shared so blocked/saved counters cover the whole run
+ASSET_CACHE = AssetCache()  # Static Maps bundles served from disk; install before the request policy
+STORAGE_STATE = StorageStateManager()  # Contexts start from a warmed, consented session (STORAGE_STATE_PATH)
+LATENCY = LatencyTracker()  # Rolling navigation/readiness times; timeouts derive from their p99
+PAGE_STATES = Counter()  # Search page outcomes: ready, consent, captcha, blocked, empty, timeout
+PARSER = get_backend()  # Set PARSER_BACKEND=html.parser|bs4-lxml|lxml to switch
+EXTRACTION_MODE = os.environ.get("EXTRACTION_MODE", "python")  # "python" (page.content + parser) or "browser" (page.evaluate)
+# Decoding captured XHR JSON is not offered until network_capture's index paths
+# are checked against real payloads; set CAPTURE_RECORD_DIR to record some
+EXTRACTION_MODES = ("python", "browser")
+if EXTRACTION_MODE not in EXTRACTION_MODES:
+    raise ValueError(f"Unknown EXTRACTION_MODE {EXTRACTION_MODE!r}; expected one of {', '.join(EXTRACTION_MODES)}")
+EXTRACTION_STATS = ExtractionStats()
+COMPACT_STATS = CompactStats()  # HTML size before/after in-page pruning (DOM_COMPACT, DOM_COMPACT_ROOT)
+DETAIL_WORKERS = 1  # Detail tabs fed from the results stream while the feed keeps scrolling
+SCRAPE_MODE = os.environ.get("SCRAPE_MODE", "detail")  # "detail" (visit every place) or "cards" (records from result cards)
+CARD_REQUIRED_FIELDS = [f for f in os.environ.get("CARD_REQUIRED_FIELDS", "phone,website").split(",") if f]  # Card mode visits the detail page only when one is missing
 
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0 Safari/537.36",
@@ -24,18 +60,6 @@ USER_AGENTS = [
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/535.11 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 ]
 
-SOCIAL_PATTERNS = [
-    r"(?:facebook\.com|fb\.com)",
-    r"(?:instagram\.com|instagr\.am)",
-    r"(?:twitter\.com|x\.com)",
-    r"linkedin\.com",
-    r"youtube\.com|youtu\.be",
-    r"tiktok\.com|tik\.to|tiktok\.tv",
-    r"pinterest\.com",
-    r"reddit\.com",
-    r"whatsapp\.com",
-]
-
 SELECTORS = {
     "name": [
         ".qBF1Pd.fontHeadlineSmall",   # Best selector
@@ -70,87 +94,100 @@ SELECTORS = {
     ],
     "email": {
         "text_patterns": [r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}"]
-    },
-    "social_links": {
-        "patterns": SOCIAL_PATTERNS,
-        "url_pattern": r"https?://[^\s\"'>]+"
     }
 }
 
+# Shared by the Python parser and the in-page extractor (browser_extract.py)
+VALID_ADDRESS_PATTERN = r'\d+|St\.? |Ave\.? |Blvd\.? |Rd\.? |Lane\.?'
+RATING_STRING_PATTERN = r'\d+(\.\d+)?$$(\d+)$$'
+RATING_FULL_PATTERN = r'(\d+(?:\.\d+)?)\sstars\s(\d+)\s(?:R|r)eviews'
+RATING_SHORT_PATTERN = r'(\d+(?:\.\d+)?)[^\d]*(\d+)'
+
 # --- Utility Functions ---
 def is_valid_address(text):
-    return bool(re.search(r'\d+|St\.? |Ave\.? |Blvd\.? |Rd\.? |Lane\.?', text))
+    return bool(re.search(VALID_ADDRESS_PATTERN, text))
 
 def is_rating_string(text):
-    return bool(re.fullmatch(r'\d+(\.\d+)?$$(\d+)$$', text))
+    return bool(re.fullmatch(RATING_STRING_PATTERN, text))
 
 def parse_rating_and_reviews(rating_block):
     if not rating_block:
         return None, None
-    full_match = re.search(
-        r'(\d+(?:\.\d+)?)\sstars\s(\d+)\s(?:R|r)eviews', 
-        rating_block
-    )
+    full_match = re.search(RATING_FULL_PATTERN, rating_block)
     if full_match:
         return full_match.group(1), full_match.group(2)
-    short_match = re.search(
-        r'(\d+(?:\.\d+)?)[^\d]*(\d+)', 
-        rating_block
-    )
+    short_match = re.search(RATING_SHORT_PATTERN, rating_block)
     if short_match:
         return short_match.group(1), short_match.group(2)
     return None, None
 
-def extract_phone(full_text):
-    us_phone_patterns = [
-        r'\+1\s\d{3}-\d{3}-\d{4}',     # +1 555-123-4567
-        r'$$\d{3}$$\s\d{3}-\d{4}',    # (555) 123-4567
-        r'\d{3}-\d{3}-\d{4}'          # 555-123-4567
-    ]
-    for pattern in us_phone_patterns:
-        match = re.search(pattern, full_text)
-        if match:
-            return match.group(0)
-    return None
+INVALID_TEXT_KEYWORDS = {"photos", "write", "add", "videos", "menu", "share", "edit", "more", "visit"}
+
+def valid_text(el, filter_invalid=True):
+    if el.name in ['script', 'style']:
+        return None
+    text = el.get_text(strip=True)
+    if not text:
+        return None
+    if filter_invalid:
+        if any(kw in text.lower() for kw in INVALID_TEXT_KEYWORDS):
+            return None
+        if is_rating_string(text):
+            return None
+    return text
 
 def get_first_text(soup, selectors, filter_invalid=True):
-    invalid_keywords = {"photos", "write", "add", "videos", "menu", "share", "edit", "more", "visit"}
     for selector in selectors:
         try:
             elements = soup.select(selector)
             for el in elements:
-                if el.name in ['script', 'style']:
-                    continue
-                text = el.get_text(strip=True)
+                text = valid_text(el, filter_invalid)
                 if text:
-                    if filter_invalid:
-                        if any(kw.lower() in text.lower() for kw in invalid_keywords):
-                            continue
-                        if is_rating_string(text):
-                            continue
                     return text
         except Exception as e:
             print(f"⚠️ Error using selector '{selector}': {str(e)}")
     return None
 
-def extract_social_links(full_text, patterns, url_pattern):
-    urls = re.findall(url_pattern, full_text)
-    matched = []
-    for url in urls:
-        for pattern in patterns:
-            if re.search(pattern, url, re.IGNORECASE):
-                matched.append(url)
-                break
-    return list(set(matched))
-
-async def extract_email_from_website(url):
+def http_href(el):
+    if el.has_attr("href") and el["href"].startswith(("http://", "https://")):
+        return el["href"]
+    return None
+
+# Every selector-driven field resolved in a single walk of the document
+PLACE_PLAN = ExtractionPlan({
+    "name": Field(SELECTORS["name"], valid_text),
+    "rating_block": Field(['span[role="img"]'], lambda el: el.get("aria-label"), first_only=True),
+    "address": Field(SELECTORS["address"], valid_text),
+    "website": Field(SELECTORS["website"], http_href, first_only=True),
+})
+CSS_FIELDS = ["name", "rating", "review_count", "address", "phone", "website"]  # Filled from the page when the embedded state lacks them
+
+# Same fields and rules, evaluated inside the page by browser_extract.EXTRACT_PLACE_JS
+IN_PAGE_SPEC = build_spec(
+    fields={
+        "name": ("text", SELECTORS["name"], False),
+        "rating_block": ("aria-label", ['span[role="img"]'], True),
+        "address": ("text", SELECTORS["address"], False),
+        "website": ("http-href", SELECTORS["website"], True),
+    },
+    patterns={
+        "ratingString": RATING_STRING_PATTERN,
+        "ratingFull": RATING_FULL_PATTERN,
+        "ratingShort": RATING_SHORT_PATTERN,
+        "validAddress": VALID_ADDRESS_PATTERN,
+        "phone": PHONE_CANDIDATE_PATTERN,
+        "email": SELECTORS["email"]["text_patterns"],
+        "social": SOCIAL_LINKS.in_page_spec(),
+    },
+    invalid_keywords=INVALID_TEXT_KEYWORDS,
+)
+
+async def extract_email_from_website(url, pool):
     try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
-            await page.goto(url, timeout=60000)
+        async with pool.page() as page:
+            await REQUEST_POLICY.install(page)
+            await timed_goto(page, url, LATENCY, "website", 60000)
             html = await page.content()
-            await browser.close()
             soup = BeautifulSoup(html, "html.parser")
             full_text = soup.get_text(strip=True)
             for pattern in SELECTORS["email"]["text_patterns"]:
@@ -162,17 +199,12 @@ async def extract_email_from_website(url):
     return None
 
 # --- Scrape Business Page Details ---
-async def scrape_place_details(html: str) -> dict:
-    soup = BeautifulSoup(html, 'html.parser')
-    full_text = soup.get_text(" ", strip=True)
-    name = get_first_text(soup, SELECTORS["name"], filter_invalid=True)
-
-    rating_block = None
-    rating_span = soup.select_one('span[role="img"]')
-    if rating_span and rating_span.has_attr("aria-label"):
-        rating_block = rating_span["aria-label"]
+def parse_css_fields(parser, doc, regions) -> dict:
+    fields = parser.extract(PLACE_PLAN, doc)
+    name = fields["name"]
+    rating_block = fields["rating_block"]
 
-    address = get_first_text(soup, SELECTORS["address"])
+    address = fields["address"]
     if address and is_rating_string(address):
         rating_block = address
 
@@ -183,31 +215,8 @@ async def scrape_place_details(html: str) -> dict:
     elif address and not is_valid_address(address):
         address = None
 
-    phone = extract_phone(full_text)
-
-    website = None
-    for selector in SELECTORS["website"]:
-        el = soup.select_one(selector)
-        if el and el.has_attr("href"):
-            href = el["href"]
-            if href.startswith(("http://", "https://")):
-                website = href
-                break
-
-    email = None
-    for pattern in SELECTORS["email"]["text_patterns"]:
-        match = re.search(pattern, full_text)
-        if match:
-            email = match.group(0)
-            break
-    if not email and website:
-        email = await extract_email_from_website(website)
-
-    social_links = extract_social_links(
-        full_text,
-        SELECTORS["social_links"]["patterns"],
-        SELECTORS["social_links"]["url_pattern"]
-    )
+    phone = extract_phone(regions.info, PHONE_REGION_HINT) or extract_phone(regions.pane, PHONE_REGION_HINT)
+    website = fields["website"]
 
     return {
         "name": name,
@@ -216,12 +225,50 @@ async def scrape_place_details(html: str) -> dict:
         "address": address,
         "phone": phone,
         "website": website,
-        "email": email,
-        "social_links": social_links
     }
 
+def parse_place_details(html: str, parser=None) -> dict:
+    # Embedded APP_INITIALIZATION_STATE first; CSS selectors only for the fields it lacks
+    state = extract_place_state(html) or {}
+    parser = parser or PARSER
+    doc = parser.parse(html)
+    regions = TextRegions(doc)  # Place pane text, not the results list and footers
+
+    # Email and social links are never in the state, so the page text is always read
+    email = None
+    for pattern in SELECTORS["email"]["text_patterns"]:
+        match = re.search(pattern, regions.pane)
+        if match:
+            email = match.group(0)
+            break
+
+    social_links = extract_social_links(regions.pane, regions.hrefs)
+
+    details = {**state, "email": email, "social_links": social_links}
+    missing = [field for field in CSS_FIELDS if details.get(field) is None]
+    if missing:
+        css_fields = parse_css_fields(parser, doc, regions)
+        details.update((field, css_fields[field]) for field in missing)
+    return details
+
+async def add_website_email(details: dict, pool: BrowserPool) -> dict:
+    if not details["email"] and details["website"]:
+        details["email"] = await extract_email_from_website(details["website"], pool)
+    return details
+
+async def extract_place_from_page(page) -> dict:
+    started = EXTRACTION_STATS.start()
+    if EXTRACTION_MODE == "browser":
+        details = await extract_in_page(page, IN_PAGE_SPEC, PHONE_REGION_HINT)
+        EXTRACTION_STATS.record("browser", started, details)
+    else:
+        html = await compact_page(page, stats=COMPACT_STATS)
+        details = parse_place_details(html)
+        EXTRACTION_STATS.record("python", started, html)
+    return details
+
 # --- Scrape Map Search Results ---
-async def scrape_google_maps_page(query_data):
+async def scrape_google_maps_page(query_data, pool: BrowserPool, attempt=0):
     industry = query_data.get("industry")
     lat = query_data.get("latitude")
     lon = query_data.get("longitude")
@@ -233,84 +280,97 @@ async def scrape_google_maps_page(query_data):
     try:
         tracemalloc.start()
         print_memory_usage(f"[{industry}] Starting scraper...")
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context(user_agent=random.choice(USER_AGENTS))
+        async with pool.context(user_agent=random.choice(USER_AGENTS)) as context:
+            await ASSET_CACHE.install(context)
+            await REQUEST_POLICY.install(context)
             page = await context.new_page()
+            # Only records raw search/place payloads as decoder fixtures; extraction never reads them
+            search_capture = NetworkCapture().attach(page) if CAPTURE_RECORD_DIR else None
 
             query = industry.replace(" ", "+")
             url = f"https://www.google.com/maps/search/ {query}/@{lat},{lon},{zoom_level}z?hl=en"
 
             print(f"🔍 Navigating to: {url}")
-            await page.goto(url, timeout=120000)
-
-            try:
-                await page.wait_for_selector('.Nv2PK', timeout=60000)
-            except Exception:
-                print(f"❌ [{industry}] No business cards found.")
-                await context.close()
-                await browser.close()
+            await timed_goto(page, url, LATENCY, "search", 120000)
+
+            # Consent is clicked through; captcha/block pages retry in a fresh context
+            state = await settle_page_state(page, "search", stats=PAGE_STATES)
+            if state in BLOCK_STATES:
+                STORAGE_STATE.invalidate()  # The seeded session is burnt; re-warm for the retry
+                raise PageBlocked(state)
+            if state != READY:
+                print(f"❌ [{industry}] No business cards found ({state}).")
                 return {"id": query_id, "results": []}
 
-            prev_count = 0
-            while True:
-                cards = await page.query_selector_all('.Nv2PK')
-                curr_count = len(cards)
-                if curr_count == prev_count:
-                    break
-                prev_count = curr_count
-                print_memory_usage(f"[{industry}] After scroll: {curr_count} businesses found.")
-                await page.keyboard.press('PageDown')
-                await asyncio.sleep(1.5)
-
-            hrefs = set()
-            cards = await page.query_selector_all('.Nv2PK')
-            for card in cards:
-                link_el = await card.query_selector('a.hfpxzc')
-                if link_el:
-                    href = await link_el.get_attribute('href')
-                    if href and '/maps/place/' in href:
-                        hrefs.add(href)
-            hrefs = list(hrefs)
-            print(f"🔗 [{industry}] Found {len(hrefs)} businesses.")
-
-            for link in hrefs:
+            async def visit_detail(link):
+                new_page = None
                 try:
                     new_page = await context.new_page()
-                    await new_page.goto(link, timeout=120000)
-                    html = await new_page.content()
-                    await new_page.close()
-                    details = await scrape_place_details(html)
-                    if details.get("name"):
-                        details["source_url"] = link
-                        results.append(details)
+                    if CAPTURE_RECORD_DIR:
+                        NetworkCapture().attach(new_page)
+                    await timed_goto(new_page, link, LATENCY, "place", 120000)
+                    return await extract_place_from_page(new_page)
                 except Exception as e:
                     print(f"🚨 Failed to scrape detail page: {str(e)}")
+                finally:
+                    if new_page is not None:
+                        await new_page.close()  # Also when navigation or extraction raised
+                return None
+
+            async def scrape_detail(link):
+                details = await visit_detail(link)
+                if details and details.get("name"):
+                    details = await add_website_email(details, pool)
+                    details["source_url"] = link
+                    return details
+                return None
+
+            card_stats = {"cards": 0, "detail_visits": 0}
+
+            async def scrape_card(card):
+                card_stats["cards"] += 1
+                details = card_details(card)
+                if missing_fields(details, CARD_REQUIRED_FIELDS):
+                    card_stats["detail_visits"] += 1
+                    details = merge_details(details, await visit_detail(card["href"]))
+                if details.get("name"):
+                    return await add_website_email(details, pool)
+                return None
+
+            # Detail pages start on the first cards while the feed keeps scrolling
+            scroll_stats = {}
+            if SCRAPE_MODE == "cards":
+                results = await pipe_place_urls(stream_place_cards(page, scroll_stats), scrape_card, DETAIL_WORKERS)
+                print(f"🃏 [{industry}] {card_stats['cards']} places from cards, "
+                      f"{card_stats['detail_visits']} detail pages loaded")
+            else:
+                results = await pipe_place_urls(stream_place_urls(page, scroll_stats), scrape_detail, DETAIL_WORKERS)
+            print_memory_usage(f"[{industry}] {format_scroll_stats(scroll_stats)}")
 
-            await context.close()
-            await browser.close()
             _, peak = tracemalloc.get_traced_memory()
             tracemalloc.stop()
             print(f"📈 [{industry}] Peak memory used: {peak / 1024 ** 2:.2f} MB")
+            print(f"[{industry}] {REQUEST_POLICY.summary()}")
+            if search_capture is not None:
+                print(f"[{industry}] {search_capture.summary()}")
+            print(EXTRACTION_STATS.summary())
+            print(COMPACT_STATS.summary())
+            print(PHONES.summary())
+            print(LATENCY.summary())
+            print(format_page_states(PAGE_STATES))
+            print(STORAGE_STATE.summary())
+            print(ASSET_CACHE.summary())
+    except PageBlocked as e:
+        tracemalloc.stop()
+        print(f"⛔ [{industry}] {str(e)} on attempt {attempt + 1}")
+        if attempt < PAGE_STATE_RETRIES:
+            await block_backoff(attempt)
+            return await scrape_google_maps_page(query_data, pool, attempt + 1)
     except Exception as e:
         print(f"🚨 Critical error scraping '{industry}': {str(e)}")
     return {"id": query_id, "results": results}
 
 # --- Send Scraped Data to API ---
-def format_result_for_api(business, query_id, industry, source_url=""):
-    return {
-        "id": query_id,
-        "title": business.get("name"),
-        "category": industry,
-        "address": business.get("address"),
-        "phone": business.get("phone"),
-        "website": business.get("website"),
-        "email": business.get("email"),
-        "star_rating": float(business.get("rating")) if business.get("rating") else None,
-        "source_url": source_url or business.get("source_url", ""),
-        "scraped_at": datetime.utcnow().isoformat() + "Z"
-    }
-
 def send_to_api(data):
     payload = {
         "country": DEFAULT_PARAMS["country"],
@@ -341,37 +401,34 @@ def print_memory_usage(message=""):
 # --- Main Runner Loop ---
 async def run_scrape_job():
     print("\n🔄 Starting scheduled scrape job...")
-    while True:
-        try:
-            print("📥 Fetching queries from API...")
-            response = requests.get(API_URL, timeout=30)
-            data = response.json()
-            queries = data.get("queries", [])
-            if not queries:
-                print("💤 No queries returned from API. Waiting before retry...")
-                await asyncio.sleep(60)
-                continue
-
-            all_results = []
-            for query in queries:
-                if not isinstance(query, dict):
-                    continue
-                if not all([
-                    "id", "industry", "latitude", "longitude", "zoom_level"
-                ]):
-                    print(f"⚠️ Skipping incomplete query: {query}")
+    # Browsers are launched once per worker and recycled by the pool
+    async with BrowserPool(storage_state=STORAGE_STATE) as pool:
+        while True:
+            try:
+                print("📥 Fetching queries from API...")
+                response = requests.get(API_URL, timeout=30)
+                data = response.json()
+                queries = data.get("queries", [])
+                if not queries:
+                    print("💤 No queries returned from API. Waiting before retry...")
+                    await asyncio.sleep(60)
                     continue
 
-                result_batch = await scrape_google_maps_page(query)
-                query_id = result_batch.get("id")
-                industry = query.get("industry")
-                batch_results = result_batch.get("results", [])
-
-                for business in batch_results:
-                    formatted = format_result_for_api(business, query_id, industry)
-                    all_results.append(formatted)
-
-                # Send in chunks
+                result_batches = []
+                for query in queries:
+                    if not isinstance(query, dict):
+                        continue
+                    if not all([
+                        "id", "industry", "latitude", "longitude", "zoom_level"
+                    ]):
+                        print(f"⚠️ Skipping incomplete query: {query}")
+                        continue
+
+                    result_batch = await scrape_google_maps_page(query, pool)
+                    result_batches.append((result_batch.get("id"), query.get("industry"), result_batch.get("results", [])))
+
+                # Format results: one normalization pass per cycle, then send in chunks
+                all_results = format_results_for_api(result_batches, PHONE_REGION_HINT)
                 while len(all_results) >= CHUNK_SIZE:
                     chunk = all_results[:CHUNK_SIZE]
                     success = send_to_api(chunk)
@@ -380,12 +437,12 @@ async def run_scrape_job():
                     else:
                         await asyncio.sleep(10)
 
-            if all_results:
-                send_to_api(all_results)
+                if all_results:
+                    send_to_api(all_results)
 
-        except Exception as e:
-            print(f"🚨 Error fetching queries: {str(e)}")
-            await asyncio.sleep(60)
+            except Exception as e:
+                print(f"🚨 Error fetching queries: {str(e)}")
+                await asyncio.sleep(60)
 
 # --- Start Task ---
 if __name__ == "__main__":